@@ -0,0 +1,276 @@
+import asyncio
+import time
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Generic,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+from ezrest.requests import AsyncConnector, AsyncConnectorWrapper
+
+_ResponseType = TypeVar("_ResponseType")
+_ItemType = TypeVar("_ItemType")
+
+# Function returning the size of the item (eg. len for raw bytes)
+SizeFunction = Callable[[Any], int]
+
+
+class BufferStats(NamedTuple):
+    """Snapshot of the buffer occupancy and counters"""
+
+    occupancy: int
+    """Current size of the buffered items (number of items or bytes)"""
+
+    items: int
+    """Number of buffered items"""
+
+    peak_occupancy: int
+    """Highest occupancy observed"""
+
+    high_watermark: int
+    """Occupancy pausing the producer"""
+
+    low_watermark: int
+    """Occupancy resuming the paused producer"""
+
+    paused: bool
+    """Whether the producer is paused"""
+
+    pauses: int
+    """Number of times the producer was paused"""
+
+    paused_time: float
+    """Seconds the producer spent paused (consumer slower than producer)"""
+
+    starved_time: float
+    """Seconds the consumer spent waiting for items (producer slower)"""
+
+    produced: int
+    """Number of items retrieved from the source"""
+
+    consumed: int
+    """Number of items yielded to the consumer"""
+
+
+# Function called with the buffer stats when the producer pauses or resumes
+WatermarkCallback = Callable[[BufferStats], None]
+
+
+class BufferedAsyncIterator(Generic[_ItemType]):
+    """
+    Asynchronous iterator with a bounded buffer between the producer
+    (eg. AsyncConnector.list() fetching the pages) and the consumer.
+
+    The source is iterated by a background task which keeps fetching while
+    the consumer processes the buffered items. Once the buffer occupancy
+    reaches `high_watermark`, the producer is paused (the source is not
+    iterated, so no further pages are fetched) until the consumer drains the
+    buffer down to `low_watermark` (half of the high watermark by default).
+
+    The occupancy is measured in items by default. Pass `size` function to
+    measure it differently, eg. `size=len` for raw bytes. The `stats`
+    property and `on_watermark` callback (called whenever the producer
+    pauses or resumes) report the occupancy for tuning.
+
+    Errors raised by the source are re-raised to the consumer after the
+    items buffered before the error. If the consumer stops early, the
+    producer task is cancelled and the source is closed by aclose() (or when
+    leaving `async with` block). Leaving the `async for` loop (eg. via break)
+    does the same once the loop's iterator is finalized.
+
+    Example:
+
+    async with BufferedAsyncIterator(api_root.users.list(), 500) as users:
+        async for user in users:
+            await slow_processing(user)
+    print(users.stats)
+    """
+
+    def __init__(
+        self,
+        source: AsyncIterable[_ItemType],
+        high_watermark: int = 1000,
+        low_watermark: Optional[int] = None,
+        size: Optional[SizeFunction] = None,
+        on_watermark: Optional[WatermarkCallback] = None,
+    ) -> None:
+        if high_watermark < 1:
+            raise ValueError("High watermark must be positive")
+        low_watermark = high_watermark // 2 if low_watermark is None else low_watermark
+        if not 0 <= low_watermark < high_watermark:
+            raise ValueError("Low watermark must be lower than the high watermark")
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self._source = source
+        self._size = size
+        self._on_watermark = on_watermark
+        self._buffer: Deque[Tuple[_ItemType, int]] = deque()
+        self._producer: Optional[asyncio.Future] = None
+        self._resumed: Optional[asyncio.Event] = None
+        self._available: Optional[asyncio.Event] = None
+        self._finished = False
+        self._error: Optional[BaseException] = None
+        self._occupancy = 0
+        self._peak_occupancy = 0
+        self._pauses = 0
+        self._paused_time = 0.0
+        self._starved_time = 0.0
+        self._produced = 0
+        self._consumed = 0
+
+    @property
+    def stats(self) -> BufferStats:
+        """Current occupancy and counters of the buffer"""
+        return BufferStats(
+            self._occupancy,
+            len(self._buffer),
+            self._peak_occupancy,
+            self.high_watermark,
+            self.low_watermark,
+            self._resumed is not None and not self._resumed.is_set(),
+            self._pauses,
+            self._paused_time,
+            self._starved_time,
+            self._produced,
+            self._consumed,
+        )
+
+    def _report(self):
+        if self._on_watermark is not None:
+            self._on_watermark(self.stats)
+
+    async def _produce(self):
+        assert self._resumed is not None and self._available is not None
+        try:
+            async for item in self._source:
+                weight = self._size(item) if self._size else 1
+                self._buffer.append((item, weight))
+                self._occupancy += weight
+                self._produced += 1
+                self._peak_occupancy = max(self._peak_occupancy, self._occupancy)
+                self._available.set()
+                if self._occupancy >= self.high_watermark:
+                    self._resumed.clear()
+                    self._pauses += 1
+                    self._report()
+                    start = time.perf_counter()
+                    await self._resumed.wait()
+                    self._paused_time += time.perf_counter() - start
+        except Exception as e:
+            self._error = e
+        finally:
+            self._finished = True
+            self._available.set()
+            await self._close_source()
+
+    async def _close_source(self):
+        aclose = getattr(self._source, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    def __aiter__(self) -> AsyncIterator[_ItemType]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[_ItemType]:
+        # Async generator is finalized by the event loop when the consumer
+        # abandons it (eg. breaks out of the loop), which stops the producer
+        try:
+            while True:
+                try:
+                    item = await self.__anext__()
+                except StopAsyncIteration:
+                    return
+                yield item
+        finally:
+            await self.aclose()
+
+    async def __anext__(self) -> _ItemType:
+        if self._producer is None:
+            self._resumed, self._available = asyncio.Event(), asyncio.Event()
+            self._resumed.set()
+            self._producer = asyncio.ensure_future(self._produce())
+        assert self._resumed is not None and self._available is not None
+        while not self._buffer:
+            if self._finished:
+                error, self._error = self._error, None
+                if error is not None:
+                    raise error
+                raise StopAsyncIteration()
+            self._available.clear()
+            start = time.perf_counter()
+            await self._available.wait()
+            self._starved_time += time.perf_counter() - start
+        item, weight = self._buffer.popleft()
+        self._occupancy -= weight
+        self._consumed += 1
+        if not self._resumed.is_set() and self._occupancy <= self.low_watermark:
+            self._resumed.set()
+            self._report()
+        return item
+
+    async def aclose(self):
+        """Stops the producer, closes the source and drops the buffered items"""
+        if self._producer is None:
+            await self._close_source()
+        elif not self._producer.done():
+            self._producer.cancel()
+            try:
+                await self._producer
+            except asyncio.CancelledError:
+                pass
+        self._buffer.clear()
+        self._occupancy = 0
+        self._finished = True
+
+    async def __aenter__(self) -> "BufferedAsyncIterator[_ItemType]":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+class AsyncBufferedConnector(AsyncConnectorWrapper[_ResponseType]):
+    """
+    Asynchronous Buffered Connector - iterates `list()` results through
+    a bounded buffer (see BufferedAsyncIterator).
+
+    Pages are fetched ahead of a slow consumer, but only until the buffer
+    reaches the high watermark, so the memory usage stays bounded while the
+    network is not left idle. The returned BufferedAsyncIterator reports the
+    buffer occupancy via its `stats` property.
+
+    Example:
+
+    # At most ~50MB of raw pages buffered ahead of the consumer
+    connector = AsyncBufferedConnector(MyRawConnector(), 50_000_000, size=len)
+    """
+
+    def __init__(
+        self,
+        connector: AsyncConnector[_ResponseType],
+        high_watermark: int = 1000,
+        low_watermark: Optional[int] = None,
+        size: Optional[SizeFunction] = None,
+        on_watermark: Optional[WatermarkCallback] = None,
+    ) -> None:
+        super().__init__(connector)
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.size = size
+        self.on_watermark = on_watermark
+
+    def _list(self, url: str, **kwargs) -> BufferedAsyncIterator[_ResponseType]:
+        return BufferedAsyncIterator(
+            super()._list(url, **kwargs),
+            self.high_watermark,
+            self.low_watermark,
+            self.size,
+            self.on_watermark,
+        )
@@ -0,0 +1,335 @@
+import threading
+import time
+from enum import Enum
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+from ezrest.events import StopWatching
+from ezrest.requests import (
+    AsyncConnector,
+    AsyncConnectorWrapper,
+    Connector,
+    ConnectorWrapper,
+    RawBytes,
+    RawTarget,
+    url_template,
+)
+
+_ResponseType = TypeVar("_ResponseType")
+
+
+class CircuitState(str, Enum):
+    """State of the circuit"""
+
+    CLOSED = "closed"
+    """Requests are passed through"""
+
+    OPEN = "open"
+    """Requests fail fast"""
+
+    HALF_OPEN = "half_open"
+    """Limited number of probe requests is passed through"""
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending the request when the circuit is open"""
+
+    key: str
+    """Circuit key (URL template)"""
+
+    retry_after: float
+    """Seconds until the circuit allows probe requests"""
+
+    def __init__(self, key: str, retry_after: float) -> None:
+        super().__init__(f"Circuit open for {key} (retry after {retry_after:.1f}s)")
+        self.key = key
+        self.retry_after = retry_after
+
+
+class CircuitMetrics(NamedTuple):
+    """Snapshot of the circuit state and counters"""
+
+    state: CircuitState
+    consecutive_failures: int
+    successes: int
+    failures: int
+    rejections: int
+    opened: int
+
+
+class _Circuit:
+    def __init__(self) -> None:
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.successes = 0
+        self.failures = 0
+        self.rejections = 0
+        self.opened = 0
+
+    def metrics(self) -> CircuitMetrics:
+        return CircuitMetrics(
+            self.state,
+            self.consecutive_failures,
+            self.successes,
+            self.failures,
+            self.rejections,
+            self.opened,
+        )
+
+
+# Function called on every state change with (key, old state, new state)
+StateChangeCallback = Callable[[str, CircuitState, CircuitState], None]
+
+
+class CircuitBreaker:
+    """
+    Circuit Breaker - tracks failures of the requests per URL template and
+    rejects the requests to the failing ones.
+
+    Each circuit starts closed. After `failure_threshold` consecutive failures
+    (exceptions of `failure_exceptions` types) it opens and all requests fail
+    fast with CircuitOpenError. After `reset_timeout` seconds the circuit is
+    half-open: up to `half_open_max_calls` concurrent probe requests are
+    passed through, a successful probe closes the circuit, a failed one opens
+    it again.
+
+    Circuits are identified by `key(url)` - the URL template by default, so
+    that eg. all requests to http://x.com/posts/{} share the circuit while
+    other endpoints are not affected.
+
+    State changes are reported via `on_state_change` callback and the
+    counters are available via metrics().
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        failure_exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+        key: Callable[[str], str] = url_template,
+        on_state_change: Optional[StateChangeCallback] = None,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.failure_exceptions = failure_exceptions
+        self.key = key
+        self.on_state_change = on_state_change
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def _transition(self, key: str, circuit: _Circuit, state: CircuitState):
+        old_state, circuit.state = circuit.state, state
+        if state == CircuitState.OPEN:
+            circuit.opened_at = time.monotonic()
+            circuit.opened += 1
+        if state != CircuitState.HALF_OPEN:
+            circuit.probes = 0
+        if self.on_state_change is not None:
+            self.on_state_change(key, old_state, state)
+
+    def acquire(self, url: str) -> str:
+        """
+        Checks whether the request can be sent.
+        Returns circuit key, raises CircuitOpenError if the circuit is open.
+        """
+        key = self.key(url)
+        with self._lock:
+            circuit = self._circuits.setdefault(key, _Circuit())
+            if circuit.state == CircuitState.OPEN:
+                retry_after = circuit.opened_at + self.reset_timeout - time.monotonic()
+                if retry_after > 0:
+                    circuit.rejections += 1
+                    raise CircuitOpenError(key, retry_after)
+                self._transition(key, circuit, CircuitState.HALF_OPEN)
+            if circuit.state == CircuitState.HALF_OPEN:
+                if circuit.probes >= self.half_open_max_calls:
+                    circuit.rejections += 1
+                    raise CircuitOpenError(key, 0.0)
+                circuit.probes += 1
+        return key
+
+    def record_success(self, key: str):
+        """Reports successful request"""
+        with self._lock:
+            circuit = self._circuits[key]
+            circuit.successes += 1
+            circuit.consecutive_failures = 0
+            if circuit.state != CircuitState.CLOSED:
+                self._transition(key, circuit, CircuitState.CLOSED)
+
+    def record_failure(self, key: str, error: BaseException):
+        """Reports failed request (ignored if the error is not a failure)"""
+        with self._lock:
+            circuit = self._circuits[key]
+            if not isinstance(error, self.failure_exceptions):
+                if circuit.state == CircuitState.HALF_OPEN:
+                    circuit.probes -= 1
+                return
+            circuit.failures += 1
+            circuit.consecutive_failures += 1
+            if circuit.state == CircuitState.HALF_OPEN or (
+                circuit.state == CircuitState.CLOSED
+                and circuit.consecutive_failures >= self.failure_threshold
+            ):
+                self._transition(key, circuit, CircuitState.OPEN)
+
+    def state(self, url: str) -> CircuitState:
+        """Returns state of the circuit handling the URL"""
+        with self._lock:
+            circuit = self._circuits.get(self.key(url))
+            return circuit.state if circuit else CircuitState.CLOSED
+
+    def metrics(self) -> Dict[str, CircuitMetrics]:
+        """Returns metrics of all circuits indexed by the circuit key"""
+        with self._lock:
+            return {key: circuit.metrics() for key, circuit in self._circuits.items()}
+
+
+class CircuitBreakerConnector(ConnectorWrapper[_ResponseType]):
+    """
+    Synchronous Circuit Breaker Connector - rejects requests to the degraded
+    endpoints without waiting for the timeouts (see CircuitBreaker).
+
+    A `list()` or `stream_raw()` call counts as successful when the iteration
+    is exhausted.
+
+    Example:
+
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+    connector = CircuitBreakerConnector(MyConnector(), breaker)
+    """
+
+    breaker: CircuitBreaker
+    """Circuit breaker tracking the requests"""
+
+    def __init__(
+        self,
+        connector: Connector[_ResponseType],
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        super().__init__(connector)
+        self.breaker = breaker or CircuitBreaker()
+
+    def _request(self, method: str, url: str, **kwargs) -> _ResponseType:
+        key = self.breaker.acquire(url)
+        try:
+            response = super()._request(method, url, **kwargs)
+        except BaseException as e:
+            self.breaker.record_failure(key, e)
+            raise
+        self.breaker.record_success(key)
+        return response
+
+    def _list(self, url: str, **kwargs) -> Iterator[_ResponseType]:
+        key = self.breaker.acquire(url)
+        try:
+            yield from super()._list(url, **kwargs)
+        except BaseException as e:
+            self.breaker.record_failure(key, e)
+            raise
+        self.breaker.record_success(key)
+
+    def stream_raw(self, url: str, **kwargs) -> Iterator[RawBytes]:
+        key = self.breaker.acquire(url)
+        try:
+            yield from super().stream_raw(url, **kwargs)
+        except BaseException as e:
+            self.breaker.record_failure(key, e)
+            raise
+        self.breaker.record_success(key)
+
+    def get_raw_into(self, url: str, target: RawTarget, **kwargs) -> int:
+        key = self.breaker.acquire(url)
+        try:
+            written = super().get_raw_into(url, target, **kwargs)
+        except BaseException as e:
+            self.breaker.record_failure(key, e)
+            raise
+        self.breaker.record_success(key)
+        return written
+
+
+class AsyncCircuitBreakerConnector(AsyncConnectorWrapper[_ResponseType]):
+    """
+    Asynchronous Circuit Breaker Connector - rejects requests to the degraded
+    endpoints without waiting for the timeouts (see CircuitBreaker).
+
+    A `list()`, `stream_raw()` or `subscribe()` call counts as successful
+    when the iteration is exhausted (or the subscription raises StopWatching).
+    """
+
+    breaker: CircuitBreaker
+    """Circuit breaker tracking the requests"""
+
+    def __init__(
+        self,
+        connector: AsyncConnector[_ResponseType],
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        super().__init__(connector)
+        self.breaker = breaker or CircuitBreaker()
+
+    async def _request(self, method: str, url: str, **kwargs) -> _ResponseType:
+        key = self.breaker.acquire(url)
+        try:
+            response = await super()._request(method, url, **kwargs)
+        except BaseException as e:
+            self.breaker.record_failure(key, e)
+            raise
+        self.breaker.record_success(key)
+        return response
+
+    async def _list(self, url: str, **kwargs) -> AsyncIterator[_ResponseType]:
+        key = self.breaker.acquire(url)
+        try:
+            async for item in super()._list(url, **kwargs):
+                yield item
+        except BaseException as e:
+            self.breaker.record_failure(key, e)
+            raise
+        self.breaker.record_success(key)
+
+    async def stream_raw(self, url: str, **kwargs) -> AsyncIterator[RawBytes]:
+        key = self.breaker.acquire(url)
+        try:
+            async for chunk in super().stream_raw(url, **kwargs):
+                yield chunk
+        except BaseException as e:
+            self.breaker.record_failure(key, e)
+            raise
+        self.breaker.record_success(key)
+
+    async def subscribe(self, url: str, *args, **kwargs) -> AsyncIterator[RawBytes]:
+        key = self.breaker.acquire(url)
+        try:
+            async for chunk in super().subscribe(url, *args, **kwargs):
+                yield chunk
+        except StopWatching:
+            self.breaker.record_success(key)
+            raise
+        except BaseException as e:
+            self.breaker.record_failure(key, e)
+            raise
+        self.breaker.record_success(key)
+
+    async def get_raw_into(self, url: str, target: RawTarget, **kwargs) -> int:
+        key = self.breaker.acquire(url)
+        try:
+            written = await super().get_raw_into(url, target, **kwargs)
+        except BaseException as e:
+            self.breaker.record_failure(key, e)
+            raise
+        self.breaker.record_success(key)
+        return written
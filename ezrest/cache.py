@@ -0,0 +1,352 @@
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+from ezrest.requests import (
+    AsyncConnector,
+    AsyncConnectorWrapper,
+    Connector,
+    ConnectorWrapper,
+    _request_key,
+)
+
+_ResponseType = TypeVar("_ResponseType")
+
+# Time-to-live of the cache entry in seconds (None - entry never expires).
+# It can be either a constant or a function of the request URL.
+TTLType = Union[None, float, Callable[[str], Optional[float]]]
+
+# HTTP methods that are served from the cache
+CACHED_METHODS = ("get", "get_raw", "list")
+
+# HTTP methods that invalidate cached entries of the URL
+INVALIDATING_METHODS = ("post", "put", "patch", "delete")
+
+
+class SQLiteCache:
+    """
+    Persistent response cache backed by a single SQLite file.
+
+    Values are serialized (pickle by default), compressed with zlib and stored
+    together with their expiration time and size. Reads go through SQLite's
+    memory-mapped I/O (see `mmap_size`), so repeated lookups of a warm cache
+    file are served from the page cache without extra copies.
+
+    When `max_size` (in bytes of stored, compressed data) is exceeded, the
+    least recently used entries are evicted. Expired entries are never
+    returned and are purged on eviction.
+
+    NOTE: The default serializer is pickle - do not load cache files coming
+    from untrusted sources. Pass `dumps`/`loads` (eg. json.dumps/json.loads
+    operating on bytes) to use a different format.
+    """
+
+    path: str
+    """Path to the SQLite database file"""
+
+    max_size: Optional[int]
+    """Maximum total size of stored values in bytes (None - unbounded)"""
+
+    def __init__(
+        self,
+        path: str,
+        max_size: Optional[int] = None,
+        compression_level: int = 6,
+        mmap_size: int = 256 * 1024 * 1024,
+        dumps: Callable[[Any], bytes] = pickle.dumps,
+        loads: Callable[[bytes], Any] = pickle.loads,
+    ) -> None:
+        self.path = path
+        self.max_size = max_size
+        self._compression_level = compression_level
+        self._dumps = dumps
+        self._loads = loads
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, url TEXT NOT NULL, value BLOB NOT NULL, "
+            "size INTEGER NOT NULL, expires REAL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_url ON entries (url)")
+        self._db.commit()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Returns (hit, value) pair for the given key"""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return False, None
+            if row[1] is not None and row[1] <= now:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._db.commit()
+                return False, None
+            self._db.execute(
+                "UPDATE entries SET accessed = ? WHERE key = ?", (now, key)
+            )
+            self._db.commit()
+        return True, self._loads(zlib.decompress(row[0]))
+
+    def set(self, key: str, url: str, value: Any, ttl: Optional[float] = None):
+        """Stores the value under the given key"""
+        data = zlib.compress(self._dumps(value), self._compression_level)
+        now = time.time()
+        expires = None if ttl is None else now + ttl
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                (key, url, data, len(data), expires, now),
+            )
+            self._evict(now)
+            self._db.commit()
+
+    def invalidate(self, url: str):
+        """Removes all entries stored for the given URL"""
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._db.commit()
+
+    def clear(self):
+        """Removes all entries"""
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            self._db.commit()
+
+    def size(self) -> int:
+        """Returns total size of stored values in bytes"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()[0]
+
+    def close(self):
+        """Closes the database connection"""
+        with self._lock:
+            self._db.close()
+
+    def _evict(self, now: float):
+        """Purges expired entries and evicts LRU entries above max_size"""
+        self._db.execute(
+            "DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?", (now,)
+        )
+        if self.max_size is None:
+            return
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries")
+        excess = total.fetchone()[0] - self.max_size
+        if excess <= 0:
+            return
+        evicted: List[str] = []
+        rows = self._db.execute("SELECT key, size FROM entries ORDER BY accessed")
+        for key, size in rows.fetchall():
+            if excess <= 0:
+                break
+            evicted.append(key)
+            excess -= size
+        self._db.executemany(
+            "DELETE FROM entries WHERE key = ?", [(key,) for key in evicted]
+        )
+
+
+def _resolve_ttl(ttl: TTLType, url: str) -> Optional[float]:
+    return ttl(url) if callable(ttl) else ttl
+
+
+def _chunk_key(key: str, index: int) -> str:
+    """Key of the chunk of the cached list() results"""
+    return f"{key}/{index}"
+
+
+class CachedConnector(ConnectorWrapper[_ResponseType]):
+    """
+    Synchronous Cached Connector - serves GET responses (including raw ones
+    returned by get_raw()) and complete `list()` results from the persistent
+    cache.
+
+    The remaining HTTP methods (POST, PUT, PATCH, DELETE) are always sent to
+    the server and invalidate all cached entries of the affected URL.
+    The `list()` results are stored in chunks of `list_chunk_size` items
+    while they are iterated (long listings are neither buffered in memory
+    nor stored as a single value), but they are served from the cache only
+    once the iteration was exhausted. If a chunk was evicted in the meantime,
+    the listing is requested from the server again (skipping the items
+    already served from the cache).
+
+    Example:
+
+    connector = CachedConnector(MyConnector(), SQLiteCache("cache.db"), ttl=3600)
+    api_root = Endpoint[Dict[str, Any]](base_url, connector)
+    """
+
+    cache: SQLiteCache
+    """Cache storage"""
+
+    ttl: TTLType
+    """Time-to-live of the cached entries in seconds"""
+
+    list_chunk_size: int
+    """Number of list() items stored in a single cache entry"""
+
+    def __init__(
+        self,
+        connector: Connector[_ResponseType],
+        cache: SQLiteCache,
+        ttl: TTLType = None,
+        list_chunk_size: int = 1000,
+    ) -> None:
+        super().__init__(connector)
+        self.cache = cache
+        self.ttl = ttl
+        self.list_chunk_size = list_chunk_size
+
+    def _request(self, method: str, url: str, **kwargs) -> _ResponseType:
+        if method not in CACHED_METHODS:
+            response = super()._request(method, url, **kwargs)
+            if method in INVALIDATING_METHODS:
+                self.cache.invalidate(url)
+            return response
+        key = _request_key(method, url, kwargs)
+        if key is None:
+            return super()._request(method, url, **kwargs)
+        hit, response = self.cache.get(key)
+        if not hit:
+            response = super()._request(method, url, **kwargs)
+            self.cache.set(key, url, response, _resolve_ttl(self.ttl, url))
+        return response
+
+    def _list(self, url: str, **kwargs) -> Iterator[_ResponseType]:
+        key = _request_key("list", url, kwargs)
+        if key is None:
+            yield from super()._list(url, **kwargs)
+            return
+        hit, chunks = self.cache.get(key)
+        served = 0
+        if hit:
+            for index in range(chunks):
+                hit, items = self.cache.get(_chunk_key(key, index))
+                if not hit:
+                    break
+                yield from items
+                served += len(items)
+            else:
+                return
+        ttl = _resolve_ttl(self.ttl, url)
+        items, chunks = [], 0
+        for position, item in enumerate(super()._list(url, **kwargs)):
+            items.append(item)
+            if len(items) == self.list_chunk_size:
+                self.cache.set(_chunk_key(key, chunks), url, items, ttl)
+                items, chunks = [], chunks + 1
+            if position >= served:
+                yield item
+        if items:
+            self.cache.set(_chunk_key(key, chunks), url, items, ttl)
+            chunks += 1
+        # Number of chunks is stored last, once the list is complete
+        self.cache.set(key, url, chunks, ttl)
+
+
+class AsyncCachedConnector(AsyncConnectorWrapper[_ResponseType]):
+    """
+    Asynchronous Cached Connector - serves GET responses (including raw ones
+    returned by get_raw()) and complete `list()` results from the persistent
+    cache.
+
+    The remaining HTTP methods (POST, PUT, PATCH, DELETE) are always sent to
+    the server and invalidate all cached entries of the affected URL.
+    The `list()` results are stored in chunks of `list_chunk_size` items
+    while they are iterated (long listings are neither buffered in memory
+    nor stored as a single value), but they are served from the cache only
+    once the iteration was exhausted. If a chunk was evicted in the meantime,
+    the listing is requested from the server again (skipping the items
+    already served from the cache).
+
+    NOTE: Cache lookups are local, blocking SQLite calls executed directly in
+    the event loop - they are expected to be much faster than the requests.
+    """
+
+    cache: SQLiteCache
+    """Cache storage"""
+
+    ttl: TTLType
+    """Time-to-live of the cached entries in seconds"""
+
+    list_chunk_size: int
+    """Number of list() items stored in a single cache entry"""
+
+    def __init__(
+        self,
+        connector: AsyncConnector[_ResponseType],
+        cache: SQLiteCache,
+        ttl: TTLType = None,
+        list_chunk_size: int = 1000,
+    ) -> None:
+        super().__init__(connector)
+        self.cache = cache
+        self.ttl = ttl
+        self.list_chunk_size = list_chunk_size
+
+    async def _request(self, method: str, url: str, **kwargs) -> _ResponseType:
+        if method not in CACHED_METHODS:
+            response = await super()._request(method, url, **kwargs)
+            if method in INVALIDATING_METHODS:
+                self.cache.invalidate(url)
+            return response
+        key = _request_key(method, url, kwargs)
+        if key is None:
+            return await super()._request(method, url, **kwargs)
+        hit, response = self.cache.get(key)
+        if not hit:
+            response = await super()._request(method, url, **kwargs)
+            self.cache.set(key, url, response, _resolve_ttl(self.ttl, url))
+        return response
+
+    async def _list(self, url: str, **kwargs) -> AsyncIterator[_ResponseType]:
+        key = _request_key("list", url, kwargs)
+        if key is None:
+            async for item in super()._list(url, **kwargs):
+                yield item
+            return
+        hit, chunks = self.cache.get(key)
+        served = 0
+        if hit:
+            for index in range(chunks):
+                hit, items = self.cache.get(_chunk_key(key, index))
+                if not hit:
+                    break
+                for item in items:
+                    yield item
+                served += len(items)
+            else:
+                return
+        ttl = _resolve_ttl(self.ttl, url)
+        items, chunks, position = [], 0, 0
+        async for item in super()._list(url, **kwargs):
+            items.append(item)
+            if len(items) == self.list_chunk_size:
+                self.cache.set(_chunk_key(key, chunks), url, items, ttl)
+                items, chunks = [], chunks + 1
+            if position >= served:
+                yield item
+            position += 1
+        if items:
+            self.cache.set(_chunk_key(key, chunks), url, items, ttl)
+            chunks += 1
+        # Number of chunks is stored last, once the list is complete
+        self.cache.set(key, url, chunks, ttl)
@@ -0,0 +1,324 @@
+import json
+import timeit
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # pragma: no cover
+    msgpack = None  # type: ignore
+
+try:
+    import cbor2  # type: ignore
+except ImportError:  # pragma: no cover
+    cbor2 = None  # type: ignore
+
+# Encoded body (or its decodable view)
+_Bytes = Union[bytes, bytearray, memoryview]
+
+
+class Codec:
+    """
+    Codec interface - converts between Python objects and the encoded
+    request/response bodies of a single media type.
+    """
+
+    media_type: str = ""
+    """Media type handled by the codec (eg. 'application/json')"""
+
+    def encode(self, data: Any) -> bytes:
+        """Encodes the object into the request body"""
+        raise NotImplementedError()
+
+    def decode(self, body: _Bytes) -> Any:
+        """Decodes the response body into the object"""
+        raise NotImplementedError()
+
+
+class JSONCodec(Codec):
+    """JSON codec based on the standard library"""
+
+    media_type = "application/json"
+
+    def encode(self, data: Any) -> bytes:
+        return json.dumps(data, separators=(",", ":")).encode()
+
+    def decode(self, body: _Bytes) -> Any:
+        return json.loads(bytes(body))
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec based on the orjson package"""
+
+    def __init__(self) -> None:
+        if orjson is None:  # pragma: no cover
+            raise ImportError("OrjsonCodec requires 'orjson' package")
+
+    def encode(self, data: Any) -> bytes:
+        return orjson.dumps(data)
+
+    def decode(self, body: _Bytes) -> Any:
+        return orjson.loads(body)
+
+
+class MsgPackCodec(Codec):
+    """MessagePack codec based on the msgpack package"""
+
+    media_type = "application/msgpack"
+
+    def __init__(self) -> None:
+        if msgpack is None:  # pragma: no cover
+            raise ImportError("MsgPackCodec requires 'msgpack' package")
+
+    def encode(self, data: Any) -> bytes:
+        return msgpack.packb(data)
+
+    def decode(self, body: _Bytes) -> Any:
+        return msgpack.unpackb(body)
+
+
+class CBORCodec(Codec):
+    """CBOR codec based on the cbor2 package"""
+
+    media_type = "application/cbor"
+
+    def __init__(self) -> None:
+        if cbor2 is None:  # pragma: no cover
+            raise ImportError("CBORCodec requires 'cbor2' package")
+
+    def encode(self, data: Any) -> bytes:
+        return cbor2.dumps(data)
+
+    def decode(self, body: _Bytes) -> Any:
+        return cbor2.loads(body)
+
+
+def _parse_media_type(value: str) -> Tuple[str, float]:
+    """Parses media range of Content-Type/Accept header into (type, quality)"""
+    media_type, *params = [part.strip() for part in value.split(";")]
+    quality = 1.0
+    for param in params:
+        name, _, param_value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                quality = float(param_value)
+            except ValueError:
+                quality = 0.0
+    return media_type.lower(), quality
+
+
+class CodecRegistry:
+    """
+    Codec Registry - keeps the codecs available to connectors and CRUDs,
+    indexed by the media type.
+
+    The first registered codec (or the one registered with `default=True`)
+    is used when the media type is not specified. Registering another codec
+    for the same media type replaces the previous one, which allows swapping
+    eg. the standard JSON codec for a faster implementation globally.
+
+    Example:
+
+    registry.register(OrjsonCodec(), default=True)
+    headers = {"Accept": registry.accept_header()}
+    data = registry.decode(response.content, response.headers["Content-Type"])
+    """
+
+    def __init__(self, *codecs: Codec) -> None:
+        self._codecs: Dict[str, Codec] = {}
+        self._default: Optional[str] = None
+        for codec in codecs:
+            self.register(codec)
+
+    def register(self, codec: Codec, default: bool = False):
+        """Registers the codec for its media type"""
+        self._codecs[codec.media_type] = codec
+        if default or self._default is None:
+            self._default = codec.media_type
+
+    @property
+    def default(self) -> Codec:
+        """Codec used when the media type is not specified"""
+        if self._default is None:
+            raise LookupError("No codecs registered")
+        return self._codecs[self._default]
+
+    @property
+    def media_types(self) -> List[str]:
+        """Registered media types (default one first)"""
+        default = self.default.media_type
+        return [default] + [media for media in self._codecs if media != default]
+
+    def get(self, content_type: Optional[str] = None) -> Codec:
+        """
+        Returns the codec for the Content-Type header value
+        (parameters such as charset are ignored)
+        """
+        if not content_type:
+            return self.default
+        media_type, _ = _parse_media_type(content_type)
+        if media_type not in self._codecs:
+            raise LookupError(f"No codec registered for '{media_type}'")
+        return self._codecs[media_type]
+
+    def negotiate(self, accept: Optional[str] = None) -> Codec:
+        """
+        Returns the codec best matching the Accept header value
+        (quality values and wildcards are respected)
+        """
+        if not accept:
+            return self.default
+        ranges = sorted(
+            (_parse_media_type(value) for value in accept.split(",")),
+            key=lambda media_range: -media_range[1],
+        )
+        for media_range, quality in ranges:
+            if quality <= 0:
+                continue
+            if media_range == "*/*":
+                return self.default
+            if media_range.endswith("/*"):
+                for media_type in self.media_types:
+                    if media_type.startswith(media_range[:-1]):
+                        return self._codecs[media_type]
+            elif media_range in self._codecs:
+                return self._codecs[media_range]
+        raise LookupError(f"No codec acceptable for '{accept}'")
+
+    def accept_header(self) -> str:
+        """Returns Accept header value preferring the default codec"""
+        media_types = self.media_types
+        return ", ".join(
+            media if i == 0 else f"{media};q={max(0.1, 1 - i / 10):.1f}"
+            for i, media in enumerate(media_types)
+        )
+
+    def encode(self, data: Any, content_type: Optional[str] = None) -> bytes:
+        """Encodes the object with the codec of the media type"""
+        return self.get(content_type).encode(data)
+
+    def decode(self, body: _Bytes, content_type: Optional[str] = None) -> Any:
+        """Decodes the body with the codec of the media type"""
+        return self.get(content_type).decode(body)
+
+
+def _default_registry() -> CodecRegistry:
+    codecs: List[Codec] = [OrjsonCodec() if orjson is not None else JSONCodec()]
+    if msgpack is not None:  # pragma: no cover
+        codecs.append(MsgPackCodec())
+    if cbor2 is not None:  # pragma: no cover
+        codecs.append(CBORCodec())
+    return CodecRegistry(*codecs)
+
+
+registry = _default_registry()
+"""
+Global codec registry used by default by connectors and CRUDs
+(JSON - orjson if installed, MessagePack and CBOR if installed)
+"""
+
+
+class CodecMixin:
+    """
+    Adds codec helpers to connectors and CRUDs.
+
+    The helpers consult the global codec registry unless `codecs` attribute
+    is overridden (on the class or on the instance).
+    """
+
+    codecs: CodecRegistry = registry
+    """Codec registry consulted by the helpers"""
+
+    def encode_body(self, data: Any, content_type: Optional[str] = None) -> bytes:
+        """Encodes request body with the codec of the media type"""
+        return self.codecs.encode(data, content_type)
+
+    def decode_body(self, body: _Bytes, content_type: Optional[str] = None) -> Any:
+        """Decodes response body with the codec of the media type"""
+        return self.codecs.decode(body, content_type)
+
+    def accept_header(self) -> str:
+        """Returns Accept header value listing all registered media types"""
+        return self.codecs.accept_header()
+
+
+# Representative payloads used by the benchmark
+BENCHMARK_PAYLOADS: Dict[str, Any] = {
+    "small_object": {"id": 1, "name": "fuchsia rose", "year": 2001, "active": True},
+    "list_page": {
+        "page": 1,
+        "total_pages": 100,
+        "data": [
+            {
+                "id": i,
+                "email": f"user{i}@example.com",
+                "first_name": "George",
+                "last_name": "Bluth",
+                "score": i * 0.5,
+                "tags": ["a", "b", "c"],
+            }
+            for i in range(100)
+        ],
+    },
+    "nested_document": {
+        "id": "doc",
+        "sections": [
+            {"title": f"section {i}", "paragraphs": ["lorem ipsum " * 20] * 5}
+            for i in range(20)
+        ],
+    },
+}
+
+
+def benchmark(
+    payloads: Optional[Dict[str, Any]] = None,
+    codecs: Optional[List[Codec]] = None,
+    number: int = 200,
+) -> List[Tuple[str, str, int, float, float]]:
+    """
+    Compares codecs on the payloads. Returns a list of
+    (codec, payload, encoded size, encode time, decode time) tuples,
+    where times are average seconds per operation.
+    """
+    payloads = payloads if payloads is not None else BENCHMARK_PAYLOADS
+    if codecs is None:
+        codecs = [JSONCodec()] + [
+            codec()
+            for codec, dependency in [
+                (OrjsonCodec, orjson),
+                (MsgPackCodec, msgpack),
+                (CBORCodec, cbor2),
+            ]
+            if dependency is not None
+        ]
+    results = []
+    for codec in codecs:
+        for name, payload in payloads.items():
+            body = codec.encode(payload)
+            encode = timeit.timeit(lambda: codec.encode(payload), number=number)
+            decode = timeit.timeit(lambda: codec.decode(body), number=number)
+            results.append(
+                (
+                    type(codec).__name__,
+                    name,
+                    len(body),
+                    encode / number,
+                    decode / number,
+                )
+            )
+    return results
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print(
+        f"{'codec':<14}{'payload':<18}{'size [B]':>10}{'enc [us]':>11}{'dec [us]':>11}"
+    )
+    for codec_name, payload_name, size, encode, decode in benchmark():
+        print(
+            f"{codec_name:<14}{payload_name:<18}{size:>10}"
+            f"{encode * 1e6:>11.1f}{decode * 1e6:>11.1f}"
+        )
@@ -0,0 +1,486 @@
+import threading
+import time
+import zlib
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+from ezrest.requests import (
+    AsyncConnector,
+    AsyncConnectorWrapper,
+    Connector,
+    ConnectorWrapper,
+    RawBytes,
+    url_template,
+)
+
+try:
+    import zstandard  # type: ignore
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover
+    brotli = None  # type: ignore
+
+_ResponseType = TypeVar("_ResponseType")
+
+
+class Decompressor:
+    """Incremental decompressor interface (compatible with zlib objects)"""
+
+    def decompress(self, chunk: bytes) -> bytes:
+        """Decompresses the chunk, returns available decompressed data"""
+        raise NotImplementedError()
+
+    def flush(self) -> bytes:
+        """Returns remaining decompressed data"""
+        raise NotImplementedError()
+
+
+class Compressor:
+    """
+    Compressor interface - compresses request bodies and decompresses
+    response bodies of a single content coding.
+    """
+
+    encoding: str = ""
+    """Content coding token (Content-Encoding/Accept-Encoding header value)"""
+
+    def compress(self, data: bytes) -> bytes:
+        """Compresses the whole body"""
+        raise NotImplementedError()
+
+    def decompressor(self) -> Decompressor:
+        """Returns new incremental decompressor"""
+        raise NotImplementedError()
+
+
+class GzipCompressor(Compressor):
+    """gzip content coding based on the standard library"""
+
+    encoding = "gzip"
+
+    def __init__(self, level: int = 6) -> None:
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    def decompressor(self) -> Decompressor:
+        return zlib.decompressobj(31)  # type: ignore
+
+
+class DeflateCompressor(Compressor):
+    """deflate (zlib) content coding based on the standard library"""
+
+    encoding = "deflate"
+
+    def __init__(self, level: int = 6) -> None:
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompressor(self) -> Decompressor:
+        return zlib.decompressobj()  # type: ignore
+
+
+class ZstdCompressor(Compressor):
+    """zstd content coding based on the zstandard package"""
+
+    encoding = "zstd"
+
+    def __init__(self, level: int = 3) -> None:
+        if zstandard is None:  # pragma: no cover
+            raise ImportError("ZstdCompressor requires 'zstandard' package")
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(self.level).compress(data)
+
+    def decompressor(self) -> Decompressor:
+        return zstandard.ZstdDecompressor().decompressobj()
+
+
+class _BrotliDecompressor(Decompressor):
+    def __init__(self) -> None:
+        self._decompressor = brotli.Decompressor()
+
+    def decompress(self, chunk: bytes) -> bytes:
+        return self._decompressor.process(chunk)
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class BrotliCompressor(Compressor):
+    """br content coding based on the brotli package"""
+
+    encoding = "br"
+
+    def __init__(self, quality: int = 5) -> None:
+        if brotli is None:  # pragma: no cover
+            raise ImportError("BrotliCompressor requires 'brotli' package")
+        self.quality = quality
+
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self.quality)
+
+    def decompressor(self) -> Decompressor:
+        return _BrotliDecompressor()
+
+
+def available_compressors() -> Dict[str, Compressor]:
+    """
+    Returns compressors indexed by the content coding
+    (gzip, deflate; zstd and br if the packages are installed)
+    """
+    compressors: List[Compressor] = [GzipCompressor(), DeflateCompressor()]
+    if zstandard is not None:  # pragma: no cover
+        compressors.append(ZstdCompressor())
+    if brotli is not None:  # pragma: no cover
+        compressors.append(BrotliCompressor())
+    return {compressor.encoding: compressor for compressor in compressors}
+
+
+def accept_encoding(compressors: Optional[Dict[str, Compressor]] = None) -> str:
+    """Returns Accept-Encoding header value listing the compressors"""
+    compressors = compressors if compressors is not None else available_compressors()
+    return ", ".join(compressors)
+
+
+def _decompressors(
+    encoding: Optional[str], compressors: Optional[Dict[str, Compressor]]
+) -> List[Decompressor]:
+    """Returns decompressors for Content-Encoding value (in decoding order)"""
+    compressors = compressors if compressors is not None else available_compressors()
+    codings = [
+        coding.strip().lower()
+        for coding in (encoding or "").split(",")
+        if coding.strip().lower() not in ("", "identity")
+    ]
+    unknown = [coding for coding in codings if coding not in compressors]
+    if unknown:
+        raise LookupError(f"Unsupported content coding: {', '.join(unknown)}")
+    return [compressors[coding].decompressor() for coding in reversed(codings)]
+
+
+def _feed(decompressors: List[Decompressor], chunk: bytes) -> bytes:
+    for decompressor in decompressors:
+        chunk = decompressor.decompress(chunk)
+    return chunk
+
+
+def _flush(decompressors: List[Decompressor]) -> bytes:
+    output = b""
+    for i, decompressor in enumerate(decompressors):
+        output = _feed(decompressors[i + 1 :], output + decompressor.flush())
+    return output
+
+
+def decompress_stream(
+    chunks: Iterable[RawBytes],
+    encoding: Optional[str],
+    compressors: Optional[Dict[str, Compressor]] = None,
+) -> Iterator[bytes]:
+    """
+    Decompresses the response body chunk by chunk according to the
+    Content-Encoding header value (eg. 'gzip', 'br', 'gzip, zstd').
+    The whole body is never held in memory.
+    """
+    decompressors = _decompressors(encoding, compressors)
+    for chunk in chunks:
+        output = _feed(decompressors, bytes(chunk))
+        if output:
+            yield output
+    output = _flush(decompressors)
+    if output:
+        yield output
+
+
+async def async_decompress_stream(
+    chunks: AsyncIterable[RawBytes],
+    encoding: Optional[str],
+    compressors: Optional[Dict[str, Compressor]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Decompresses the response body chunk by chunk according to the
+    Content-Encoding header value (eg. 'gzip', 'br', 'gzip, zstd').
+    The whole body is never held in memory.
+    """
+    decompressors = _decompressors(encoding, compressors)
+    async for chunk in chunks:
+        output = _feed(decompressors, bytes(chunk))
+        if output:
+            yield output
+    output = _flush(decompressors)
+    if output:
+        yield output
+
+
+def decompress(
+    body: RawBytes,
+    encoding: Optional[str],
+    compressors: Optional[Dict[str, Compressor]] = None,
+) -> bytes:
+    """Decompresses the whole response body (see decompress_stream())"""
+    return b"".join(decompress_stream([body], encoding, compressors))
+
+
+class CompressionStats(NamedTuple):
+    """Measured compression benefit of a content coding for an endpoint"""
+
+    encoding: str
+    samples: int
+    """Number of compressed bodies"""
+
+    ratio: float
+    """Average compressed/original size ratio"""
+
+    throughput: float
+    """Average compression speed in bytes per second"""
+
+    benefit: float
+    """Estimated transfer time saved per MB of the body (in seconds)"""
+
+
+class _Measurement:
+    def __init__(self) -> None:
+        self.samples = 0
+        self.ratio = 1.0
+        self.seconds_per_byte = 0.0
+
+    def add(self, ratio: float, seconds_per_byte: float, smoothing: float):
+        weight = 1.0 if self.samples == 0 else smoothing
+        self.ratio += weight * (ratio - self.ratio)
+        self.seconds_per_byte += weight * (seconds_per_byte - self.seconds_per_byte)
+        self.samples += 1
+
+    def benefit(self, bandwidth: float) -> float:
+        """Seconds saved per byte of the body"""
+        return (1 - self.ratio) / bandwidth - self.seconds_per_byte
+
+
+class CompressionSelector:
+    """
+    Compression Selector - compresses request bodies with the content coding
+    bringing the highest measured benefit, chosen separately for each
+    endpoint (URL template by default).
+
+    Bodies smaller than `threshold` bytes are not compressed. The benefit of
+    a coding is the transfer time saved at the given `bandwidth` (bytes per
+    second) minus the compression time, based on the moving averages of the
+    compression ratio and speed measured on the actual bodies. Each coding
+    is tried on the first `trials` bodies of each endpoint and re-measured
+    every `explore_every` bodies, so that the choice follows the payloads.
+    If no coding saves time, bodies are sent uncompressed.
+    """
+
+    def __init__(
+        self,
+        compressors: Optional[Dict[str, Compressor]] = None,
+        threshold: int = 1024,
+        bandwidth: float = 10e6,
+        trials: int = 2,
+        explore_every: int = 100,
+        smoothing: float = 0.2,
+        key: Callable[[str], str] = url_template,
+    ) -> None:
+        self.compressors = (
+            compressors if compressors is not None else available_compressors()
+        )
+        self.threshold = threshold
+        self.bandwidth = bandwidth
+        self.trials = trials
+        self.explore_every = explore_every
+        self.smoothing = smoothing
+        self.key = key
+        self._measurements: Dict[str, Dict[str, _Measurement]] = {}
+        self._requests: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _choose(self, key: str) -> Optional[str]:
+        measurements = self._measurements.setdefault(
+            key, {encoding: _Measurement() for encoding in self.compressors}
+        )
+        requests = self._requests[key] = self._requests.get(key, 0) + 1
+        least_sampled = min(measurements, key=lambda e: measurements[e].samples)
+        if (
+            measurements[least_sampled].samples < self.trials
+            or requests % self.explore_every == 0
+        ):
+            return least_sampled
+        best = max(measurements, key=lambda e: measurements[e].benefit(self.bandwidth))
+        return best if measurements[best].benefit(self.bandwidth) > 0 else None
+
+    def compress(self, url: str, body: bytes) -> Tuple[bytes, Optional[str]]:
+        """
+        Compresses the request body to the URL.
+        Returns (body, content coding) pair, the coding is None if the body
+        was not compressed.
+        """
+        if len(body) < self.threshold or not self.compressors:
+            return body, None
+        key = self.key(url)
+        with self._lock:
+            encoding = self._choose(key)
+        if encoding is None:
+            return body, None
+        start = time.perf_counter()
+        compressed = self.compressors[encoding].compress(body)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._measurements[key][encoding].add(
+                len(compressed) / len(body), elapsed / len(body), self.smoothing
+            )
+        if len(compressed) >= len(body):
+            return body, None
+        return compressed, encoding
+
+    def choice(self, url: str) -> Optional[str]:
+        """Returns the content coding currently preferred for the URL"""
+        with self._lock:
+            measurements = self._measurements.get(self.key(url), {})
+            benefits = {e: m.benefit(self.bandwidth) for e, m in measurements.items()}
+        best = max(benefits, key=lambda e: benefits[e], default=None)
+        return best if best is not None and benefits[best] > 0 else None
+
+    def stats(self) -> Dict[str, List[CompressionStats]]:
+        """Returns measurements of all codings indexed by the endpoint key"""
+        with self._lock:
+            return {
+                key: [
+                    CompressionStats(
+                        encoding,
+                        m.samples,
+                        m.ratio,
+                        1 / m.seconds_per_byte if m.seconds_per_byte else 0.0,
+                        m.benefit(self.bandwidth) * 1e6,
+                    )
+                    for encoding, m in measurements.items()
+                ]
+                for key, measurements in self._measurements.items()
+            }
+
+
+# Methods sending the request body
+COMPRESSED_METHODS = ("post", "put", "patch")
+
+
+def _compress_kwargs(
+    selector: CompressionSelector,
+    url: str,
+    kwargs: Dict[str, Any],
+    body_argument: str,
+    headers_argument: str,
+) -> Dict[str, Any]:
+    body = kwargs.get(body_argument)
+    if not isinstance(body, (bytes, bytearray, memoryview)):
+        return kwargs
+    headers = dict(kwargs.get(headers_argument) or {})
+    if any(name.lower() == "content-encoding" for name in headers):
+        # Already encoded by the caller
+        return kwargs
+    body, encoding = selector.compress(url, bytes(body))
+    if encoding is None:
+        return kwargs
+    headers["Content-Encoding"] = encoding
+    return {**kwargs, body_argument: body, headers_argument: headers}
+
+
+class CompressingConnector(ConnectorWrapper[_ResponseType]):
+    """
+    Synchronous Compressing Connector - compresses request bodies of
+    POST/PUT/PATCH requests (see CompressionSelector).
+
+    The body is taken from the `body_argument` keyword argument (`content`
+    by default, as in httpx) if it contains bytes - encode the data first,
+    eg. with encode_body(). The compressed body replaces it and the
+    Content-Encoding header is added to the `headers_argument` keyword
+    argument. Bodies which already have the Content-Encoding header and
+    other requests are passed through.
+
+    Only the request bodies are compressed - the wrapper does not see the
+    response headers, so the responses have to be decompressed by the
+    wrapped connector (eg. with decompress_stream() in stream_raw()).
+
+    Example:
+
+    connector = CompressingConnector(MyConnector(), CompressionSelector(bandwidth=5e6))
+    api_root.items.post(content=connector.encode_body(items))
+    """
+
+    selector: CompressionSelector
+    """Selector compressing the bodies"""
+
+    def __init__(
+        self,
+        connector: Connector[_ResponseType],
+        selector: Optional[CompressionSelector] = None,
+        body_argument: str = "content",
+        headers_argument: str = "headers",
+    ) -> None:
+        super().__init__(connector)
+        self.selector = selector or CompressionSelector()
+        self.body_argument = body_argument
+        self.headers_argument = headers_argument
+
+    def _request(self, method: str, url: str, **kwargs) -> _ResponseType:
+        if method in COMPRESSED_METHODS:
+            kwargs = _compress_kwargs(
+                self.selector, url, kwargs, self.body_argument, self.headers_argument
+            )
+        return super()._request(method, url, **kwargs)
+
+
+class AsyncCompressingConnector(AsyncConnectorWrapper[_ResponseType]):
+    """
+    Asynchronous Compressing Connector - compresses request bodies of
+    POST/PUT/PATCH requests (see CompressionSelector).
+
+    The body is taken from the `body_argument` keyword argument (`content`
+    by default, as in httpx) if it contains bytes - encode the data first,
+    eg. with encode_body(). The compressed body replaces it and the
+    Content-Encoding header is added to the `headers_argument` keyword
+    argument. Bodies which already have the Content-Encoding header and
+    other requests are passed through.
+
+    Only the request bodies are compressed - the wrapper does not see the
+    response headers, so the responses have to be decompressed by the
+    wrapped connector (eg. with decompress_stream() in stream_raw()).
+    """
+
+    selector: CompressionSelector
+    """Selector compressing the bodies"""
+
+    def __init__(
+        self,
+        connector: AsyncConnector[_ResponseType],
+        selector: Optional[CompressionSelector] = None,
+        body_argument: str = "content",
+        headers_argument: str = "headers",
+    ) -> None:
+        super().__init__(connector)
+        self.selector = selector or CompressionSelector()
+        self.body_argument = body_argument
+        self.headers_argument = headers_argument
+
+    async def _request(self, method: str, url: str, **kwargs) -> _ResponseType:
+        if method in COMPRESSED_METHODS:
+            kwargs = _compress_kwargs(
+                self.selector, url, kwargs, self.body_argument, self.headers_argument
+            )
+        return await super()._request(method, url, **kwargs)
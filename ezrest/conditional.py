@@ -0,0 +1,225 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple, TypeVar
+from ezrest.requests import (
+    AsyncConnector,
+    AsyncConnectorWrapper,
+    ConditionalResponse,
+    Connector,
+    ConnectorWrapper,
+    _request_key,
+)
+
+_ResponseType = TypeVar("_ResponseType")
+
+
+def conditional_headers(
+    etag: Optional[str] = None, last_modified: Optional[str] = None
+) -> Dict[str, str]:
+    """Returns If-None-Match / If-Modified-Since headers of the validators"""
+    headers = {}
+    if etag is not None:
+        headers["If-None-Match"] = etag
+    if last_modified is not None:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+class ConditionalStats(NamedTuple):
+    """Snapshot of the conditional request counters"""
+
+    requests: int
+    """Number of GET requests"""
+
+    not_modified: int
+    """Number of requests answered with 304 Not Modified"""
+
+    entries: int
+    """Number of remembered responses"""
+
+
+class _Entry(NamedTuple):
+    response: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class _Validators:
+    """Remembered responses and their validators (least recently used first)"""
+
+    def __init__(self, max_entries: Optional[int]) -> None:
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self.requests = 0
+        self.not_modified = 0
+
+    def stats(self) -> ConditionalStats:
+        return ConditionalStats(self.requests, self.not_modified, len(self.entries))
+
+    def lookup(self, key: str) -> Optional[_Entry]:
+        self.requests += 1
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def update(
+        self, key: str, entry: Optional[_Entry], result: ConditionalResponse
+    ) -> ConditionalResponse:
+        """Remembers the response or resolves the 304 response"""
+        if not result.changed:
+            self.not_modified += 1
+            if entry is None:
+                return result
+            return ConditionalResponse(
+                entry.response,
+                False,
+                result.etag or entry.etag,
+                result.last_modified or entry.last_modified,
+            )
+        if result.etag is None and result.last_modified is None:
+            self.entries.pop(key, None)
+            return result
+        self.entries[key] = _Entry(result.response, result.etag, result.last_modified)
+        self.entries.move_to_end(key)
+        if self.max_entries is not None and len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return result
+
+
+def _explicit(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> bool:
+    """Checks whether the validators were passed by the caller"""
+    return bool(args) or "etag" in kwargs or "last_modified" in kwargs
+
+
+class ConditionalConnector(ConnectorWrapper[_ResponseType]):
+    """
+    Synchronous Conditional Connector - turns GET requests into conditional
+    requests for polling workloads.
+
+    The validators (ETag and Last-Modified) and the decoded response are
+    remembered per request (compiled URL and keyword arguments) and sent
+    with the next request of the same URL via `get_conditional()` of the
+    wrapped connector (which has to implement it, see Connector). When the
+    server responds with 304 Not Modified, the remembered response is
+    returned without transferring or decoding the body again.
+
+    The `get()` method returns the (remembered) response, `get_conditional()`
+    returns ConditionalResponse whose `changed` flag tells the callers
+    whether the response differs from the previous one. Up to `max_entries`
+    least recently used responses are remembered (None - unbounded).
+
+    NOTE: The remembered response is returned as it is - callers must not
+    modify it.
+
+    Example:
+
+    connector = ConditionalConnector(MyConnector())
+    api_root = MyEndpoint(BASE_URL, connector)
+    while True:
+        status = api_root.jobs[5].get_conditional()
+        if status.changed:
+            print(status.response)
+        time.sleep(5)
+    """
+
+    def __init__(
+        self, connector: Connector[_ResponseType], max_entries: Optional[int] = None
+    ) -> None:
+        super().__init__(connector)
+        self._validators = _Validators(max_entries)
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> ConditionalStats:
+        """Request counters"""
+        with self._lock:
+            return self._validators.stats()
+
+    def _request(self, method: str, url: str, **kwargs) -> _ResponseType:
+        if method == "get":
+            return self.get_conditional(url, **kwargs).response
+        return super()._request(method, url, **kwargs)
+
+    def get_conditional(self, url: str, *args, **kwargs) -> ConditionalResponse:
+        if _explicit(args, kwargs):
+            return super().get_conditional(url, *args, **kwargs)
+        key = _request_key("get", url, kwargs)
+        if key is None:
+            return super().get_conditional(url, **kwargs)
+        with self._lock:
+            entry = self._validators.lookup(key)
+        etag, last_modified = (None, None) if entry is None else entry[1:]
+        result = super().get_conditional(url, etag, last_modified, **kwargs)
+        with self._lock:
+            return self._validators.update(key, entry, result)
+
+    def forget(self):
+        """Forgets the remembered responses"""
+        with self._lock:
+            self._validators.entries.clear()
+
+
+class AsyncConditionalConnector(AsyncConnectorWrapper[_ResponseType]):
+    """
+    Asynchronous Conditional Connector - turns GET requests into conditional
+    requests for polling workloads.
+
+    The validators (ETag and Last-Modified) and the decoded response are
+    remembered per request (compiled URL and keyword arguments) and sent
+    with the next request of the same URL via `get_conditional()` of the
+    wrapped connector (which has to implement it, see AsyncConnector). When
+    the server responds with 304 Not Modified, the remembered response is
+    returned without transferring or decoding the body again.
+
+    The `get()` method returns the (remembered) response, `get_conditional()`
+    returns ConditionalResponse whose `changed` flag tells the callers
+    whether the response differs from the previous one. Up to `max_entries`
+    least recently used responses are remembered (None - unbounded).
+
+    NOTE: The remembered response is returned as it is - callers must not
+    modify it.
+
+    Example:
+
+    connector = AsyncConditionalConnector(MyConnector())
+    api_root = MyEndpoint(BASE_URL, connector)
+    while True:
+        status = await api_root.jobs[5].get_conditional()
+        if status.changed:
+            print(status.response)
+        await asyncio.sleep(5)
+    """
+
+    def __init__(
+        self,
+        connector: AsyncConnector[_ResponseType],
+        max_entries: Optional[int] = None,
+    ) -> None:
+        super().__init__(connector)
+        self._validators = _Validators(max_entries)
+
+    @property
+    def stats(self) -> ConditionalStats:
+        """Request counters"""
+        return self._validators.stats()
+
+    async def _request(self, method: str, url: str, **kwargs) -> _ResponseType:
+        if method == "get":
+            return (await self.get_conditional(url, **kwargs)).response
+        return await super()._request(method, url, **kwargs)
+
+    async def get_conditional(self, url: str, *args, **kwargs) -> ConditionalResponse:
+        if _explicit(args, kwargs):
+            return await super().get_conditional(url, *args, **kwargs)
+        key = _request_key("get", url, kwargs)
+        if key is None:
+            return await super().get_conditional(url, **kwargs)
+        entry = self._validators.lookup(key)
+        etag, last_modified = (None, None) if entry is None else entry[1:]
+        result = await super().get_conditional(url, etag, last_modified, **kwargs)
+        return self._validators.update(key, entry, result)
+
+    def forget(self):
+        """Forgets the remembered responses"""
+        self._validators.entries.clear()
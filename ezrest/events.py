@@ -0,0 +1,156 @@
+import asyncio
+import codecs
+import re
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    List,
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+# Raw response body chunk (see ezrest.requests.RawBytes)
+_Chunk = Union[bytes, bytearray, memoryview]
+
+_LINE_END = re.compile(r"\r\n|\r|\n")
+
+
+class Event(NamedTuple):
+    """Event received from the server (eg. server-sent event)"""
+
+    data: str
+    """Event payload (data lines joined with newlines)"""
+
+    event: str = "message"
+    """Event type"""
+
+    id: Optional[str] = None
+    """Last event ID (used to resume the stream after reconnecting)"""
+
+    retry: Optional[float] = None
+    """Reconnection delay in seconds requested by the server"""
+
+
+class Change(NamedTuple):
+    """Change of the resource (see AsyncCRUD.watch())"""
+
+    kind: str
+    """Kind of the change (eg. created, updated, deleted)"""
+
+    resource: Any
+    """Latest state of the resource (state before deletion if deleted)"""
+
+    event: Optional[Event] = None
+    """Event carrying the change"""
+
+
+class StopWatching(Exception):
+    """Raised by the subscription to stop watching without reconnecting"""
+
+
+# Function parsing raw response body chunks into events
+EventParser = Callable[[AsyncIterable[_Chunk]], AsyncIterator[Event]]
+
+
+async def _lines(chunks: AsyncIterable[_Chunk]) -> AsyncIterator[str]:
+    """Splits UTF-8 encoded chunks into lines (CRLF, LF or CR terminated)"""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffer = ""
+    first = True
+    async for chunk in chunks:
+        buffer += decoder.decode(bytes(chunk))
+        if first and buffer:
+            # Byte order mark is ignored
+            buffer = buffer[1:] if buffer.startswith("\ufeff") else buffer
+            first = False
+        position = 0
+        while True:
+            match = _LINE_END.search(buffer, position)
+            if match is None or (match.group() == "\r" and match.end() == len(buffer)):
+                # Wait for the rest of the line (or \n following \r)
+                break
+            yield buffer[position : match.start()]
+            position = match.end()
+        buffer = buffer[position:]
+
+
+async def parse_sse(chunks: AsyncIterable[_Chunk]) -> AsyncIterator[Event]:
+    """
+    Parses text/event-stream (server-sent events) response body chunks.
+    Incomplete event at the end of the stream is discarded.
+    """
+    data: List[str] = []
+    event_type = ""
+    last_id: Optional[str] = None
+    retry: Optional[float] = None
+    async for line in _lines(chunks):
+        if not line:
+            if data:
+                yield Event("\n".join(data), event_type or "message", last_id, retry)
+            data, event_type = [], ""
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "data":
+            data.append(value)
+        elif field == "event":
+            event_type = value
+        elif field == "id" and "\0" not in value:
+            last_id = value
+        elif field == "retry" and value.isdigit():
+            retry = int(value) / 1000
+
+
+async def parse_lines(chunks: AsyncIterable[_Chunk]) -> AsyncIterator[Event]:
+    """
+    Parses newline-delimited response body chunks (eg. chunked long-poll
+    responses with JSON lines) - every non-empty line is an event.
+    """
+    async for line in _lines(chunks):
+        if line:
+            yield Event(line)
+
+
+async def watch_events(
+    subscribe: Callable[[Optional[str]], AsyncIterable[_Chunk]],
+    last_event_id: Optional[str] = None,
+    parser: EventParser = parse_sse,
+    retry: float = 1.0,
+    max_retries: Optional[int] = None,
+) -> AsyncIterator[Event]:
+    """
+    Yields events of the subscription and reconnects whenever the stream
+    ends or fails.
+
+    The `subscribe(last_event_id)` function opens the stream resuming after
+    the last received event ID. A stream ending after yielding events is
+    reopened right away (long-polling), otherwise after `retry` seconds (the
+    server can change the delay, eg. via SSE `retry` field). Errors are
+    re-raised after `max_retries` consecutive failed attempts (None - never).
+    Watching stops when StopWatching is raised.
+    """
+    failures = 0
+    while True:
+        received = False
+        try:
+            async for event in parser(subscribe(last_event_id)):
+                received, failures = True, 0
+                if event.id is not None:
+                    last_event_id = event.id
+                if event.retry is not None:
+                    retry = event.retry
+                yield event
+        except StopWatching:
+            return
+        except Exception:
+            failures += 1
+            if max_retries is not None and failures > max_retries:
+                raise
+        if not received:
+            await asyncio.sleep(retry)
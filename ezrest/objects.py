@@ -1,4 +1,6 @@
 from typing import AsyncIterator, Generic, Iterator, TypeVar
+from ezrest.codecs import CodecMixin
+from ezrest.events import Change
 
 # Generic type that indicates the resource type.
 # It can be a dataclass, a NamedTuple or just a class holding data
@@ -6,7 +8,7 @@ from typing import AsyncIterator, Generic, Iterator, TypeVar
 _ResourceType = TypeVar("_ResourceType")
 
 
-class CRUD(Generic[_ResourceType]):
+class CRUD(CodecMixin, Generic[_ResourceType]):
     """
     CRUD interface - defines the server data access on the object level.
 
@@ -26,6 +28,10 @@ class CRUD(Generic[_ResourceType]):
     The list() method handles these responses and iteratively `yields` resources
     one-by-one.
 
+    The codec helpers (encode_body(), decode_body()) consult the global codec
+    registry (see ezrest.codecs) and can be used when mapping raw response
+    bodies into resources.
+
     NOTE: To ensure simplicity and maintainability of your code, implementations
     of the CRUD class should focus on defining interaction at the object level,
     optionally incorporating parsing and unparsing mechanisms. Network/HTTP
@@ -65,7 +71,7 @@ class CRUD(Generic[_ResourceType]):
         raise NotImplementedError()
 
 
-class AsyncCRUD(Generic[_ResourceType]):
+class AsyncCRUD(CodecMixin, Generic[_ResourceType]):
     """
     AsyncCRUD interface - defines the server data access on the object level.
 
@@ -83,7 +89,12 @@ class AsyncCRUD(Generic[_ResourceType]):
     There is also one additional method, list(), designed to offer iterator-like
     behavior for endpoints returning collections and/or handling paginated responses.
     The list() method handles these responses and iteratively `yields` resources
-    one-by-one.
+    one-by-one. The watch() method yields changes of the resources as they
+    happen (eg. from a server-sent events subscription).
+
+    The codec helpers (encode_body(), decode_body()) consult the global codec
+    registry (see ezrest.codecs) and can be used when mapping raw response
+    bodies into resources.
 
     NOTE: To ensure simplicity and maintainability of your code, implementations
     of the CRUD class should focus on defining interaction at the object level,
@@ -123,3 +134,82 @@ class AsyncCRUD(Generic[_ResourceType]):
         """
         raise NotImplementedError()
         yield None  # pragma: no cover # supresses mypy error
+
+    async def watch(self, *args, **kwargs) -> AsyncIterator[Change]:
+        """
+        Yields changes of the resources (see ezrest.events.Change) as they
+        happen, eg. mapped from the events of AsyncEndpoint.watch():
+
+        async def watch(self, *args, **kwargs):
+            async for event in self.endpoint.users.events.watch(*args, **kwargs):
+                yield Change(event.event, User(**json.loads(event.data)), event)
+        """
+        raise NotImplementedError()
+        yield None  # pragma: no cover # supresses mypy error
+
+
+class CRUDWrapper(CRUD[_ResourceType]):
+    """
+    Synchronous CRUD Wrapper - adds behavior on top of an existing CRUD
+    instance.
+
+    All methods delegate the call to the wrapped CRUD, so the subclasses
+    (write combining, prefetching, etc.) only need to override the methods
+    they modify.
+    """
+
+    crud: CRUD[_ResourceType]
+    """Wrapped CRUD instance"""
+
+    def __init__(self, crud: CRUD[_ResourceType]) -> None:
+        self.crud = crud
+
+    def create(self, resource: _ResourceType, *args, **kwargs) -> _ResourceType:
+        return self.crud.create(resource, *args, **kwargs)
+
+    def update(self, resource: _ResourceType, *args, **kwargs) -> _ResourceType:
+        return self.crud.update(resource, *args, **kwargs)
+
+    def delete(self, resource: _ResourceType, *args, **kwargs) -> _ResourceType:
+        return self.crud.delete(resource, *args, **kwargs)
+
+    def read(self, *args, **kwargs) -> _ResourceType:
+        return self.crud.read(*args, **kwargs)
+
+    def list(self, *args, **kwargs) -> Iterator[_ResourceType]:
+        return self.crud.list(*args, **kwargs)
+
+
+class AsyncCRUDWrapper(AsyncCRUD[_ResourceType]):
+    """
+    Asynchronous CRUD Wrapper - adds behavior on top of an existing AsyncCRUD
+    instance.
+
+    All methods delegate the call to the wrapped AsyncCRUD, so the subclasses
+    (write combining, prefetching, etc.) only need to override the methods
+    they modify.
+    """
+
+    crud: AsyncCRUD[_ResourceType]
+    """Wrapped AsyncCRUD instance"""
+
+    def __init__(self, crud: AsyncCRUD[_ResourceType]) -> None:
+        self.crud = crud
+
+    async def create(self, resource: _ResourceType, *args, **kwargs) -> _ResourceType:
+        return await self.crud.create(resource, *args, **kwargs)
+
+    async def update(self, resource: _ResourceType, *args, **kwargs) -> _ResourceType:
+        return await self.crud.update(resource, *args, **kwargs)
+
+    async def delete(self, resource: _ResourceType, *args, **kwargs) -> _ResourceType:
+        return await self.crud.delete(resource, *args, **kwargs)
+
+    async def read(self, *args, **kwargs) -> _ResourceType:
+        return await self.crud.read(*args, **kwargs)
+
+    def list(self, *args, **kwargs) -> AsyncIterator[_ResourceType]:
+        return self.crud.list(*args, **kwargs)
+
+    def watch(self, *args, **kwargs) -> AsyncIterator[Change]:
+        return self.crud.watch(*args, **kwargs)
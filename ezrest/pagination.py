@@ -0,0 +1,329 @@
+import json
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    TypeVar,
+)
+from ezrest.requests import AsyncConnector, Connector, url_template
+from ezrest.tracing import (
+    ITEM_COUNT,
+    PAGE_CURSOR,
+    PAGE_NUMBER,
+    URL_TEMPLATE,
+    Span,
+    trace,
+    tracing_enabled,
+)
+
+_ResponseType = TypeVar("_ResponseType")
+_ItemType = TypeVar("_ItemType")
+
+
+class Page(NamedTuple):
+    """Single page of a paginated collection"""
+
+    items: List[Any]
+    """Items of the page"""
+
+    next_cursor: Any = None
+    """Position of the next page (None - this is the last page)"""
+
+
+class Checkpoint(NamedTuple):
+    """
+    Serializable position of the paginated iteration.
+
+    The cursor identifies the current page (page number, offset, next URL or
+    any other JSON-serializable value; None - the first page), while skip is
+    the number of items of this page that were already yielded.
+
+    NOTE: Resuming relies on the server returning the same items on the page
+    identified by the cursor.
+    """
+
+    cursor: Any = None
+    """Position of the current page (None - the first page)"""
+
+    skip: int = 0
+    """Number of items of the current page already yielded"""
+
+    def dumps(self) -> str:
+        """Serializes the checkpoint into JSON string"""
+        return json.dumps(self._asdict())
+
+    @classmethod
+    def loads(cls, data: str) -> "Checkpoint":
+        """Deserializes the checkpoint from JSON string"""
+        return cls(**json.loads(data))
+
+
+# Function called with the checkpoint at page boundaries
+CheckpointCallback = Callable[[Checkpoint], None]
+
+
+def _set_item_count(span: Span, page: Page):
+    span.set_attribute(ITEM_COUNT, len(page.items))
+
+
+class _PageState:
+    """Pagination state shared by synchronous and asynchronous iterators"""
+
+    def __init__(
+        self,
+        checkpoint: Optional[Checkpoint],
+        on_checkpoint: Optional[CheckpointCallback],
+        checkpoint_every: int,
+    ) -> None:
+        checkpoint = checkpoint or Checkpoint()
+        self.cursor: Any = checkpoint.cursor
+        self.index: int = checkpoint.skip
+        self.page: Optional[Page] = None
+        self.pages: int = 0
+        self.mapper: Optional[Callable[[Any], Any]] = None
+        self.on_checkpoint = on_checkpoint
+        self.checkpoint_every = checkpoint_every
+
+    @property
+    def checkpoint(self) -> Checkpoint:
+        return Checkpoint(self.cursor, self.index)
+
+    @property
+    def has_item(self) -> bool:
+        """Whether the current page has items that were not yielded yet"""
+        return self.page is not None and self.index < len(self.page.items)
+
+    def fetch(self, fetch: Callable[[Any], Any], url: Optional[str]) -> Any:
+        """
+        Fetches the current page
+        (within the 'ezrest.page' span if tracing is enabled)
+        """
+        if not tracing_enabled():
+            return fetch(self.cursor)
+        attributes: Dict[str, Any] = {PAGE_NUMBER: self.pages + 1}
+        if url is not None:
+            attributes[URL_TEMPLATE] = url_template(url)
+        if self.cursor is not None:
+            attributes[PAGE_CURSOR] = str(self.cursor)
+        return trace(
+            "ezrest.page", lambda: fetch(self.cursor), attributes, _set_item_count
+        )
+
+    def take(self) -> Any:
+        """Returns next item of the current page"""
+        assert self.page is not None
+        item = self.page.items[self.index]
+        self.index += 1
+        return self.mapper(item) if self.mapper else item
+
+    def advance(self) -> bool:
+        """Moves to the next page, returns False if there is no next page"""
+        assert self.page is not None
+        if self.page.next_cursor is None:
+            return False
+        self.cursor, self.index, self.page = self.page.next_cursor, 0, None
+        self.pages += 1
+        if self.on_checkpoint and self.pages % self.checkpoint_every == 0:
+            self.on_checkpoint(self.checkpoint)
+        return True
+
+    def map(self, function: Callable[[Any], Any]):
+        mapper = self.mapper
+        self.mapper = function if mapper is None else lambda x: function(mapper(x))
+
+
+class PageIterator(Generic[_ItemType]):
+    """
+    Iterator over the items of a paginated collection that exposes its
+    position as a serializable Checkpoint.
+
+    The `checkpoint` property always points right after the last yielded
+    item. A new iteration started from the checkpoint continues from that
+    item. When fetching a page fails, the iterator can also be resumed by
+    calling next() again - the failed page is fetched again.
+
+    Each page fetch is traced as 'ezrest.page' span carrying the page number
+    and the number of items (see ezrest.tracing).
+
+    Example:
+
+    items = endpoint.list(checkpoint=load_checkpoint())
+    for i, item in enumerate(items):
+        process(item)
+        if i % 1000 == 0:
+            save_checkpoint(items.checkpoint.dumps())
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Any], Page],
+        checkpoint: Optional[Checkpoint] = None,
+        on_checkpoint: Optional[CheckpointCallback] = None,
+        checkpoint_every: int = 1,
+        url: Optional[str] = None,
+    ) -> None:
+        self._fetch = fetch
+        self._url = url
+        self._state = _PageState(checkpoint, on_checkpoint, checkpoint_every)
+
+    @property
+    def checkpoint(self) -> Checkpoint:
+        """Position right after the last yielded item"""
+        return self._state.checkpoint
+
+    def map(self, function: Callable[[Any], Any]) -> "PageIterator":
+        """
+        Applies the function to every yielded item (eg. to convert it into
+        a resource in CRUD.list) and returns the same iterator
+        """
+        self._state.map(function)
+        return self
+
+    def __iter__(self) -> Iterator[_ItemType]:
+        return self
+
+    def __next__(self) -> _ItemType:
+        state = self._state
+        while True:
+            if state.page is None:
+                state.page = state.fetch(self._fetch, self._url)
+            if state.has_item:
+                return state.take()
+            if not state.advance():
+                raise StopIteration()
+
+
+class AsyncPageIterator(Generic[_ItemType]):
+    """
+    Asynchronous iterator over the items of a paginated collection that
+    exposes its position as a serializable Checkpoint.
+
+    The `checkpoint` property always points right after the last yielded
+    item. A new iteration started from the checkpoint continues from that
+    item. When fetching a page fails, the iterator can also be resumed by
+    calling __anext__() again - the failed page is fetched again.
+
+    Each page fetch is traced as 'ezrest.page' span carrying the page number
+    and the number of items (see ezrest.tracing).
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Any], Awaitable[Page]],
+        checkpoint: Optional[Checkpoint] = None,
+        on_checkpoint: Optional[CheckpointCallback] = None,
+        checkpoint_every: int = 1,
+        url: Optional[str] = None,
+    ) -> None:
+        self._fetch = fetch
+        self._url = url
+        self._state = _PageState(checkpoint, on_checkpoint, checkpoint_every)
+
+    @property
+    def checkpoint(self) -> Checkpoint:
+        """Position right after the last yielded item"""
+        return self._state.checkpoint
+
+    def map(self, function: Callable[[Any], Any]) -> "AsyncPageIterator":
+        """
+        Applies the function to every yielded item (eg. to convert it into
+        a resource in AsyncCRUD.list) and returns the same iterator
+        """
+        self._state.map(function)
+        return self
+
+    def __aiter__(self) -> AsyncIterator[_ItemType]:
+        return self
+
+    async def __anext__(self) -> _ItemType:
+        state = self._state
+        while True:
+            if state.page is None:
+                state.page = await state.fetch(self._fetch, self._url)
+            if state.has_item:
+                return state.take()
+            if not state.advance():
+                raise StopAsyncIteration()
+
+
+class PaginatedConnector(Connector[_ResponseType]):
+    """
+    Synchronous Paginated Connector - implements `list()` on top of the
+    page-level fetch_page() method.
+
+    The `list()` method returns PageIterator, which exposes the position of
+    the iteration as a serializable Checkpoint. Long-running iterations can
+    persist the checkpoint periodically (or via `on_checkpoint` callback
+    called every `checkpoint_every` pages) and resume from it in a new
+    `list()` call after a failure.
+
+    Example:
+
+    class MyConnector(PaginatedConnector[Dict[str, Any]]):
+        def fetch_page(self, url: str, cursor: Any, **kwargs) -> Page:
+            response = self.get(url, params={"page": cursor or 1})
+            last = response["page"] >= response["total_pages"]
+            return Page(response["data"], None if last else response["page"] + 1)
+
+    items = api_root.users.list(checkpoint=Checkpoint.loads(saved_checkpoint))
+    """
+
+    def fetch_page(self, url: str, cursor: Any, **kwargs) -> Page:
+        """Fetches the page identified by the cursor (None - the first page)"""
+        raise NotImplementedError()
+
+    def list(  # type: ignore[override]
+        self,
+        url: str,
+        checkpoint: Optional[Checkpoint] = None,
+        on_checkpoint: Optional[CheckpointCallback] = None,
+        checkpoint_every: int = 1,
+        **kwargs,
+    ) -> PageIterator[_ResponseType]:
+        return PageIterator(
+            lambda cursor: self.fetch_page(url, cursor, **kwargs),
+            checkpoint,
+            on_checkpoint,
+            checkpoint_every,
+            url,
+        )
+
+
+class AsyncPaginatedConnector(AsyncConnector[_ResponseType]):
+    """
+    Asynchronous Paginated Connector - implements `list()` on top of the
+    page-level fetch_page() method.
+
+    The `list()` method returns AsyncPageIterator, which exposes the position
+    of the iteration as a serializable Checkpoint. Long-running iterations can
+    persist the checkpoint periodically (or via `on_checkpoint` callback
+    called every `checkpoint_every` pages) and resume from it in a new
+    `list()` call after a failure.
+    """
+
+    async def fetch_page(self, url: str, cursor: Any, **kwargs) -> Page:
+        """Fetches the page identified by the cursor (None - the first page)"""
+        raise NotImplementedError()
+
+    def list(  # type: ignore[override]
+        self,
+        url: str,
+        checkpoint: Optional[Checkpoint] = None,
+        on_checkpoint: Optional[CheckpointCallback] = None,
+        checkpoint_every: int = 1,
+        **kwargs,
+    ) -> AsyncPageIterator[_ResponseType]:
+        return AsyncPageIterator(
+            lambda cursor: self.fetch_page(url, cursor, **kwargs),
+            checkpoint,
+            on_checkpoint,
+            checkpoint_every,
+            url,
+        )
@@ -0,0 +1,316 @@
+import asyncio
+import os
+import sys
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+# Generic type that indicates the resource type (see ezrest.objects).
+_ResourceType = TypeVar("_ResourceType")
+_T = TypeVar("_T")
+
+# Page parsing function - converts raw page body into resources.
+# When used with a process pool, it has to be picklable
+# (ie. defined at the module level).
+PageParser = Callable[[bytes], Iterable[_ResourceType]]
+
+# Generic type that indicates the partition of the collection
+# (ID range, offset window, shard key, etc.).
+_PartitionType = TypeVar("_PartitionType")
+
+
+def is_free_threaded() -> bool:
+    """Checks whether the interpreter runs without the GIL"""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def default_executor(max_workers: Optional[int] = None) -> Executor:
+    """
+    Creates executor suitable for CPU-bound parsing:
+    - ThreadPoolExecutor on free-threaded interpreters (no pickling overhead)
+    - ProcessPoolExecutor otherwise
+    """
+    if is_free_threaded():
+        return ThreadPoolExecutor(max_workers)
+    return ProcessPoolExecutor(max_workers)
+
+
+def _default_max_pending(executor: Executor) -> int:
+    return 2 * (getattr(executor, "_max_workers", None) or os.cpu_count() or 1)
+
+
+def _materialize(function: Callable[[_T], Iterable], argument: _T) -> list:
+    """Materializes function result, so that it can be sent back from the worker"""
+    return list(function(argument))
+
+
+def _map_ordered(
+    arguments: Iterable[_T],
+    function: Callable[[_T], Iterable],
+    executor: Executor,
+    max_pending: Optional[int],
+) -> Iterator:
+    """
+    Runs the function for each argument in the executor and yields items of
+    the results in the order of arguments (at most `max_pending` in flight)
+    """
+    max_pending = max_pending or _default_max_pending(executor)
+    pending: Deque[Future] = deque()
+    try:
+        for argument in arguments:
+            pending.append(executor.submit(_materialize, function, argument))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def map_pages(
+    pages: Iterable[bytes],
+    parser: PageParser,
+    executor: Executor,
+    max_pending: Optional[int] = None,
+) -> Iterator[_ResourceType]:
+    """
+    Parses raw pages in the executor and yields resources one-by-one,
+    preserving the order of pages and items.
+
+    Pages are fetched from the `pages` iterable in the calling thread while
+    previously fetched pages are parsed by the workers, so that I/O and CPU
+    work overlap. At most `max_pending` pages (2x number of workers by default)
+    are parsed or waiting for the consumer at the same time.
+
+    Example:
+
+    def parse_users(page: bytes) -> List[User]:    # module-level function
+        return [User(**item) for item in json.loads(page)["data"]]
+
+    class UserCRUD(CRUD[User]):
+        def list(self) -> Iterator[User]:
+            pages = self.raw_pages()  # user-defined, yields raw page bodies
+            yield from map_pages(pages, parse_users, self.executor)
+    """
+    return _map_ordered(pages, parser, executor, max_pending)
+
+
+_END = object()
+
+
+async def async_map_pages(
+    pages: AsyncIterable[bytes],
+    parser: PageParser,
+    executor: Executor,
+    max_pending: Optional[int] = None,
+) -> AsyncIterator[_ResourceType]:
+    """
+    Parses raw pages in the executor and yields resources one-by-one,
+    preserving the order of pages and items.
+
+    Pages are fetched from the `pages` asynchronous iterable by a separate
+    task, so the event loop keeps receiving new pages while the workers parse
+    the previous ones. At most `max_pending` pages (2x number of workers by
+    default) are parsed or waiting for the consumer at the same time.
+
+    Example:
+
+    class AsyncUserCRUD(AsyncCRUD[User]):
+        async def list(self) -> AsyncIterator[User]:
+            pages = self.raw_pages()
+            async for user in async_map_pages(pages, parse_users, self.executor):
+                yield user
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(max_pending or _default_max_pending(executor))
+
+    async def produce() -> None:
+        item: Union[object, BaseException] = _END
+        try:
+            async for page in pages:
+                await queue.put(
+                    loop.run_in_executor(executor, _materialize, parser, page)
+                )
+        except Exception as e:
+            item = e
+        await queue.put(item)
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _END:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            for resource in await item:
+                yield resource
+    finally:
+        producer.cancel()
+        while not queue.empty():
+            item = queue.get_nowait()
+            if isinstance(item, asyncio.Future):
+                item.cancel()
+
+
+def id_ranges(start: int, stop: int, size: int) -> List[Tuple[int, int]]:
+    """
+    Splits [start, stop) ID range into consecutive [from, to) ranges
+    of the given size
+    """
+    return [(low, min(low + size, stop)) for low in range(start, stop, size)]
+
+
+def offset_windows(total: int, size: int) -> List[Tuple[int, int]]:
+    """Splits collection of `total` items into (offset, limit) windows"""
+    return [(offset, min(size, total - offset)) for offset in range(0, total, size)]
+
+
+def list_partitioned(
+    list_partition: Callable[[_PartitionType], Iterable[_ResourceType]],
+    partitions: Iterable[_PartitionType],
+    executor: Executor,
+    ordered: bool = False,
+    max_pending: Optional[int] = None,
+) -> Iterator[_ResourceType]:
+    """
+    Lists partitions of the collection concurrently in the executor and
+    yields merged resources one-by-one.
+
+    The `list_partition` function lists a single partition (eg. calls
+    CRUD.list() with ID range or offset window filters). Each partition is
+    listed by a single worker and its resources are yielded when the whole
+    partition is retrieved - either in the order of partitions (`ordered`)
+    or in the order of completion. At most `max_pending` partitions
+    (2x number of workers by default) are listed at the same time.
+
+    Use ThreadPoolExecutor for I/O-bound listing. With ProcessPoolExecutor
+    the function has to be picklable (ie. defined at the module level,
+    creating its own client) and so do the resources.
+
+    Example:
+
+    def list_users(id_range: Tuple[int, int]) -> Iterator[User]:
+        return crud.list(params={"id_from": id_range[0], "id_to": id_range[1]})
+
+    with ThreadPoolExecutor(8) as executor:
+        partitions = id_ranges(0, 1_000_000, 10_000)
+        for user in list_partitioned(list_users, partitions, executor):
+            ...
+    """
+    if ordered:
+        yield from _map_ordered(partitions, list_partition, executor, max_pending)
+        return
+    max_pending = max_pending or _default_max_pending(executor)
+    running: Set[Future] = set()
+    try:
+        for partition in partitions:
+            running.add(executor.submit(_materialize, list_partition, partition))
+            while len(running) >= max_pending:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+    finally:
+        for future in running:
+            future.cancel()
+
+
+async def async_list_partitioned(
+    list_partition: Callable[[_PartitionType], AsyncIterable[_ResourceType]],
+    partitions: Iterable[_PartitionType],
+    concurrency: int = 8,
+    ordered: bool = False,
+    buffer_size: int = 1000,
+) -> AsyncIterator[_ResourceType]:
+    """
+    Lists partitions of the collection concurrently as asyncio tasks and
+    yields merged resources one-by-one.
+
+    The `list_partition` function lists a single partition (eg. calls
+    AsyncCRUD.list() with ID range or offset window filters). At most
+    `concurrency` partitions are listed at the same time.
+
+    When `ordered` is False, resources are streamed as soon as any partition
+    yields them (at most `buffer_size` resources are buffered). Otherwise
+    they are yielded in the order of partitions, so the partitions listed
+    ahead of the current one are buffered in memory.
+
+    Example:
+
+    partitions = offset_windows(total=250_000, size=5_000)
+    list_window = lambda window: crud.list(offset=window[0], limit=window[1])
+    async for user in async_list_partitioned(list_window, partitions, 16):
+        ...
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    queue: asyncio.Queue = asyncio.Queue(buffer_size)
+
+    async def stream(partition: _PartitionType) -> None:
+        async with semaphore:
+            async for resource in list_partition(partition):
+                await queue.put(resource)
+
+    async def collect(partition: _PartitionType) -> list:
+        async with semaphore:
+            return [resource async for resource in list_partition(partition)]
+
+    if ordered:
+        collectors = [asyncio.ensure_future(collect(p)) for p in partitions]
+        try:
+            for collector in collectors:
+                for resource in await collector:
+                    yield resource
+        finally:
+            for collector in collectors:
+                collector.cancel()
+        return
+
+    tasks = [asyncio.ensure_future(stream(p)) for p in partitions]
+
+    async def produce() -> None:
+        try:
+            await asyncio.gather(*tasks)
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(_END)
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _END:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        producer.cancel()
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,300 @@
+import asyncio
+import inspect
+from concurrent.futures import Executor
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+from ezrest.objects import AsyncCRUD, AsyncCRUDWrapper, CRUD, CRUDWrapper
+
+_ResourceType = TypeVar("_ResourceType")
+
+# Related resources indexed by the relation key
+_Index = Dict[Any, List[Any]]
+
+
+def _chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+class Relation:
+    """
+    Relation between resources of two CRUDs.
+
+    The `key(resource)` function returns the key of the related resource
+    (eg. author_id of a post) - or a list of keys if `many` is True - and
+    None if the resource has no related resource. Related resources are
+    fetched with `read_many(keys)` returning (an iterable of) the resources
+    matching the keys, indexed by `related_key(related)`, in batches of
+    `batch_size` keys. Without `read_many`, every unique key is fetched
+    separately with `crud.read(key)`.
+
+    The `attach(resource, related)` function returns the resource with the
+    related resource attached (None if not found) - or a list of related
+    resources if `many` is True.
+
+    If the API can embed the related resources itself (eg. via `expand`
+    query parameter), set `expand` to the name understood by the CRUD - the
+    relation is then passed to the CRUD's read()/list() as `expand` keyword
+    argument instead of being fetched.
+
+    Example:
+
+    # Many-to-one: post.author_id -> user
+    Relation(user_crud, key=lambda post: post.author_id,
+             attach=lambda post, user: post._replace(author=user))
+
+    # One-to-many: post.id <- comment.post_id (fetched in batches)
+    Relation(comment_crud, key=lambda post: post.id, many=True,
+             read_many=lambda ids: comment_crud.list(params={"post_id": ids}),
+             related_key=lambda comment: comment.post_id,
+             attach=lambda post, comments: post._replace(comments=comments))
+    """
+
+    def __init__(
+        self,
+        crud: Any,
+        key: Callable[[Any], Any],
+        attach: Callable[[Any, Any], Any],
+        many: bool = False,
+        read_many: Optional[Callable[[List[Any]], Any]] = None,
+        related_key: Optional[Callable[[Any], Any]] = None,
+        batch_size: int = 100,
+        expand: Optional[str] = None,
+    ) -> None:
+        if read_many is not None and related_key is None:
+            raise ValueError("Relation with read_many requires related_key")
+        self.crud = crud
+        self.key = key
+        self.attach = attach
+        self.many = many
+        self.read_many = read_many
+        self.related_key = related_key
+        self.batch_size = batch_size
+        self.expand = expand
+
+    def keys(self, resource: Any) -> List[Any]:
+        """Returns keys of the resources related to the resource"""
+        keys = self.key(resource)
+        if keys is None:
+            return []
+        if not self.many or not isinstance(keys, (list, tuple, set, frozenset)):
+            keys = [keys]
+        return [key for key in keys if key is not None]
+
+    def unique_keys(self, resources: List[Any]) -> List[Any]:
+        """Returns unique keys of the resources related to the resources"""
+        return list(dict.fromkeys(key for r in resources for key in self.keys(r)))
+
+    def index(self, related: Iterable[Any], index: _Index):
+        """Indexes resources fetched via read_many by their keys"""
+        assert self.related_key is not None
+        for resource in related:
+            index.setdefault(self.related_key(resource), []).append(resource)
+
+    def attach_related(self, resource: Any, index: _Index) -> Any:
+        """Attaches the indexed related resources to the resource"""
+        related = [item for key in self.keys(resource) for item in index.get(key, [])]
+        if self.many:
+            return self.attach(resource, related)
+        return self.attach(resource, related[0] if related else None)
+
+
+def _split(
+    relations: Dict[str, Relation], prefetch: Sequence[str]
+) -> Dict[str, Relation]:
+    unknown = [name for name in prefetch if name not in relations]
+    if unknown:
+        raise ValueError(f"Unknown relations: {', '.join(unknown)}")
+    return {name: relations[name] for name in prefetch}
+
+
+def _expand_kwargs(relations: Dict[str, Relation], kwargs: Dict[str, Any]):
+    expand = [relation.expand for relation in relations.values() if relation.expand]
+    if expand:
+        # Single relation can be passed by the caller as a string
+        requested = kwargs.get("expand", [])
+        if isinstance(requested, str):
+            requested = [requested]
+        kwargs = {**kwargs, "expand": [*requested, *expand]}
+    return kwargs
+
+
+class PrefetchingCRUD(CRUDWrapper[_ResourceType]):
+    """
+    Synchronous Prefetching CRUD - eagerly loads related resources instead
+    of reading them one-by-one (N+1 requests).
+
+    Relations are declared by name (see Relation). The `read()` and `list()`
+    methods accept `prefetch` argument listing the relations to load. The
+    `list()` method collects the resources into pages of `page_size`, fetches
+    the related resources of the whole page at once (in batches via
+    `read_many` or, without it, one read() per unique key - concurrently if
+    an `executor` is provided) and attaches them to the resources.
+
+    Example:
+
+    crud = PrefetchingCRUD(PostCRUD(), {"author": author_relation})
+    for post in crud.list(prefetch=["author"]):
+        print(post.author.name)
+    """
+
+    relations: Dict[str, Relation]
+    """Declared relations indexed by name"""
+
+    def __init__(
+        self,
+        crud: CRUD[_ResourceType],
+        relations: Dict[str, Relation],
+        page_size: int = 100,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        super().__init__(crud)
+        self.relations = relations
+        self.page_size = page_size
+        self.executor = executor
+
+    def _fetch(self, relation: Relation, resources: List[Any]) -> _Index:
+        keys = relation.unique_keys(resources)
+        index: _Index = {}
+        if relation.read_many is not None:
+            for chunk in _chunks(keys, relation.batch_size):
+                relation.index(relation.read_many(chunk), index)
+            return index
+        if self.executor is not None:
+            related = list(self.executor.map(relation.crud.read, keys))
+        else:
+            related = [relation.crud.read(key) for key in keys]
+        return {key: [item] for key, item in zip(keys, related)}
+
+    def _attach(
+        self, relations: Dict[str, Relation], resources: List[Any]
+    ) -> List[Any]:
+        for relation in relations.values():
+            if not relation.expand:
+                index = self._fetch(relation, resources)
+                resources = [relation.attach_related(r, index) for r in resources]
+        return resources
+
+    def read(self, *args, prefetch: Sequence[str] = (), **kwargs) -> _ResourceType:
+        relations = _split(self.relations, prefetch)
+        resource = self.crud.read(*args, **_expand_kwargs(relations, kwargs))
+        return self._attach(relations, [resource])[0]
+
+    def list(
+        self, *args, prefetch: Sequence[str] = (), **kwargs
+    ) -> Iterator[_ResourceType]:
+        relations = _split(self.relations, prefetch)
+        resources = self.crud.list(*args, **_expand_kwargs(relations, kwargs))
+        if not relations:
+            yield from resources
+            return
+        page: List[Any] = []
+        for resource in resources:
+            page.append(resource)
+            if len(page) >= self.page_size:
+                yield from self._attach(relations, page)
+                page = []
+        yield from self._attach(relations, page)
+
+
+class AsyncPrefetchingCRUD(AsyncCRUDWrapper[_ResourceType]):
+    """
+    Asynchronous Prefetching CRUD - eagerly loads related resources instead
+    of reading them one-by-one (N+1 requests).
+
+    Relations are declared by name (see Relation). The `read()` and `list()`
+    methods accept `prefetch` argument listing the relations to load. The
+    `list()` method collects the resources into pages of `page_size`, fetches
+    the related resources of the whole page at once (in batches via
+    `read_many` or, without it, one read() per unique key - at most
+    `concurrency` at the same time) and attaches them to the resources.
+
+    The `read_many` function of the relations can return an asynchronous
+    iterable (eg. AsyncCRUD.list()) or an awaitable.
+    """
+
+    relations: Dict[str, Relation]
+    """Declared relations indexed by name"""
+
+    def __init__(
+        self,
+        crud: AsyncCRUD[_ResourceType],
+        relations: Dict[str, Relation],
+        page_size: int = 100,
+        concurrency: int = 10,
+    ) -> None:
+        super().__init__(crud)
+        self.relations = relations
+        self.page_size = page_size
+        self.concurrency = concurrency
+
+    async def _fetch(self, relation: Relation, resources: List[Any]) -> _Index:
+        keys = relation.unique_keys(resources)
+        index: _Index = {}
+        if relation.read_many is not None:
+            for chunk in _chunks(keys, relation.batch_size):
+                result = relation.read_many(chunk)
+                if inspect.isawaitable(result):
+                    result = await result
+                if hasattr(result, "__aiter__"):
+                    result = [item async for item in result]
+                relation.index(result, index)
+            return index
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def read(key: Any) -> Any:
+            async with semaphore:
+                return await relation.crud.read(key)
+
+        related = await asyncio.gather(*[read(key) for key in keys])
+        return {key: [item] for key, item in zip(keys, related)}
+
+    async def _attach(
+        self, relations: Dict[str, Relation], resources: List[Any]
+    ) -> List[Any]:
+        fetched = [relation for relation in relations.values() if not relation.expand]
+        indexes = await asyncio.gather(
+            *[self._fetch(relation, resources) for relation in fetched]
+        )
+        for relation, index in zip(fetched, indexes):
+            resources = [relation.attach_related(r, index) for r in resources]
+        return resources
+
+    async def read(
+        self, *args, prefetch: Sequence[str] = (), **kwargs
+    ) -> _ResourceType:
+        relations = _split(self.relations, prefetch)
+        resource = await self.crud.read(*args, **_expand_kwargs(relations, kwargs))
+        return (await self._attach(relations, [resource]))[0]
+
+    async def _list(
+        self, relations: Dict[str, Relation], *args, **kwargs
+    ) -> AsyncIterator[_ResourceType]:
+        page: List[Any] = []
+        async for resource in self.crud.list(*args, **kwargs):
+            page.append(resource)
+            if len(page) >= self.page_size:
+                for item in await self._attach(relations, page):
+                    yield item
+                page = []
+        for item in await self._attach(relations, page):
+            yield item
+
+    def list(
+        self, *args, prefetch: Sequence[str] = (), **kwargs
+    ) -> AsyncIterator[_ResourceType]:
+        relations = _split(self.relations, prefetch)
+        kwargs = _expand_kwargs(relations, kwargs)
+        if not relations:
+            return self.crud.list(*args, **kwargs)
+        return self._list(relations, *args, **kwargs)
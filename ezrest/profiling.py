@@ -0,0 +1,263 @@
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from ezrest import tracing
+from ezrest.tracing import URL_TEMPLATE, Attributes, Span, Tracer
+
+# Spans measured by the profiler and the kind of the measured operation
+PROFILED_SPANS = {"ezrest.request": "request", "ezrest.page": "page"}
+
+# tracemalloc.reset_peak() is available since Python 3.9
+_reset_peak = getattr(tracemalloc, "reset_peak", None)
+
+
+class AllocationStats(NamedTuple):
+    """Memory allocated by the requests or pages of the URL template"""
+
+    template: str
+    """URL template"""
+
+    kind: str
+    """Measured operation (request or page)"""
+
+    operations: int
+    """Number of measured operations"""
+
+    peak: int
+    """Highest allocation peak of a single operation in bytes"""
+
+    total_peak: int
+    """Sum of the allocation peaks of the operations in bytes"""
+
+    retained: int
+    """Bytes still allocated after the operations finished"""
+
+
+class _Activation:
+    """Single period of the span being current"""
+
+    __slots__ = ("start", "peak")
+
+    def __init__(self, start: int) -> None:
+        self.start = start
+        self.peak = start
+
+
+_activations: ContextVar[Tuple[_Activation, ...]] = ContextVar(
+    "ezrest_allocation_activations", default=()
+)
+
+
+def _memory() -> Tuple[int, int]:
+    """Returns (current, peak) size of the traced memory blocks"""
+    current, peak = tracemalloc.get_traced_memory()
+    return current, peak if _reset_peak is not None else current
+
+
+class _ProfiledSpan(Span):
+    def __init__(self, profiler: "AllocationProfiler", kind: str, span: Span) -> None:
+        self.profiler = profiler
+        self.kind = kind
+        self.span = span
+        self.template = "unknown"
+        self.peak = 0
+        self.retained = 0
+        self.ended = False
+
+    def set_attribute(self, key: str, value: Any):
+        if key == URL_TEMPLATE:
+            self.template = str(value)
+        self.span.set_attribute(key, value)
+
+    def record_exception(self, exception: BaseException):
+        self.span.record_exception(exception)
+
+    def end(self):
+        self.span.end()
+        if not self.ended:
+            self.ended = True
+            self.profiler._record(self)
+
+
+class AllocationProfiler(Tracer):
+    """
+    Allocation Profiler - diagnostic mode attributing the memory allocated
+    by the requests and the pages to their URL templates.
+
+    While the profiler is active (between start() and stop() or within
+    `with` block), tracemalloc traces the allocations and the profiler
+    measures every 'ezrest.request' span (BaseEndpoint requests, including
+    every item retrieved from list()) and 'ezrest.page' span (page fetches of
+    PaginatedConnector) - the allocation peak above the memory in use when
+    the operation started and the bytes still allocated after it finished
+    (eg. items kept by the consumer of the list). The report() method returns
+    the measurements per URL template, format_report() as a table.
+
+    The profiler is a tracer: spans are passed on to the tracer that was set
+    when the profiler started (or to `tracer`), so tracing keeps working.
+
+    NOTE: Allocations of all the code running while the operation is in
+    progress are measured, so the attribution is exact for sequential
+    requests and approximate for concurrent ones. Tracing the allocations
+    slows the program down, do not keep the profiler active in production.
+    On Python 3.8 the peaks are approximated by the memory in use when the
+    operations finish.
+
+    Example:
+
+    with AllocationProfiler() as profiler:
+        for user in api_root.users.list():
+            ...
+    print(profiler.format_report())
+    """
+
+    tracer: Tracer
+    """Tracer receiving the spans"""
+
+    def __init__(self, tracer: Optional[Tracer] = None, frames: int = 1) -> None:
+        self.tracer = tracer or Tracer()
+        self.frames = frames
+        self._explicit_tracer = tracer is not None
+        self._previous: Optional[Tracer] = None
+        self._started_tracemalloc = False
+        self._active = False
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], List[int]] = {}
+
+    @property
+    def active(self) -> bool:
+        """Whether the profiler is active"""
+        return self._active
+
+    def start(self):
+        """Starts tracing the allocations and measuring the operations"""
+        if self._active:
+            return
+        self._previous = tracing._tracer
+        if not self._explicit_tracer and self._previous is not None:
+            self.tracer = self._previous
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracemalloc = True
+        tracing.set_tracer(self)
+        self._active = True
+
+    def stop(self):
+        """Stops the profiler and restores the previous tracer"""
+        if not self._active:
+            return
+        tracing.set_tracer(self._previous)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self._active = False
+
+    def __enter__(self) -> "AllocationProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start_span(self, name: str, attributes: Optional[Attributes] = None) -> Span:
+        span = self.tracer.start_span(name, attributes)
+        kind = PROFILED_SPANS.get(name)
+        if kind is None:
+            return span
+        profiled = _ProfiledSpan(self, kind, span)
+        if attributes and URL_TEMPLATE in attributes:
+            profiled.template = str(attributes[URL_TEMPLATE])
+        return profiled
+
+    @contextmanager
+    def use_span(self, span: Span) -> Iterator[Span]:
+        if not isinstance(span, _ProfiledSpan):
+            with self.tracer.use_span(span):
+                yield span
+            return
+        with self.tracer.use_span(span.span):
+            with self._measure(span):
+                yield span
+
+    @contextmanager
+    def _measure(self, span: _ProfiledSpan) -> Iterator[None]:
+        if not tracemalloc.is_tracing():
+            yield
+            return
+        parents = _activations.get()
+        current, peak = _memory()
+        if parents:
+            # Peak of the enclosing operation before it is reset
+            parents[-1].peak = max(parents[-1].peak, peak)
+        if _reset_peak is not None:
+            _reset_peak()
+        activation = _Activation(current)
+        token = _activations.set(parents + (activation,))
+        try:
+            yield
+        finally:
+            _activations.reset(token)
+            current, peak = _memory()
+            activation.peak = max(activation.peak, peak)
+            span.peak = max(span.peak, activation.peak - activation.start)
+            span.retained += current - activation.start
+            if parents:
+                parents[-1].peak = max(parents[-1].peak, activation.peak)
+
+    def _record(self, span: _ProfiledSpan):
+        with self._lock:
+            stats = self._stats.setdefault((span.template, span.kind), [0, 0, 0, 0])
+            stats[0] += 1
+            stats[1] = max(stats[1], span.peak)
+            stats[2] += span.peak
+            stats[3] += span.retained
+
+    def report(self) -> List[AllocationStats]:
+        """Returns measurements per URL template (highest peak first)"""
+        with self._lock:
+            stats = [
+                AllocationStats(template, kind, *values)
+                for (template, kind), values in self._stats.items()
+            ]
+        return sorted(stats, key=lambda s: (s.peak, s.total_peak), reverse=True)
+
+    def format_report(self, limit: Optional[int] = None) -> str:
+        """Returns the report as a text table (top `limit` rows)"""
+        header = ("URL template", "kind", "operations", "peak", "avg peak", "retained")
+        rows = [header] + [
+            (
+                s.template,
+                s.kind,
+                str(s.operations),
+                _format_size(s.peak),
+                _format_size(s.total_peak // s.operations),
+                _format_size(s.retained),
+            )
+            for s in self.report()[:limit]
+        ]
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+        return "\n".join(
+            "  ".join(
+                cell.ljust(width) if i < 2 else cell.rjust(width)
+                for i, (cell, width) in enumerate(zip(row, widths))
+            ).rstrip()
+            for row in rows
+        )
+
+    def reset(self):
+        """Removes the measurements"""
+        with self._lock:
+            self._stats.clear()
+
+
+def _format_size(size: int) -> str:
+    if abs(size) < 1024:
+        return f"{size} B"
+    value = float(size)
+    for unit in ("KiB", "MiB", "GiB"):
+        value /= 1024
+        if abs(value) < 1024 or unit == "GiB":
+            break
+    return f"{value:.1f} {unit}"
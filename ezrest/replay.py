@@ -0,0 +1,423 @@
+import asyncio
+import gzip
+import pickle
+import threading
+import time
+from collections import defaultdict, deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+from ezrest.requests import (
+    AsyncConnector,
+    AsyncConnectorWrapper,
+    Connector,
+    ConditionalResponse,
+    ConnectorWrapper,
+    RawBytes,
+    _request_key,
+)
+
+_ResponseType = TypeVar("_ResponseType")
+
+
+class RequestRecord(NamedTuple):
+    """Single request captured by the (Async)RecordingConnector"""
+
+    method: str
+    """HTTP method name (or 'list')"""
+
+    url: str
+    """Compiled URL of the request"""
+
+    key: Optional[str]
+    """
+    Request key (method, URL and keyword arguments), None if the keyword
+    arguments cannot be represented deterministically (not replayable)
+    """
+
+    response: Any
+    """Response (list of items for 'list' requests, None on error)"""
+
+    error: Optional[BaseException]
+    """Exception raised by the connector (None on success)"""
+
+    timings: Tuple[float, ...]
+    """
+    Latencies in seconds - one value for HTTP methods,
+    delays before each item (and before the end of iteration) for 'list'
+    """
+
+
+class ReplayMissError(LookupError):
+    """Raised when no recorded request matches the replayed one"""
+
+
+def read_records(path: str) -> Iterator[RequestRecord]:
+    """Reads requests stored by the (Async)RecordingConnector"""
+    with gzip.open(path, "rb") as file:
+        while True:
+            try:
+                yield pickle.load(file)
+            except EOFError:
+                return
+
+
+def _partial_list_error(url: str) -> ReplayMissError:
+    """
+    Recorded in place of the remaining items of a listing which was not
+    consumed completely (the replay must not end it silently)
+    """
+    return ReplayMissError(
+        f"Recorded 'list' request for {url} was not consumed completely"
+    )
+
+
+class _RecordWriter:
+    """Thread-safe writer appending pickled records to a gzip file"""
+
+    def __init__(self, path: str) -> None:
+        self._file = gzip.open(path, "ab")
+        self._lock = threading.Lock()
+
+    def write(
+        self,
+        method: str,
+        url: str,
+        key: Optional[str],
+        response: Any,
+        error: Optional[BaseException],
+        timings: Iterable[float],
+    ):
+        record = RequestRecord(method, url, key, response, error, tuple(timings))
+        with self._lock:
+            pickle.dump(record, self._file, pickle.HIGHEST_PROTOCOL)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class RecordingConnector(ConnectorWrapper[_ResponseType]):
+    """
+    Synchronous Recording Connector - stores every request sent through the
+    wrapped connector (method, compiled URL, keyword arguments key, response
+    or exception, latency) in a gzip-compressed file.
+
+    The file can be served back by the ReplayConnector to reproduce the
+    traffic offline. Responses and exceptions must be picklable.
+
+    Example:
+
+    with RecordingConnector(MyConnector(), "traffic.rec") as connector:
+        api_root = Endpoint[Dict[str, Any]](base_url, connector)
+        ...
+    """
+
+    def __init__(self, connector: Connector[_ResponseType], path: str) -> None:
+        super().__init__(connector)
+        self._writer = _RecordWriter(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Flushes and closes the recording file"""
+        self._writer.close()
+
+    def _request(self, method: str, url: str, **kwargs) -> _ResponseType:
+        key = _request_key(method, url, kwargs)
+        start = time.perf_counter()
+        try:
+            response = super()._request(method, url, **kwargs)
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            self._writer.write(method, url, key, None, e, (elapsed,))
+            raise
+        elapsed = time.perf_counter() - start
+        self._writer.write(method, url, key, response, None, (elapsed,))
+        return response
+
+    def _list(self, url: str, **kwargs) -> Iterator[_ResponseType]:
+        # Keyword arguments (eg. query parameters) may be modified during the
+        # iteration, so the key is generated upfront
+        key = _request_key("list", url, kwargs)
+        items: List[_ResponseType] = []
+        timings: List[float] = []
+        error: Optional[Exception] = None
+        complete = False
+        start = time.perf_counter()
+        try:
+            for item in super()._list(url, **kwargs):
+                timings.append(time.perf_counter() - start)
+                items.append(item)
+                yield item
+                start = time.perf_counter()
+            complete = True
+        except Exception as e:
+            error, complete = e, True
+            raise
+        finally:
+            timings.append(time.perf_counter() - start)
+            if not complete:
+                error = _partial_list_error(url)
+            self._writer.write("list", url, key, items, error, timings)
+
+
+class AsyncRecordingConnector(AsyncConnectorWrapper[_ResponseType]):
+    """
+    Asynchronous Recording Connector - stores every request sent through the
+    wrapped connector (method, compiled URL, keyword arguments key, response
+    or exception, latency) in a gzip-compressed file.
+
+    The file can be served back by the AsyncReplayConnector to reproduce the
+    traffic offline. Responses and exceptions must be picklable.
+    """
+
+    def __init__(self, connector: AsyncConnector[_ResponseType], path: str) -> None:
+        super().__init__(connector)
+        self._writer = _RecordWriter(path)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Flushes and closes the recording file"""
+        self._writer.close()
+
+    async def _request(self, method: str, url: str, **kwargs) -> _ResponseType:
+        key = _request_key(method, url, kwargs)
+        start = time.perf_counter()
+        try:
+            response = await super()._request(method, url, **kwargs)
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            self._writer.write(method, url, key, None, e, (elapsed,))
+            raise
+        elapsed = time.perf_counter() - start
+        self._writer.write(method, url, key, response, None, (elapsed,))
+        return response
+
+    async def _list(self, url: str, **kwargs) -> AsyncIterator[_ResponseType]:
+        # Keyword arguments (eg. query parameters) may be modified during the
+        # iteration, so the key is generated upfront
+        key = _request_key("list", url, kwargs)
+        items: List[_ResponseType] = []
+        timings: List[float] = []
+        error: Optional[Exception] = None
+        complete = False
+        start = time.perf_counter()
+        try:
+            async for item in super()._list(url, **kwargs):
+                timings.append(time.perf_counter() - start)
+                items.append(item)
+                yield item
+                start = time.perf_counter()
+            complete = True
+        except Exception as e:
+            error, complete = e, True
+            raise
+        finally:
+            timings.append(time.perf_counter() - start)
+            if not complete:
+                error = _partial_list_error(url)
+            self._writer.write("list", url, key, items, error, timings)
+
+
+class _ReplayStore:
+    """Recorded requests grouped by the request key, in the recording order"""
+
+    def __init__(self, records: Union[str, Iterable[RequestRecord]]) -> None:
+        if isinstance(records, str):
+            records = read_records(records)
+        self._records: Dict[str, Deque[RequestRecord]] = defaultdict(deque)
+        self._lock = threading.Lock()
+        for record in records:
+            if record.key is not None:
+                self._records[record.key].append(record)
+
+    def pop(self, method: str, url: str, kwargs: Dict[str, Any]) -> RequestRecord:
+        """
+        Returns the oldest matching record. The last matching record is never
+        removed, so that repeated requests can be replayed indefinitely.
+        """
+        key = _request_key(method, url, kwargs)
+        with self._lock:
+            records = None if key is None else self._records.get(key)
+            if not records:
+                raise ReplayMissError(f"No recorded '{method}' request for {url}")
+            return records.popleft() if len(records) > 1 else records[0]
+
+
+class ReplayConnector(Connector[_ResponseType]):
+    """
+    Synchronous Replay Connector - serves requests stored by the
+    (Async)RecordingConnector without contacting the server.
+
+    Requests are matched by method, compiled URL and keyword arguments.
+    Identical requests are served in the recording order. Recorded exceptions
+    are raised again. When `latency` is enabled, the original latencies
+    (divided by `speed`) are reproduced with time.sleep().
+
+    Example:
+
+    api_root = Endpoint[Dict[str, Any]](base_url, ReplayConnector("traffic.rec"))
+    """
+
+    latency: bool
+    """Whether to reproduce recorded latencies"""
+
+    speed: float
+    """Replay speed factor (2.0 - latencies are halved)"""
+
+    def __init__(
+        self,
+        records: Union[str, Iterable[RequestRecord]],
+        latency: bool = False,
+        speed: float = 1.0,
+    ) -> None:
+        self._store = _ReplayStore(records)
+        self.latency = latency
+        self.speed = speed
+
+    def _sleep(self, delay: float):
+        if self.latency:
+            time.sleep(delay / self.speed)
+
+    def _replay(self, method: str, url: str, **kwargs) -> Any:
+        record = self._store.pop(method, url, kwargs)
+        self._sleep(record.timings[0])
+        if record.error is not None:
+            raise record.error
+        return record.response
+
+    def post(self, url: str, **kwargs) -> _ResponseType:
+        return self._replay("post", url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> _ResponseType:
+        return self._replay("get", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> _ResponseType:
+        return self._replay("put", url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> _ResponseType:
+        return self._replay("patch", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> _ResponseType:
+        return self._replay("delete", url, **kwargs)
+
+    def get_raw(self, url: str, **kwargs) -> RawBytes:
+        return self._replay("get_raw", url, **kwargs)
+
+    def get_conditional(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        **kwargs,
+    ) -> ConditionalResponse:
+        return self._replay(
+            "get_conditional", url, etag=etag, last_modified=last_modified, **kwargs
+        )
+
+    def list(self, url: str, **kwargs) -> Iterator[_ResponseType]:
+        record = self._store.pop("list", url, kwargs)
+        for item, delay in zip(record.response, record.timings):
+            self._sleep(delay)
+            yield item
+        self._sleep(record.timings[-1])
+        if record.error is not None:
+            raise record.error
+
+
+class AsyncReplayConnector(AsyncConnector[_ResponseType]):
+    """
+    Asynchronous Replay Connector - serves requests stored by the
+    (Async)RecordingConnector without contacting the server.
+
+    Requests are matched by method, compiled URL and keyword arguments.
+    Identical requests are served in the recording order. Recorded exceptions
+    are raised again. When `latency` is enabled, the original latencies
+    (divided by `speed`) are reproduced with asyncio.sleep().
+    """
+
+    latency: bool
+    """Whether to reproduce recorded latencies"""
+
+    speed: float
+    """Replay speed factor (2.0 - latencies are halved)"""
+
+    def __init__(
+        self,
+        records: Union[str, Iterable[RequestRecord]],
+        latency: bool = False,
+        speed: float = 1.0,
+    ) -> None:
+        self._store = _ReplayStore(records)
+        self.latency = latency
+        self.speed = speed
+
+    async def _sleep(self, delay: float):
+        if self.latency:
+            await asyncio.sleep(delay / self.speed)
+
+    async def _replay(self, method: str, url: str, **kwargs) -> Any:
+        record = self._store.pop(method, url, kwargs)
+        await self._sleep(record.timings[0])
+        if record.error is not None:
+            raise record.error
+        return record.response
+
+    async def post(self, url: str, **kwargs) -> _ResponseType:
+        return await self._replay("post", url, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> _ResponseType:
+        return await self._replay("get", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> _ResponseType:
+        return await self._replay("put", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs) -> _ResponseType:
+        return await self._replay("patch", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> _ResponseType:
+        return await self._replay("delete", url, **kwargs)
+
+    async def get_raw(self, url: str, **kwargs) -> RawBytes:
+        return await self._replay("get_raw", url, **kwargs)
+
+    async def get_conditional(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        **kwargs,
+    ) -> ConditionalResponse:
+        return await self._replay(
+            "get_conditional", url, etag=etag, last_modified=last_modified, **kwargs
+        )
+
+    async def list(self, url: str, **kwargs) -> AsyncIterator[_ResponseType]:
+        record = self._store.pop("list", url, kwargs)
+        for item, delay in zip(record.response, record.timings):
+            await self._sleep(delay)
+            yield item
+        await self._sleep(record.timings[-1])
+        if record.error is not None:
+            raise record.error
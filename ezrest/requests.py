@@ -1,12 +1,88 @@
-from typing import Any, AsyncIterator, Generic, Iterator, TypeVar, Union
+import hashlib
+import json
+import re
+from typing import (
+    Any,
+    AsyncIterator,
+    BinaryIO,
+    Dict,
+    Generic,
+    Iterator,
+    NamedTuple,
+    Optional,
+    TypeVar,
+    Union,
+    cast,
+)
 from urllib.parse import urlparse, urlunparse
+from ezrest.codecs import CodecMixin
+from ezrest.events import Event, EventParser, parse_sse, watch_events
+from ezrest.tracing import METHOD, URL_FULL, URL_TEMPLATE, trace, tracing_enabled
 
 # Represents the type of the REST API response
 # In most cases it will be a JSON response (ie. Dict[str, Any])
 _ResponseType = TypeVar("_ResponseType")
 
+# Raw (undecoded) response body or its chunk
+RawBytes = Union[bytes, bytearray, memoryview]
 
-class Connector(Generic[_ResponseType]):
+# Destination of the raw response body:
+# a writable binary file or a writable buffer (eg. bytearray, memoryview)
+RawTarget = Union[BinaryIO, bytearray, memoryview]
+
+
+class ConditionalResponse(NamedTuple):
+    """Response of the conditional GET request (see get_conditional())"""
+
+    response: Any
+    """Decoded response (None if not modified and not known)"""
+
+    changed: bool
+    """False if the server responded with 304 Not Modified"""
+
+    etag: Optional[str] = None
+    """Value of the ETag response header"""
+
+    last_modified: Optional[str] = None
+    """Value of the Last-Modified response header"""
+
+
+# Path segments treated as identifiers by the default URL template function:
+# numbers, UUIDs and long hexadecimal strings
+_IDENTIFIER = re.compile(
+    r"^(\d+|[0-9a-fA-F]{8}-([0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}|[0-9a-fA-F]{16,})$"
+)
+
+
+def url_template(url: str) -> str:
+    """
+    Converts compiled URL into its template by replacing identifiers
+    in the path with '{}' (eg. http://x.com/posts/5 -> http://x.com/posts/{})
+    """
+    parsed_url = urlparse(url)
+    path = "/".join(
+        "{}" if _IDENTIFIER.match(segment) else segment
+        for segment in parsed_url.path.split("/")
+    )
+    return urlunparse(parsed_url._replace(path=path, query="", fragment=""))
+
+
+def _write_raw(target: RawTarget, chunk: RawBytes, offset: int) -> int:
+    """
+    Writes the chunk into the file or into the buffer at the given offset.
+    Returns the number of bytes written.
+    """
+    size = len(chunk)
+    if isinstance(target, (bytearray, memoryview)):
+        if offset + size > len(target):
+            raise BufferError("Response body does not fit into the buffer")
+        memoryview(target).cast("B")[offset : offset + size] = chunk
+        return size
+    target.write(chunk)
+    return size
+
+
+class Connector(CodecMixin, Generic[_ResponseType]):
     """
     Synchronous Connector - defines general behavior for interacting with
     specific REST API.
@@ -22,6 +98,16 @@ class Connector(Generic[_ResponseType]):
     to handle paginated responses. The `list` method should handle these
     responses and always `yield` items/resources one-by-one.
 
+    For the workloads that only forward the response body (proxies, storage),
+    the raw methods skip decoding entirely: stream_raw() yields the body in
+    chunks, get_raw() returns the whole body and get_raw_into() writes it
+    into a file or a pre-allocated buffer. Only stream_raw() has to be
+    implemented, the other two are derived from it (but can be overridden).
+
+    The codec helpers (encode_body(), decode_body(), accept_header()) consult
+    the global codec registry (see ezrest.codecs), so that the serialization
+    format can be swapped without modifying the connector.
+
     NOTE: To keep your code simple and maintainable, the implementations of
     this class should not define how the resources are converted from and into
     objects/dataclasses. The intended scope of a connector is to provide
@@ -66,8 +152,65 @@ class Connector(Generic[_ResponseType]):
         """
         raise NotImplementedError()
 
+    def stream_raw(self, url: str, **kwargs) -> Iterator[RawBytes]:
+        """
+        Performs HTTP GET request and yields raw (undecoded) response body
+        in chunks.
+
+        Example (httpx):
+
+        def stream_raw(self, url: str, **kwargs) -> Iterator[RawBytes]:
+            with self.client.stream("GET", url, **kwargs) as response:
+                response.raise_for_status()
+                yield from response.iter_raw()
+        """
+        raise NotImplementedError()
+
+    def get_raw(self, url: str, **kwargs) -> RawBytes:
+        """Performs HTTP GET request and returns raw (undecoded) response body"""
+        return b"".join(self.stream_raw(url, **kwargs))
+
+    def get_raw_into(self, url: str, target: RawTarget, **kwargs) -> int:
+        """
+        Performs HTTP GET request and writes raw (undecoded) response body
+        into the file or the buffer. Returns the number of bytes written.
+        """
+        written = 0
+        for chunk in self.stream_raw(url, **kwargs):
+            written += _write_raw(target, chunk, written)
+        return written
+
+    def get_conditional(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        **kwargs,
+    ) -> ConditionalResponse:
+        """
+        Performs conditional HTTP GET request - sends If-None-Match (etag)
+        and If-Modified-Since (last_modified) headers and returns the decoded
+        response with validators of the response. On 304 Not Modified the
+        response is None and `changed` is False.
+
+        The default implementation performs regular (unconditional) GET
+        request, override it to support the conditional requests:
+
+        def get_conditional(self, url, etag=None, last_modified=None, **kwargs):
+            headers = conditional_headers(etag, last_modified)
+            response = self.client.get(url, headers=headers, **kwargs)
+            if response.status_code == 304:
+                return ConditionalResponse(None, False, etag, last_modified)
+            response.raise_for_status()
+            return ConditionalResponse(
+                self.decode_body(response.content), True,
+                response.headers.get("ETag"), response.headers.get("Last-Modified"),
+            )
+        """
+        return ConditionalResponse(self.get(url, **kwargs), True)
 
-class AsyncConnector(Generic[_ResponseType]):
+
+class AsyncConnector(CodecMixin, Generic[_ResponseType]):
     """
     Asynchronous Connector - defines general behavior for interacting with
     specific REST API.
@@ -83,6 +226,16 @@ class AsyncConnector(Generic[_ResponseType]):
     to handle paginated responses. The `list` method should handle these
     responses and always `yield` items/resources one-by-one.
 
+    For the workloads that only forward the response body (proxies, storage),
+    the raw methods skip decoding entirely: stream_raw() yields the body in
+    chunks, get_raw() returns the whole body and get_raw_into() writes it
+    into a file or a pre-allocated buffer. Only stream_raw() has to be
+    implemented, the other two are derived from it (but can be overridden).
+
+    The codec helpers (encode_body(), decode_body(), accept_header()) consult
+    the global codec registry (see ezrest.codecs), so that the serialization
+    format can be swapped without modifying the connector.
+
     NOTE: To keep your code simple and maintainable, the implementations of
     this class should not define how the resources are converted from and into
     objects/dataclasses. The intended scope of a connector is to provide
@@ -128,6 +281,284 @@ class AsyncConnector(Generic[_ResponseType]):
         raise NotImplementedError()
         yield None  # pragma: no cover # supresses mypy error
 
+    async def stream_raw(self, url: str, **kwargs) -> AsyncIterator[RawBytes]:
+        """
+        Performs HTTP GET request and yields raw (undecoded) response body
+        in chunks.
+
+        Example (httpx):
+
+        async def stream_raw(self, url: str, **kwargs) -> AsyncIterator[RawBytes]:
+            async with self.client.stream("GET", url, **kwargs) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_raw():
+                    yield chunk
+        """
+        raise NotImplementedError()
+        yield b""  # pragma: no cover # supresses mypy error
+
+    async def subscribe(
+        self, url: str, last_event_id: Optional[str] = None, **kwargs
+    ) -> AsyncIterator[RawBytes]:
+        """
+        Opens streaming subscription (server-sent events or chunked
+        long-poll response) resuming after the last received event ID and
+        yields raw response body in chunks.
+
+        Example (httpx, server-sent events):
+
+        async def subscribe(self, url, last_event_id=None, **kwargs):
+            headers = {"Accept": "text/event-stream"}
+            if last_event_id is not None:
+                headers["Last-Event-ID"] = last_event_id
+            async with self.client.stream("GET", url, headers=headers, **kwargs) as response:
+                if response.status_code == 204:
+                    raise StopWatching()
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    yield chunk
+        """
+        raise NotImplementedError()
+        yield b""  # pragma: no cover # supresses mypy error
+
+    def watch(
+        self,
+        url: str,
+        last_event_id: Optional[str] = None,
+        parser: EventParser = parse_sse,
+        retry: float = 1.0,
+        max_retries: Optional[int] = None,
+        **kwargs,
+    ) -> AsyncIterator[Event]:
+        """
+        Yields events of the subscription (see subscribe()) parsed by the
+        parser (server-sent events by default, see ezrest.events), reconnects
+        automatically and resumes after the last received event ID.
+        """
+        return watch_events(
+            lambda event_id: self.subscribe(url, event_id, **kwargs),
+            last_event_id,
+            parser,
+            retry,
+            max_retries,
+        )
+
+    async def get_raw(self, url: str, **kwargs) -> RawBytes:
+        """Performs HTTP GET request and returns raw (undecoded) response body"""
+        return b"".join([chunk async for chunk in self.stream_raw(url, **kwargs)])
+
+    async def get_raw_into(self, url: str, target: RawTarget, **kwargs) -> int:
+        """
+        Performs HTTP GET request and writes raw (undecoded) response body
+        into the file or the buffer. Returns the number of bytes written.
+
+        NOTE: Writes to the files are blocking.
+        """
+        written = 0
+        async for chunk in self.stream_raw(url, **kwargs):
+            written += _write_raw(target, chunk, written)
+        return written
+
+    async def get_conditional(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        **kwargs,
+    ) -> ConditionalResponse:
+        """
+        Performs conditional HTTP GET request - sends If-None-Match (etag)
+        and If-Modified-Since (last_modified) headers and returns the decoded
+        response with validators of the response. On 304 Not Modified the
+        response is None and `changed` is False.
+
+        The default implementation performs regular (unconditional) GET
+        request, override it to support the conditional requests.
+        """
+        return ConditionalResponse(await self.get(url, **kwargs), True)
+
+
+_MEMORY_ADDRESS = re.compile(r"\bat 0x[0-9a-fA-F]+")
+
+
+def _key_default(value: Any) -> Any:
+    """
+    Represents non-JSON keyword arguments in the request key. Bytes are
+    hashed, sets are sorted and other objects (eg. httpx.Timeout) are
+    represented by the type name and repr. A repr containing a memory
+    address differs between processes, such values are rejected.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"sha256": hashlib.sha256(value).hexdigest()}
+    if isinstance(value, (set, frozenset)):
+        return sorted(
+            json.dumps(item, sort_keys=True, default=_key_default) for item in value
+        )
+    representation = repr(value)
+    if _MEMORY_ADDRESS.search(representation):
+        raise TypeError(f"Cannot represent {representation} in the request key")
+    return {type(value).__qualname__: representation}
+
+
+def _request_key(method: str, url: str, kwargs: Dict[str, Any]) -> Optional[str]:
+    """
+    Generates deterministic key identifying the request (the same in every
+    process). Returns None if a keyword argument value cannot be represented
+    deterministically, callers then skip caching / recording the request.
+    """
+    try:
+        payload = json.dumps(
+            [method, url, kwargs], sort_keys=True, default=_key_default
+        )
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ConnectorWrapper(Connector[_ResponseType]):
+    """
+    Synchronous Connector Wrapper - adds behavior on top of an existing
+    Connector instance.
+
+    Every HTTP method (including get_raw() and get_conditional()) is routed
+    through `_request()` and the `list()` method through `_list()`. By
+    default both of them delegate the call to the wrapped connector, so the
+    subclasses (caches, recorders, circuit breakers, etc.) only need to
+    override these two methods. The stream_raw() and get_raw_into() methods
+    are passed through without modifications.
+
+    Wrappers can be stacked since each of them is a Connector itself:
+
+    connector = CachedConnector(RecordingConnector(MyConnector(), ...), ...)
+    """
+
+    connector: Connector[_ResponseType]
+    """Wrapped connector instance"""
+
+    def __init__(self, connector: Connector[_ResponseType]) -> None:
+        self.connector = connector
+
+    def _request(self, method: str, url: str, **kwargs) -> _ResponseType:
+        """Executes HTTP request via wrapped connector"""
+        return getattr(self.connector, method)(url, **kwargs)
+
+    def _list(self, url: str, **kwargs) -> Iterator[_ResponseType]:
+        """Runs wrapped connector's list method"""
+        return self.connector.list(url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> _ResponseType:
+        return self._request("post", url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> _ResponseType:
+        return self._request("get", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> _ResponseType:
+        return self._request("put", url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> _ResponseType:
+        return self._request("patch", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> _ResponseType:
+        return self._request("delete", url, **kwargs)
+
+    def list(self, url: str, **kwargs) -> Iterator[_ResponseType]:
+        return self._list(url, **kwargs)
+
+    def stream_raw(self, url: str, **kwargs) -> Iterator[RawBytes]:
+        return self.connector.stream_raw(url, **kwargs)
+
+    def get_raw(self, url: str, **kwargs) -> RawBytes:
+        return cast(RawBytes, self._request("get_raw", url, **kwargs))
+
+    def get_raw_into(self, url: str, target: RawTarget, **kwargs) -> int:
+        return self.connector.get_raw_into(url, target, **kwargs)
+
+    def get_conditional(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        **kwargs,
+    ) -> ConditionalResponse:
+        return cast(
+            ConditionalResponse,
+            self._request(
+                "get_conditional", url, etag=etag, last_modified=last_modified, **kwargs
+            ),
+        )
+
+
+class AsyncConnectorWrapper(AsyncConnector[_ResponseType]):
+    """
+    Asynchronous Connector Wrapper - adds behavior on top of an existing
+    AsyncConnector instance.
+
+    Every HTTP method (including get_raw() and get_conditional()) is routed
+    through `_request()` and the `list()` method through `_list()`. By
+    default both of them delegate the call to the wrapped connector, so the
+    subclasses (caches, recorders, circuit breakers, etc.) only need to
+    override these two methods. The stream_raw(), subscribe() and
+    get_raw_into() methods are passed through without modifications.
+    """
+
+    connector: AsyncConnector[_ResponseType]
+    """Wrapped connector instance"""
+
+    def __init__(self, connector: AsyncConnector[_ResponseType]) -> None:
+        self.connector = connector
+
+    async def _request(self, method: str, url: str, **kwargs) -> _ResponseType:
+        """Executes HTTP request via wrapped connector"""
+        return await getattr(self.connector, method)(url, **kwargs)
+
+    def _list(self, url: str, **kwargs) -> AsyncIterator[_ResponseType]:
+        """Runs wrapped connector's list method"""
+        return self.connector.list(url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> _ResponseType:
+        return await self._request("post", url, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> _ResponseType:
+        return await self._request("get", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> _ResponseType:
+        return await self._request("put", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs) -> _ResponseType:
+        return await self._request("patch", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> _ResponseType:
+        return await self._request("delete", url, **kwargs)
+
+    def list(self, url: str, **kwargs) -> AsyncIterator[_ResponseType]:
+        return self._list(url, **kwargs)
+
+    def stream_raw(self, url: str, **kwargs) -> AsyncIterator[RawBytes]:
+        return self.connector.stream_raw(url, **kwargs)
+
+    def subscribe(self, url: str, *args, **kwargs) -> AsyncIterator[RawBytes]:
+        return self.connector.subscribe(url, *args, **kwargs)
+
+    async def get_raw(self, url: str, **kwargs) -> RawBytes:
+        return cast(RawBytes, await self._request("get_raw", url, **kwargs))
+
+    async def get_raw_into(self, url: str, target: RawTarget, **kwargs) -> int:
+        return await self.connector.get_raw_into(url, target, **kwargs)
+
+    async def get_conditional(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        **kwargs,
+    ) -> ConditionalResponse:
+        return cast(
+            ConditionalResponse,
+            await self._request(
+                "get_conditional", url, etag=etag, last_modified=last_modified, **kwargs
+            ),
+        )
+
 
 # Types that unify synchronous and asynchronous connector usage in
 # BaseEndpoint class.
@@ -220,8 +651,18 @@ class BaseEndpoint(Generic[_ConnectorType, _ResponseType]):
         return self.url.format(*url_inject)
 
     def _request(self, method: str, *url_inject, **kwargs):
-        """Executes HTTP request via connector and injects URL arguments"""
-        return getattr(self.connector, method)(self._compile_url(*url_inject), **kwargs)
+        """
+        Executes HTTP request via connector and injects URL arguments
+        (within the 'ezrest.request' span if tracing is enabled)
+        """
+        url = self._compile_url(*url_inject)
+        if not tracing_enabled():
+            return getattr(self.connector, method)(url, **kwargs)
+        return trace(
+            "ezrest.request",
+            lambda: getattr(self.connector, method)(url, **kwargs),
+            {METHOD: method, URL_TEMPLATE: url_template(self.url), URL_FULL: url},
+        )
 
     def post(self, *url_inject, **kwargs):
         """Executes HTTP POST request via connector and injects URL arguments"""
@@ -247,6 +688,30 @@ class BaseEndpoint(Generic[_ConnectorType, _ResponseType]):
         """Runs connector's list method to retrieve items one-by-one and injects URL arguments"""
         return self._request("list", *url_inject, **kwargs)
 
+    def stream_raw(self, *url_inject, **kwargs):
+        """Runs connector's stream_raw method to retrieve raw response body in chunks and injects URL arguments"""
+        return self._request("stream_raw", *url_inject, **kwargs)
+
+    def get_raw(self, *url_inject, **kwargs):
+        """Executes HTTP GET request via connector (returning raw response body) and injects URL arguments"""
+        return self._request("get_raw", *url_inject, **kwargs)
+
+    def get_raw_into(self, target: RawTarget, *url_inject, **kwargs):
+        """Executes HTTP GET request via connector (writing raw response body into target) and injects URL arguments"""
+        return self._request("get_raw_into", *url_inject, target=target, **kwargs)
+
+    def get_conditional(self, *url_inject, **kwargs):
+        """Executes conditional HTTP GET request via connector (returning ConditionalResponse) and injects URL arguments"""
+        return self._request("get_conditional", *url_inject, **kwargs)
+
+    def subscribe(self, *url_inject, **kwargs):
+        """Runs asynchronous connector's subscribe method to retrieve raw streaming subscription body in chunks and injects URL arguments"""
+        return self._request("subscribe", *url_inject, **kwargs)
+
+    def watch(self, *url_inject, **kwargs):
+        """Runs asynchronous connector's watch method to retrieve subscription events (with automatic reconnects) and injects URL arguments"""
+        return self._request("watch", *url_inject, **kwargs)
+
 
 # Type aliases that are more convenient to use.
 # If the response type is Dict[str, Any],
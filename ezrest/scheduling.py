@@ -0,0 +1,312 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+from ezrest.pagination import AsyncPageIterator, AsyncPaginatedConnector, Page
+from ezrest.requests import AsyncConnector, AsyncConnectorWrapper, url_template
+
+_ResponseType = TypeVar("_ResponseType")
+
+
+class Priority(IntEnum):
+    """Priority classes of the requests (lower value is served first)"""
+
+    INTERACTIVE = 0
+    """Latency-sensitive requests (eg. serving user interactions)"""
+
+    NORMAL = 1
+    """Requests without a priority tag"""
+
+    BULK = 2
+    """Background traffic (eg. crawls, exports, synchronization)"""
+
+
+class RequestTag(NamedTuple):
+    """Scheduling tag of the request"""
+
+    priority: int
+    """Priority class (see Priority)"""
+
+    flow: Optional[Hashable]
+    """Flow sharing the priority class fairly (None - URL template)"""
+
+
+_current_tag: ContextVar[Optional[RequestTag]] = ContextVar(
+    "ezrest_request_tag", default=None
+)
+
+
+@contextmanager
+def request_tag(priority: int, flow: Optional[Hashable] = None) -> Iterator[None]:
+    """
+    Tags requests made within the block (including the requests made by the
+    tasks created within the block) with the priority class and flow.
+
+    Example:
+
+    with request_tag(Priority.BULK, flow="nightly-export"):
+        async for user in api_root.users.list():
+            ...
+    """
+    token = _current_tag.set(RequestTag(priority, flow))
+    try:
+        yield
+    finally:
+        _current_tag.reset(token)
+
+
+class SchedulerStats(NamedTuple):
+    """Snapshot of the counters of a priority class"""
+
+    queued: int
+    """Number of requests waiting for a slot"""
+
+    dispatched: int
+    """Number of requests that obtained a slot"""
+
+    wait_time: float
+    """Total seconds the dispatched requests waited for a slot"""
+
+    max_wait_time: float
+    """Longest wait for a slot"""
+
+
+class _Waiter:
+    __slots__ = ("future", "priority", "enqueued")
+
+    def __init__(self, future: asyncio.Future, priority: int) -> None:
+        self.future = future
+        self.priority = priority
+        self.enqueued = time.perf_counter()
+
+
+class _PriorityClass:
+    def __init__(self) -> None:
+        self.virtual_time = 0.0
+        self.finish: Dict[Hashable, float] = {}
+        self.queued = 0
+        self.dispatched = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+
+
+class RequestScheduler:
+    """
+    Asynchronous request scheduler - limits the number of concurrent requests
+    to `concurrency` and decides which of the waiting requests is sent next.
+
+    Priority classes are strict: a waiting request of a lower priority class
+    is only sent if no request of a higher class (lower value) is waiting.
+    Within a priority class, the flows (URL templates by default, or the
+    flows of the request tags) share the slots by weighted fair queueing:
+    each request gets a virtual finish time of max(class virtual time, flow's
+    last finish time) + 1 / weight and the earliest one is sent first, so a
+    flow with thousands of queued requests (eg. a bulk crawl) does not delay
+    the other flows of the same class by more than one request per flow.
+    Flow weights default to 1.
+
+    If a slot is free and nothing is waiting, the request is sent right away.
+
+    Example:
+
+    scheduler = RequestScheduler(20, weights={"/reports": 4})
+    async with scheduler.slot(Priority.INTERACTIVE, "/users/{}"):
+        ...
+    """
+
+    def __init__(
+        self, concurrency: int = 10, weights: Optional[Dict[Hashable, float]] = None
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("Concurrency must be positive")
+        self.concurrency = concurrency
+        self.weights = weights or {}
+        self._active = 0
+        self._queue: List[Tuple[int, float, int, _Waiter]] = []
+        self._counter = itertools.count()
+        self._classes: Dict[int, _PriorityClass] = {}
+
+    @property
+    def active(self) -> int:
+        """Number of requests holding a slot"""
+        return self._active
+
+    def stats(self) -> Dict[int, SchedulerStats]:
+        """Returns counters of the priority classes"""
+        return {
+            priority: SchedulerStats(
+                c.queued, c.dispatched, c.wait_time, c.max_wait_time
+            )
+            for priority, c in sorted(self._classes.items())
+        }
+
+    def _class(self, priority: int) -> _PriorityClass:
+        return self._classes.setdefault(priority, _PriorityClass())
+
+    def _dispatched(self, waiter: _Waiter):
+        priority_class = self._class(waiter.priority)
+        wait_time = time.perf_counter() - waiter.enqueued
+        priority_class.dispatched += 1
+        priority_class.wait_time += wait_time
+        priority_class.max_wait_time = max(priority_class.max_wait_time, wait_time)
+
+    async def acquire(self, priority: int = Priority.NORMAL, flow: Hashable = None):
+        """Waits for a slot (has to be released with release())"""
+        priority_class = self._class(priority)
+        if self._active < self.concurrency and not self._queue:
+            self._active += 1
+            priority_class.dispatched += 1
+            return
+        start = max(priority_class.virtual_time, priority_class.finish.get(flow, 0.0))
+        finish = start + 1 / self.weights.get(flow, 1.0)
+        priority_class.finish[flow] = finish
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), priority)
+        entry = (priority, finish, next(self._counter), waiter)
+        heapq.heappush(self._queue, entry)
+        priority_class.queued += 1
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Slot was handed over right before the cancellation
+                self.release()
+            elif entry in self._queue:
+                # (release() skips and drops the waiters cancelled meanwhile)
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                priority_class.queued -= 1
+            raise
+        self._dispatched(waiter)
+
+    def release(self):
+        """Releases the slot and hands it over to the next waiting request"""
+        self._active -= 1
+        while self._queue and self._active < self.concurrency:
+            priority, finish, _, waiter = heapq.heappop(self._queue)
+            priority_class = self._class(priority)
+            priority_class.queued -= 1
+            if waiter.future.done():
+                # Cancelled, the task has not removed the entry yet
+                continue
+            priority_class.virtual_time = finish
+            self._active += 1
+            waiter.future.set_result(None)
+
+    def slot(self, priority: int = Priority.NORMAL, flow: Hashable = None):
+        """Returns asynchronous context manager holding a slot"""
+        return _Slot(self, priority, flow)
+
+
+class _Slot:
+    def __init__(self, scheduler: RequestScheduler, priority: int, flow: Any):
+        self.scheduler = scheduler
+        self.priority = priority
+        self.flow = flow
+
+    async def __aenter__(self):
+        await self.scheduler.acquire(self.priority, self.flow)
+
+    async def __aexit__(self, *exc_info):
+        self.scheduler.release()
+
+
+class AsyncSchedulingConnector(AsyncConnectorWrapper[_ResponseType]):
+    """
+    Asynchronous Scheduling Connector - sends the requests through
+    a RequestScheduler shared by all the callers of the connector.
+
+    Requests are tagged with the priority class and flow:
+    - by `priority` and `flow` keyword arguments of the call, eg.
+      `api_root.users.get(5, priority=Priority.INTERACTIVE)` (removed before
+      the request is passed to the wrapped connector),
+    - by the enclosing request_tag() block,
+    - otherwise with `default_priority`.
+    The flow defaults to `key(url)` (URL template by default), so the
+    endpoints share the slots of the priority class fairly.
+
+    The `list()` results of an AsyncPaginatedConnector are scheduled per
+    page: every fetch_page() call is a request taking a slot, so the next
+    page of a bulk listing is only fetched once the scheduler allows it.
+    Other connectors do not expose the pages, so their `list()` iteration is
+    scheduled as a single request holding a slot until it ends.
+
+    Example:
+
+    connector = AsyncSchedulingConnector(MyConnector(), concurrency=20)
+    api_root = MyEndpoint(BASE_URL, connector)
+
+    user = await api_root.users.get(5, priority=Priority.INTERACTIVE)
+    with request_tag(Priority.BULK, flow="crawler"):
+        async for item in api_root.items.list():
+            ...
+    """
+
+    scheduler: RequestScheduler
+    """Scheduler of the requests"""
+
+    def __init__(
+        self,
+        connector: AsyncConnector[_ResponseType],
+        concurrency: int = 10,
+        weights: Optional[Dict[Hashable, float]] = None,
+        default_priority: int = Priority.NORMAL,
+        key: Callable[[str], Hashable] = url_template,
+        scheduler: Optional[RequestScheduler] = None,
+    ) -> None:
+        super().__init__(connector)
+        self.scheduler = scheduler or RequestScheduler(concurrency, weights)
+        self.default_priority = default_priority
+        self.key = key
+
+    def _tag(self, url: str, kwargs: Dict[str, Any]) -> RequestTag:
+        tag = _current_tag.get()
+        priority = kwargs.pop("priority", None)
+        flow = kwargs.pop("flow", None)
+        if priority is None:
+            priority = self.default_priority if tag is None else tag.priority
+        if flow is None and tag is not None:
+            flow = tag.flow
+        return RequestTag(priority, self.key(url) if flow is None else flow)
+
+    async def _request(self, method: str, url: str, **kwargs) -> _ResponseType:
+        tag = self._tag(url, kwargs)
+        async with self.scheduler.slot(*tag):
+            return await super()._request(method, url, **kwargs)
+
+    async def _scheduled_list(
+        self, tag: RequestTag, url: str, **kwargs
+    ) -> AsyncIterator[_ResponseType]:
+        async with self.scheduler.slot(*tag):
+            async for item in super()._list(url, **kwargs):
+                yield item
+
+    def _list(self, url: str, **kwargs) -> AsyncIterator[_ResponseType]:
+        tag = self._tag(url, kwargs)
+        if not isinstance(self.connector, AsyncPaginatedConnector):
+            return self._scheduled_list(tag, url, **kwargs)
+        iterator = cast(AsyncPageIterator, super()._list(url, **kwargs))
+        fetch = iterator._fetch
+
+        async def scheduled_fetch(cursor: Any) -> Page:
+            async with self.scheduler.slot(*tag):
+                return await fetch(cursor)
+
+        iterator._fetch = scheduled_fetch
+        return iterator
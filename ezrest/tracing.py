@@ -0,0 +1,432 @@
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, TypeVar
+from ezrest.objects import AsyncCRUDWrapper, CRUDWrapper
+
+try:
+    from opentelemetry import trace as otel_trace  # type: ignore
+except ImportError:  # pragma: no cover
+    otel_trace = None  # type: ignore
+
+_ResultType = TypeVar("_ResultType")
+_ResourceType = TypeVar("_ResourceType")
+
+# Span attributes (OpenTelemetry attribute value types are recommended:
+# str, bool, int, float or a sequence of them)
+Attributes = Dict[str, Any]
+
+# Attribute names used by ezrest spans
+METHOD = "ezrest.method"
+URL_TEMPLATE = "url.template"
+URL_FULL = "url.full"
+PAGE_NUMBER = "ezrest.page.number"
+PAGE_CURSOR = "ezrest.page.cursor"
+ITEM_COUNT = "ezrest.items"
+CRUD_CLASS = "ezrest.crud"
+
+
+class Span:
+    """
+    Span interface - a single traced operation.
+    This implementation does nothing (used when tracing is disabled).
+
+    The method names follow the OpenTelemetry Span API, so OpenTelemetry
+    spans can be used directly.
+    """
+
+    def set_attribute(self, key: str, value: Any):
+        """Sets the attribute of the span"""
+
+    def record_exception(self, exception: BaseException):
+        """Records the exception raised within the span"""
+
+    def end(self):
+        """Finishes the span"""
+
+
+class Tracer:
+    """
+    Tracer interface - creates spans.
+    This implementation does nothing (used when tracing is disabled).
+
+    The start_span() method creates a new span which is a child of the
+    current span. The use_span() context manager makes the span current,
+    so that spans started within it become its children. Spans of the
+    operations that continue after the call returns (coroutines, iterators)
+    are made current only while the operation runs.
+    """
+
+    def start_span(self, name: str, attributes: Optional[Attributes] = None) -> Span:
+        """Creates a new span (a child of the current span)"""
+        return Span()
+
+    @contextmanager
+    def use_span(self, span: Span) -> Iterator[Span]:
+        """Makes the span current within the context"""
+        yield span
+
+    @contextmanager
+    def start_as_current_span(
+        self, name: str, attributes: Optional[Attributes] = None
+    ) -> Iterator[Span]:
+        """Creates a new span, makes it current and finishes it on exit"""
+        span = self.start_span(name, attributes)
+        try:
+            with self.use_span(span):
+                yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            span.end()
+
+
+class RecordedSpan(Span):
+    """Span recorded by the InMemoryTracer"""
+
+    def __init__(
+        self,
+        tracer: "InMemoryTracer",
+        name: str,
+        attributes: Optional[Attributes],
+        parent: Optional["RecordedSpan"],
+    ) -> None:
+        self._tracer = tracer
+        self.name = name
+        """Name of the span"""
+        self.attributes: Attributes = dict(attributes or {})
+        """Attributes of the span"""
+        self.parent = parent
+        """Span that was current when the span was started"""
+        self.exceptions: List[BaseException] = []
+        """Exceptions raised within the span"""
+        self.start_time = time.perf_counter()
+        """Start time (time.perf_counter() value)"""
+        self.end_time: Optional[float] = None
+        """End time (time.perf_counter() value, None - the span is not finished)"""
+
+    @property
+    def duration(self) -> float:
+        """Duration of the finished span in seconds"""
+        assert self.end_time is not None
+        return self.end_time - self.start_time
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def record_exception(self, exception: BaseException):
+        self.exceptions.append(exception)
+
+    def end(self):
+        if self.end_time is None:
+            self.end_time = time.perf_counter()
+            self._tracer._finish(self)
+
+    def __repr__(self) -> str:
+        return f"RecordedSpan({self.name!r}, {self.attributes!r})"
+
+
+class InMemoryTracer(Tracer):
+    """
+    In-Memory Tracer - keeps the finished spans in memory.
+    Useful for tests and ad-hoc profiling, no collector is needed.
+
+    Example:
+
+    tracer = InMemoryTracer()
+    set_tracer(tracer)
+    list(api_root.users.list())
+    slowest_page = max(tracer.find("ezrest.page"), key=lambda span: span.duration)
+    """
+
+    def __init__(self) -> None:
+        self._current: ContextVar[Optional[RecordedSpan]] = ContextVar(
+            "ezrest_current_span", default=None
+        )
+        self._lock = threading.Lock()
+        self.spans: List[RecordedSpan] = []
+        """Finished spans (in the order they finished)"""
+
+    def start_span(self, name: str, attributes: Optional[Attributes] = None) -> Span:
+        return RecordedSpan(self, name, attributes, self._current.get())
+
+    @contextmanager
+    def use_span(self, span: Span) -> Iterator[Span]:
+        token = self._current.set(span)  # type: ignore[arg-type]
+        try:
+            yield span
+        finally:
+            self._current.reset(token)
+
+    def _finish(self, span: RecordedSpan):
+        with self._lock:
+            self.spans.append(span)
+
+    def find(self, name: str) -> List[RecordedSpan]:
+        """Returns finished spans with the name"""
+        return [span for span in self.spans if span.name == name]
+
+    def clear(self):
+        """Removes finished spans"""
+        with self._lock:
+            self.spans.clear()
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    OpenTelemetry Tracer - reports ezrest spans via OpenTelemetry
+    (requires 'opentelemetry-api' package).
+
+    Example:
+
+    set_tracer(OpenTelemetryTracer())
+    """
+
+    def __init__(self, tracer: Any = None) -> None:
+        if otel_trace is None:  # pragma: no cover
+            raise ImportError("OpenTelemetryTracer requires 'opentelemetry-api'")
+        self.tracer = tracer or otel_trace.get_tracer("ezrest")
+        """OpenTelemetry tracer creating the spans"""
+
+    def start_span(
+        self, name: str, attributes: Optional[Attributes] = None
+    ) -> Span:  # pragma: no cover
+        return self.tracer.start_span(name, attributes=attributes)
+
+    def use_span(self, span: Span):  # pragma: no cover
+        return otel_trace.use_span(span, end_on_exit=False)
+
+
+_tracer: Optional[Tracer] = None
+
+
+def set_tracer(tracer: Optional[Tracer]):
+    """Sets the tracer used by ezrest (None - disables tracing)"""
+    global _tracer
+    _tracer = tracer
+
+
+def get_tracer() -> Tracer:
+    """Returns the tracer used by ezrest (no-op tracer if tracing is disabled)"""
+    return _tracer if _tracer is not None else Tracer()
+
+
+def tracing_enabled() -> bool:
+    """Whether a tracer is set"""
+    return _tracer is not None
+
+
+# Function called with the span and the result of the traced call
+ResultCallback = Callable[[Span, Any], None]
+
+
+class _TracedIteratorBase:
+    """
+    Iterator proxy - the span is current while the next item is retrieved
+    and finishes when the iteration ends. Other attributes are passed
+    through to the wrapped iterator.
+    """
+
+    def __init__(self, tracer: Tracer, span: Span, iterator: Any) -> None:
+        self._tracer = tracer
+        self._span = span
+        self._iterator = iterator
+        self._items = 0
+        self._ended = False
+
+    def _end(self, exception: Optional[BaseException] = None):
+        if not self._ended:
+            self._ended = True
+            self._span.set_attribute(ITEM_COUNT, self._items)
+            if exception is not None:
+                self._span.record_exception(exception)
+            self._span.end()
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._iterator, name)
+        if not callable(value):
+            return value
+
+        def call(*args, **kwargs):
+            result = value(*args, **kwargs)
+            return self if result is self._iterator else result
+
+        return call
+
+    def __del__(self):
+        self._end()
+
+
+class _TracedIterator(_TracedIteratorBase):
+    """Synchronous version of the iterator proxy"""
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            with self._tracer.use_span(self._span):
+                item = next(self._iterator)
+        except StopIteration:
+            self._end()
+            raise
+        except BaseException as e:
+            self._end(e)
+            raise
+        self._items += 1
+        return item
+
+
+class _TracedAsyncIterator(_TracedIteratorBase):
+    """Asynchronous version of the iterator proxy"""
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            with self._tracer.use_span(self._span):
+                item = await self._iterator.__anext__()
+        except StopAsyncIteration:
+            self._end()
+            raise
+        except BaseException as e:
+            self._end(e)
+            raise
+        self._items += 1
+        return item
+
+
+async def _traced_awaitable(
+    tracer: Tracer, span: Span, awaitable: Any, on_result: Optional[ResultCallback]
+) -> Any:
+    try:
+        with tracer.use_span(span):
+            result = await awaitable
+        if on_result is not None:
+            on_result(span, result)
+        return result
+    except BaseException as e:
+        span.record_exception(e)
+        raise
+    finally:
+        span.end()
+
+
+def trace(
+    name: str,
+    call: Callable[[], _ResultType],
+    attributes: Optional[Attributes] = None,
+    on_result: Optional[ResultCallback] = None,
+) -> _ResultType:
+    """
+    Runs the call within a new span (a no-op if tracing is disabled).
+
+    The span covers the whole operation: if the call returns an awaitable,
+    the span finishes when it is awaited; if the call returns an iterator
+    (eg. from list()), the span finishes when the iteration ends and
+    records the number of retrieved items. The `on_result` callback can
+    add attributes based on the result.
+    """
+    tracer = _tracer
+    if tracer is None:
+        return call()
+    span = tracer.start_span(name, attributes)
+    try:
+        with tracer.use_span(span):
+            result: Any = call()
+    except BaseException as e:
+        span.record_exception(e)
+        span.end()
+        raise
+    if inspect.isawaitable(result):
+        return _traced_awaitable(tracer, span, result, on_result)  # type: ignore
+    if hasattr(result, "__anext__"):
+        return _TracedAsyncIterator(tracer, span, result)  # type: ignore
+    if hasattr(result, "__next__"):
+        return _TracedIterator(tracer, span, result)  # type: ignore
+    if on_result is not None:
+        on_result(span, result)
+    span.end()
+    return result
+
+
+class TracedCRUD(CRUDWrapper[_ResourceType]):
+    """
+    Synchronous Traced CRUD - runs every operation of the wrapped CRUD
+    within the 'ezrest.crud.<operation>' span.
+
+    The spans carry the name of the wrapped CRUD class, the list() span also
+    carries the number of retrieved items. Requests sent by the operation
+    (via Endpoint) become children of the span.
+
+    Example:
+
+    crud = TracedCRUD(MyCRUD())
+    """
+
+    def _trace(self, operation: str, call: Callable[[], Any]) -> Any:
+        return trace(
+            f"ezrest.crud.{operation}", call, {CRUD_CLASS: type(self.crud).__name__}
+        )
+
+    def create(self, resource: _ResourceType, *args, **kwargs) -> _ResourceType:
+        return self._trace(
+            "create", lambda: self.crud.create(resource, *args, **kwargs)
+        )
+
+    def update(self, resource: _ResourceType, *args, **kwargs) -> _ResourceType:
+        return self._trace(
+            "update", lambda: self.crud.update(resource, *args, **kwargs)
+        )
+
+    def delete(self, resource: _ResourceType, *args, **kwargs) -> _ResourceType:
+        return self._trace(
+            "delete", lambda: self.crud.delete(resource, *args, **kwargs)
+        )
+
+    def read(self, *args, **kwargs) -> _ResourceType:
+        return self._trace("read", lambda: self.crud.read(*args, **kwargs))
+
+    def list(self, *args, **kwargs) -> Iterator[_ResourceType]:
+        return self._trace("list", lambda: self.crud.list(*args, **kwargs))
+
+
+class AsyncTracedCRUD(AsyncCRUDWrapper[_ResourceType]):
+    """
+    Asynchronous Traced CRUD - runs every operation of the wrapped AsyncCRUD
+    within the 'ezrest.crud.<operation>' span.
+
+    The spans carry the name of the wrapped AsyncCRUD class, the list() span
+    also carries the number of retrieved items. Requests sent by the operation
+    (via AsyncEndpoint) become children of the span.
+    """
+
+    def _trace(self, operation: str, call: Callable[[], Any]) -> Any:
+        return trace(
+            f"ezrest.crud.{operation}", call, {CRUD_CLASS: type(self.crud).__name__}
+        )
+
+    async def create(self, resource: _ResourceType, *args, **kwargs) -> _ResourceType:
+        return await self._trace(
+            "create", lambda: self.crud.create(resource, *args, **kwargs)
+        )
+
+    async def update(self, resource: _ResourceType, *args, **kwargs) -> _ResourceType:
+        return await self._trace(
+            "update", lambda: self.crud.update(resource, *args, **kwargs)
+        )
+
+    async def delete(self, resource: _ResourceType, *args, **kwargs) -> _ResourceType:
+        return await self._trace(
+            "delete", lambda: self.crud.delete(resource, *args, **kwargs)
+        )
+
+    async def read(self, *args, **kwargs) -> _ResourceType:
+        return await self._trace("read", lambda: self.crud.read(*args, **kwargs))
+
+    def list(self, *args, **kwargs) -> AsyncIterator[_ResourceType]:
+        return self._trace("list", lambda: self.crud.list(*args, **kwargs))
@@ -0,0 +1,390 @@
+import asyncio
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, TypeVar, Union
+from ezrest.objects import AsyncCRUD, AsyncCRUDWrapper, CRUD, CRUDWrapper
+
+_ResourceType = TypeVar("_ResourceType")
+
+# Function merging buffered resource state with the newer one
+MergeFunction = Callable[[Any, Any], Any]
+
+_Event = Union[threading.Event, asyncio.Event]
+
+# Resource key and the remaining update arguments
+_Group = Tuple[Hashable, str, str]
+
+
+def keep_latest(previous: Any, current: Any) -> Any:
+    """Default merge function - only the latest resource state matters"""
+    return current
+
+
+class WriteBehindStats:
+    """Counters of the write-behind CRUD"""
+
+    def __init__(self) -> None:
+        self.updates = 0
+        """Number of update() calls"""
+
+        self.requests = 0
+        """Number of updates sent to the wrapped CRUD"""
+
+
+class _Batch:
+    """Updates of a single resource buffered within the window"""
+
+    def __init__(self, group: _Group, resource: Any, event: Callable[[], _Event]):
+        self.group = group
+        self.resource = resource
+        self.flush: Any = event()
+        """Set to send the update before the window elapses"""
+        self.done: Any = event()
+        """
+        Set when the update is completed (finished is True) or when it has to
+        be sent by a waiting caller (orphaned is True, replaced by a new event)
+        """
+        self.finished = False
+        self.orphaned = False
+        """Sending caller was interrupted, one of the followers sends it"""
+        self.followers = 0
+        """Number of callers waiting for the batch sent by another caller"""
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+    def outcome(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class _WriteBehindBuffer:
+    """Buffered updates shared by synchronous and asynchronous CRUDs"""
+
+    def __init__(
+        self,
+        key: Callable[[Any], Hashable],
+        merge: MergeFunction,
+        event: Callable[[], _Event],
+    ) -> None:
+        self.key = key
+        self.merge = merge
+        self.event = event
+        self.stats = WriteBehindStats()
+        self.closed = False
+        self.lock = threading.Lock()
+        self.pending: Dict[_Group, _Batch] = {}
+        """Batches accepting updates"""
+        self.in_flight: Dict[_Group, _Batch] = {}
+        """Batches being sent (at most one per resource)"""
+
+    def add(self, resource: Any, args: tuple, kwargs: Dict[str, Any]) -> Any:
+        """
+        Buffers the update.
+        Returns (batch, is_leader) pair - the leader sends the update.
+        """
+        # Updates are combined only if their remaining arguments are the same
+        group = (self.key(resource), repr(args), repr(sorted(kwargs.items())))
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("Write-behind CRUD is closed")
+            self.stats.updates += 1
+            batch = self.pending.get(group)
+            if batch is not None:
+                batch.resource = self.merge(batch.resource, resource)
+                batch.followers += 1
+                return batch, False
+            batch = self.pending[group] = _Batch(group, resource, self.event)
+            return batch, True
+
+    def previous(self, batch: _Batch) -> Optional[_Batch]:
+        """Returns batch of the same resource being sent (to be waited for)"""
+        with self.lock:
+            previous = self.in_flight.get(batch.group)
+            return None if previous is batch else previous
+
+    def take(self, batch: _Batch) -> Any:
+        """
+        Moves the batch from the pending to the sent ones (no further updates
+        are merged into it), returns resource to send
+        """
+        with self.lock:
+            if self.pending.get(batch.group) is batch:
+                del self.pending[batch.group]
+            self.in_flight[batch.group] = batch
+            self.stats.requests += 1
+            return batch.resource
+
+    def finish(self, batch: _Batch):
+        """Removes the batch from the buffer and releases the waiting callers"""
+        with self.lock:
+            for batches in (self.pending, self.in_flight):
+                if batches.get(batch.group) is batch:
+                    del batches[batch.group]
+            batch.finished = True
+        batch.done.set()
+
+    def abandon(self, batch: _Batch, error: BaseException):
+        """
+        Called when the sending caller is interrupted - one of the followers
+        sends the batch instead (if there are none, the batch fails)
+        """
+        with self.lock:
+            done, orphaned = batch.done, batch.followers > 0
+            if orphaned:
+                batch.orphaned, batch.done = True, self.event()
+            else:
+                batch.error = error
+        if orphaned:
+            done.set()
+        else:
+            self.finish(batch)
+
+    def claim(self, batch: _Batch) -> bool:
+        """Returns True if the follower has to send the orphaned batch"""
+        with self.lock:
+            if not batch.orphaned:
+                return False
+            batch.orphaned = False
+            batch.followers -= 1
+            return True
+
+    def leave(self, batch: _Batch, error: BaseException):
+        """Called when a follower is interrupted while waiting for the batch"""
+        with self.lock:
+            batch.followers -= 1
+            if not batch.orphaned or batch.followers:
+                return
+            batch.orphaned = False
+            batch.error = error
+        self.finish(batch)
+
+    def flush(
+        self, key: Optional[Hashable] = None, close: bool = False
+    ) -> List[_Batch]:
+        """Triggers sending of the batches (of the key), returns them"""
+        with self.lock:
+            self.closed = self.closed or close
+            batches = [
+                batch
+                for batch in (*self.pending.values(), *self.in_flight.values())
+                if key is None or batch.group[0] == key
+            ]
+        for batch in batches:
+            batch.flush.set()
+        return batches
+
+
+class WriteBehindCRUD(CRUDWrapper[_ResourceType]):
+    """
+    Synchronous Write-Behind CRUD - combines rapid updates of the same
+    resource into a single request.
+
+    The first update() of a resource (identified by `key(resource)` and the
+    remaining update arguments) is delayed by `window` seconds. Updates of
+    the same resource arriving within that window are merged into the
+    buffered state (`merge(previous, current)`, by default the latest state
+    wins). The merged state is sent once and all waiting callers receive the
+    same, final server state (or the same exception). If the caller sending
+    the update is interrupted, one of the waiting callers sends it instead.
+    Updates of a resource being sent are buffered and sent once the request
+    completes, so there is at most one request per resource at a time.
+
+    The flush() method sends all buffered updates immediately and waits for
+    them. The close() method flushes and rejects further updates. Deleting
+    a resource flushes its buffered updates first. The remaining methods are
+    passed through.
+
+    Example:
+
+    with WriteBehindCRUD(MyCRUD(), key=lambda resource: resource.id) as crud:
+        crud.update(resource)    # called concurrently from multiple threads
+    """
+
+    window: float
+    """Buffering window in seconds"""
+
+    def __init__(
+        self,
+        crud: CRUD[_ResourceType],
+        key: Callable[[_ResourceType], Hashable],
+        window: float = 0.05,
+        merge: MergeFunction = keep_latest,
+    ) -> None:
+        super().__init__(crud)
+        self.window = window
+        self._buffer = _WriteBehindBuffer(key, merge, threading.Event)
+
+    @property
+    def stats(self) -> WriteBehindStats:
+        """Number of received updates and sent requests"""
+        return self._buffer.stats
+
+    def update(self, resource: _ResourceType, *args, **kwargs) -> _ResourceType:
+        batch, leader = self._buffer.add(resource, args, kwargs)
+        if leader:
+            self._send(batch, self.window, args, kwargs)
+        elif self._wait(batch, follower=True):
+            self._send(batch, 0, args, kwargs)
+        return batch.outcome()
+
+    def _send(self, batch: _Batch, window: float, args: tuple, kwargs: Dict[str, Any]):
+        try:
+            if window:
+                batch.flush.wait(window)
+            previous = self._buffer.previous(batch)
+            while previous is not None:
+                self._wait(previous)
+                previous = self._buffer.previous(batch)
+            resource = self._buffer.take(batch)
+            batch.result = self.crud.update(resource, *args, **kwargs)
+        except Exception as e:
+            batch.error = e
+        except BaseException as e:
+            self._buffer.abandon(batch, e)
+            raise
+        self._buffer.finish(batch)
+
+    def _wait(self, batch: _Batch, follower: bool = False) -> bool:
+        """
+        Waits until the batch is finished. Returns True if the follower has
+        to send it instead of the interrupted caller.
+        """
+        try:
+            while not batch.finished:
+                batch.done.wait()
+                if follower and self._buffer.claim(batch):
+                    return True
+        except BaseException as e:
+            if follower:
+                self._buffer.leave(batch, e)
+            raise
+        return False
+
+    def delete(self, resource: _ResourceType, *args, **kwargs) -> _ResourceType:
+        for batch in self._buffer.flush(self._buffer.key(resource)):
+            self._wait(batch)
+        return super().delete(resource, *args, **kwargs)
+
+    def flush(self):
+        """Sends all buffered updates and waits for them"""
+        for batch in self._buffer.flush():
+            self._wait(batch)
+
+    def close(self):
+        """Flushes buffered updates and rejects further updates"""
+        for batch in self._buffer.flush(close=True):
+            self._wait(batch)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AsyncWriteBehindCRUD(AsyncCRUDWrapper[_ResourceType]):
+    """
+    Asynchronous Write-Behind CRUD - combines rapid updates of the same
+    resource into a single request.
+
+    The first update() of a resource (identified by `key(resource)` and the
+    remaining update arguments) is delayed by `window` seconds. Updates of
+    the same resource arriving within that window are merged into the
+    buffered state (`merge(previous, current)`, by default the latest state
+    wins). The merged state is sent once and all waiting callers receive the
+    same, final server state (or the same exception). If the caller sending
+    the update is cancelled, one of the waiting callers sends it instead.
+    Updates of a resource being sent are buffered and sent once the request
+    completes, so there is at most one request per resource at a time.
+
+    The flush() method sends all buffered updates immediately and waits for
+    them. The close() method flushes and rejects further updates. Deleting
+    a resource flushes its buffered updates first. The remaining methods are
+    passed through.
+    """
+
+    window: float
+    """Buffering window in seconds"""
+
+    def __init__(
+        self,
+        crud: AsyncCRUD[_ResourceType],
+        key: Callable[[_ResourceType], Hashable],
+        window: float = 0.05,
+        merge: MergeFunction = keep_latest,
+    ) -> None:
+        super().__init__(crud)
+        self.window = window
+        self._buffer = _WriteBehindBuffer(key, merge, asyncio.Event)
+
+    @property
+    def stats(self) -> WriteBehindStats:
+        """Number of received updates and sent requests"""
+        return self._buffer.stats
+
+    async def update(self, resource: _ResourceType, *args, **kwargs) -> _ResourceType:
+        batch, leader = self._buffer.add(resource, args, kwargs)
+        if leader:
+            await self._send(batch, self.window, args, kwargs)
+        elif await self._wait(batch, follower=True):
+            await self._send(batch, 0, args, kwargs)
+        return batch.outcome()
+
+    async def _send(
+        self, batch: _Batch, window: float, args: tuple, kwargs: Dict[str, Any]
+    ):
+        try:
+            if window:
+                try:
+                    await asyncio.wait_for(batch.flush.wait(), window)
+                except asyncio.TimeoutError:
+                    pass
+            previous = self._buffer.previous(batch)
+            while previous is not None:
+                await self._wait(previous)
+                previous = self._buffer.previous(batch)
+            resource = self._buffer.take(batch)
+            batch.result = await self.crud.update(resource, *args, **kwargs)
+        except Exception as e:
+            batch.error = e
+        except BaseException as e:
+            self._buffer.abandon(batch, e)
+            raise
+        self._buffer.finish(batch)
+
+    async def _wait(self, batch: _Batch, follower: bool = False) -> bool:
+        """
+        Waits until the batch is finished. Returns True if the follower has
+        to send it instead of the cancelled caller.
+        """
+        try:
+            while not batch.finished:
+                await batch.done.wait()
+                if follower and self._buffer.claim(batch):
+                    return True
+        except BaseException as e:
+            if follower:
+                self._buffer.leave(batch, e)
+            raise
+        return False
+
+    async def delete(self, resource: _ResourceType, *args, **kwargs) -> _ResourceType:
+        for batch in self._buffer.flush(self._buffer.key(resource)):
+            await self._wait(batch)
+        return await super().delete(resource, *args, **kwargs)
+
+    async def flush(self):
+        """Sends all buffered updates and waits for them"""
+        for batch in self._buffer.flush():
+            await self._wait(batch)
+
+    async def close(self):
+        """Flushes buffered updates and rejects further updates"""
+        for batch in self._buffer.flush(close=True):
+            await self._wait(batch)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
@@ -0,0 +1,111 @@
+import asyncio
+from typing import AsyncIterator, List
+import pytest
+from ezrest.backpressure import (
+    AsyncBufferedConnector,
+    BufferedAsyncIterator,
+    BufferStats,
+)
+from ezrest.requests import AsyncConnector, AsyncEndpoint
+
+BASE_URL = "http://x.com"
+
+
+class CountingConnector(AsyncConnector[bytes]):
+    def __init__(self, total: int, fail: bool = False) -> None:
+        self.total = total
+        self.fail = fail
+        self.fetched = 0
+
+        self.closed = False
+
+    async def list(self, url: str) -> AsyncIterator[bytes]:
+        try:
+            for _ in range(self.total):
+                await asyncio.sleep(0)
+                self.fetched += 1
+                yield b"x" * 10
+            if self.fail:
+                raise ConnectionError(url)
+        finally:
+            self.closed = True
+
+
+@pytest.mark.parametrize(
+    "high,low", [(0, None), (10, 10), (10, -1)], ids=["zero", "equal", "negative"]
+)
+def test_invalid_watermarks(high: int, low: int):
+    with pytest.raises(ValueError):
+        BufferedAsyncIterator(CountingConnector(1).list(BASE_URL), high, low)
+
+
+class TestBackpressure:
+    @pytest.mark.asyncio
+    async def test_pause_and_resume(self):
+        connector = CountingConnector(100)
+        reports: List[BufferStats] = []
+        items = BufferedAsyncIterator(
+            connector.list(BASE_URL), 10, 2, on_watermark=reports.append
+        )
+        assert await items.__anext__() == b"x" * 10
+        await asyncio.sleep(0.01)
+        assert connector.fetched == 11
+        assert items.stats.paused and items.stats.occupancy == 10
+        consumed = 1
+        while connector.fetched == 11:
+            await items.__anext__()
+            consumed += 1
+            await asyncio.sleep(0)
+        assert items.stats.occupancy <= 2
+        rest = [item async for item in items]
+        assert consumed + len(rest) == 100
+        stats = items.stats
+        assert stats.produced == stats.consumed == 100
+        assert stats.peak_occupancy == 10
+        assert stats.pauses == len([r for r in reports if r.paused]) >= 1
+        assert len(reports) == 2 * stats.pauses
+        assert not stats.paused and stats.items == 0
+        assert stats.paused_time > 0
+
+    @pytest.mark.asyncio
+    async def test_bytes_watermark(self):
+        connector = CountingConnector(100)
+        buffered = AsyncBufferedConnector(connector, 50, size=len)
+        async with AsyncEndpoint[bytes](BASE_URL, buffered).list() as items:
+            await items.__anext__()
+            await asyncio.sleep(0.01)
+            assert items.stats.occupancy == 50
+            assert items.stats.items == 5
+            assert connector.fetched == 6
+        assert items.stats.occupancy == 0
+        assert [item async for item in items] == []
+
+    @pytest.mark.asyncio
+    async def test_error_after_buffered_items(self):
+        items = BufferedAsyncIterator(CountingConnector(3, fail=True).list(BASE_URL))
+        consumed = []
+        with pytest.raises(ConnectionError):
+            async for item in items:
+                consumed.append(item)
+        assert len(consumed) == 3
+        assert items.stats.starved_time > 0
+        assert [item async for item in items] == []
+
+    @pytest.mark.asyncio
+    async def test_early_exit(self):
+        connector = CountingConnector(100)
+        api = AsyncEndpoint[bytes](BASE_URL, AsyncBufferedConnector(connector, 10))
+        async for _ in api.list():
+            await asyncio.sleep(0.01)
+            break
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert connector.closed and connector.fetched == 11
+        current = asyncio.current_task()
+        assert [task for task in asyncio.all_tasks() if task is not current] == []
+
+    @pytest.mark.asyncio
+    async def test_aclose_before_iteration(self):
+        source = CountingConnector(100).list(BASE_URL)
+        await BufferedAsyncIterator(source).aclose()
+        assert source.ag_frame is None
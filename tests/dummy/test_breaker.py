@@ -0,0 +1,263 @@
+import asyncio
+import time
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+import pytest
+from ezrest.breaker import (
+    AsyncCircuitBreakerConnector,
+    CircuitBreaker,
+    CircuitBreakerConnector,
+    CircuitOpenError,
+    CircuitState,
+    url_template,
+)
+from ezrest.events import StopWatching
+from ezrest.requests import AsyncConnector, AsyncEndpoint, Connector, Endpoint
+
+BASE_URL = "http://x.com"
+
+
+class FlakyConnector(Connector[str]):
+    def __init__(self) -> None:
+        self.healthy = False
+        self.calls = 0
+
+    def get(self, url: str) -> str:
+        self.calls += 1
+        if not self.healthy:
+            raise TimeoutError(url)
+        return f"[get] {url}"
+
+    def put(self, url: str) -> str:
+        raise KeyError(url)
+
+    def list(self, url: str) -> Iterator[str]:
+        self.calls += 1
+        yield f"[list] {url}"
+        if not self.healthy:
+            raise TimeoutError(url)
+
+    def stream_raw(self, url: str) -> Iterator[bytes]:
+        self.calls += 1
+        yield url.encode()
+        if not self.healthy:
+            raise TimeoutError(url)
+
+
+class AsyncFlakyConnector(AsyncConnector[str]):
+    def __init__(self) -> None:
+        self.healthy = False
+        self.calls = 0
+
+    async def get(self, url: str) -> str:
+        await asyncio.sleep(0.001)
+        self.calls += 1
+        if not self.healthy:
+            raise TimeoutError(url)
+        return f"[get] {url}"
+
+    async def list(self, url: str) -> AsyncIterator[str]:
+        self.calls += 1
+        yield f"[list] {url}"
+        if not self.healthy:
+            raise TimeoutError(url)
+
+    async def stream_raw(self, url: str) -> AsyncIterator[bytes]:
+        self.calls += 1
+        yield url.encode()
+        if not self.healthy:
+            raise TimeoutError(url)
+
+    async def subscribe(
+        self, url: str, last_event_id: Optional[str] = None
+    ) -> AsyncIterator[bytes]:
+        self.calls += 1
+        yield b"data: event\n\n"
+        if not self.healthy:
+            raise TimeoutError(url)
+        raise StopWatching()
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        (f"{BASE_URL}/posts/5", f"{BASE_URL}/posts/{{}}"),
+        (
+            f"{BASE_URL}/posts/5/comments/12?page=2",
+            f"{BASE_URL}/posts/{{}}/comments/{{}}",
+        ),
+        (
+            f"{BASE_URL}/users/123e4567-e89b-12d3-a456-426614174000",
+            f"{BASE_URL}/users/{{}}",
+        ),
+        (f"{BASE_URL}/users/me", f"{BASE_URL}/users/me"),
+    ],
+)
+def test_url_template(url: str, expected: str):
+    assert url_template(url) == expected
+
+
+class TestCircuitBreaker:
+    def test_circuit(self):
+        changes: List[Tuple[str, CircuitState, CircuitState]] = []
+        breaker = CircuitBreaker(2, 0.05, on_state_change=lambda *c: changes.append(c))
+        connector = FlakyConnector()
+        api = Endpoint[str](BASE_URL, CircuitBreakerConnector(connector, breaker))
+        key = f"{BASE_URL}/posts/{{}}"
+        for i in range(2):
+            with pytest.raises(TimeoutError):
+                api.posts[i].get()
+        assert breaker.state(f"{BASE_URL}/posts/1") == CircuitState.OPEN
+        with pytest.raises(CircuitOpenError) as error:
+            api.posts[3].get()
+        assert error.value.key == key and error.value.retry_after > 0
+        assert connector.calls == 2
+        time.sleep(0.06)
+        with pytest.raises(TimeoutError):
+            api.posts[4].get()
+        assert breaker.state(key) == CircuitState.OPEN
+        time.sleep(0.06)
+        connector.healthy = True
+        assert api.posts[5].get() == f"[get] {BASE_URL}/posts/5"
+        assert breaker.state(key) == CircuitState.CLOSED
+        assert [state for _, _, state in changes] == [
+            CircuitState.OPEN,
+            CircuitState.HALF_OPEN,
+            CircuitState.OPEN,
+            CircuitState.HALF_OPEN,
+            CircuitState.CLOSED,
+        ]
+        metrics = breaker.metrics()[key]
+        assert metrics.state == CircuitState.CLOSED
+        assert (metrics.successes, metrics.failures, metrics.rejections) == (1, 3, 1)
+        assert metrics.opened == 2
+
+    def test_half_open_probes(self):
+        breaker = CircuitBreaker(1, 0.0)
+        key = breaker.acquire(BASE_URL)
+        breaker.record_failure(key, TimeoutError())
+        assert breaker.acquire(BASE_URL) == key
+        assert breaker.state(BASE_URL) == CircuitState.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.acquire(BASE_URL)
+        breaker.record_failure(key, KeyError())
+        breaker.acquire(BASE_URL)
+
+    def test_ignored_exceptions(self):
+        breaker = CircuitBreaker(1, failure_exceptions=(TimeoutError,))
+        api = Endpoint[str](
+            BASE_URL, CircuitBreakerConnector(FlakyConnector(), breaker)
+        )
+        for _ in range(3):
+            with pytest.raises(KeyError):
+                api.put()
+        assert breaker.state(BASE_URL) == CircuitState.CLOSED
+        assert breaker.state("http://unknown.com") == CircuitState.CLOSED
+
+    def test_list(self):
+        connector = FlakyConnector()
+        api = Endpoint[str](BASE_URL, CircuitBreakerConnector(connector))
+        assert next(api.list()) == f"[list] {BASE_URL}"
+        for _ in range(5):
+            with pytest.raises(TimeoutError):
+                list(api.list())
+        with pytest.raises(CircuitOpenError):
+            list(api.list())
+        connector.healthy = True
+        api = Endpoint[str](BASE_URL, CircuitBreakerConnector(connector))
+        assert list(api.list()) == [f"[list] {BASE_URL}"]
+
+    def test_raw(self):
+        breaker = CircuitBreaker(1, 60)
+        connector = FlakyConnector()
+        api = Endpoint[str](BASE_URL, CircuitBreakerConnector(connector, breaker))
+        with pytest.raises(TimeoutError):
+            api.get_raw_into(bytearray(100))
+        for method in [api.stream_raw, api.get_raw]:
+            with pytest.raises(CircuitOpenError):
+                list(method())
+        with pytest.raises(CircuitOpenError):
+            api.get_raw_into(bytearray(100))
+        assert connector.calls == 1
+        connector.healthy = True
+        breaker = CircuitBreaker(1, 60)
+        api = Endpoint[str](BASE_URL, CircuitBreakerConnector(connector, breaker))
+        assert api.get_raw_into(bytearray(100)) == len(BASE_URL)
+        assert list(api.stream_raw()) == [BASE_URL.encode()]
+        assert breaker.metrics()[BASE_URL].successes == 2
+
+
+class TestAsyncCircuitBreaker:
+    @pytest.mark.asyncio
+    async def test_circuit(self):
+        breaker = CircuitBreaker(1, 0.05)
+        connector = AsyncFlakyConnector()
+        api = AsyncEndpoint[str](
+            BASE_URL, AsyncCircuitBreakerConnector(connector, breaker)
+        )
+        with pytest.raises(TimeoutError):
+            await api.get()
+        with pytest.raises(CircuitOpenError):
+            await api.get()
+        with pytest.raises(CircuitOpenError):
+            async for _ in api.list():
+                pass
+        await asyncio.sleep(0.06)
+        connector.healthy = True
+        assert await api.get() == f"[get] {BASE_URL}"
+        assert [item async for item in api.list()] == [f"[list] {BASE_URL}"]
+        connector.healthy = False
+        with pytest.raises(TimeoutError):
+            async for _ in api.list():
+                pass
+        assert breaker.state(BASE_URL) == CircuitState.OPEN
+        assert AsyncCircuitBreakerConnector(connector).breaker is not breaker
+
+    @pytest.mark.asyncio
+    async def test_raw(self):
+        breaker = CircuitBreaker(1, 60)
+        connector = AsyncFlakyConnector()
+        api = AsyncEndpoint[str](
+            BASE_URL, AsyncCircuitBreakerConnector(connector, breaker)
+        )
+        with pytest.raises(TimeoutError):
+            await api.get_raw_into(bytearray(100))
+        with pytest.raises(CircuitOpenError):
+            async for _ in api.stream_raw():
+                pass
+        with pytest.raises(CircuitOpenError):
+            await api.get_raw_into(bytearray(100))
+        assert connector.calls == 1
+        connector.healthy = True
+        breaker = CircuitBreaker(1, 60)
+        api = AsyncEndpoint[str](
+            BASE_URL, AsyncCircuitBreakerConnector(connector, breaker)
+        )
+        assert await api.get_raw_into(bytearray(100)) == len(BASE_URL)
+        assert [chunk async for chunk in api.stream_raw()] == [BASE_URL.encode()]
+        assert breaker.metrics()[BASE_URL].successes == 2
+
+    @pytest.mark.asyncio
+    async def test_subscribe(self):
+        breaker = CircuitBreaker(1, 60)
+        connector = AsyncFlakyConnector()
+        api = AsyncEndpoint[str](
+            BASE_URL, AsyncCircuitBreakerConnector(connector, breaker)
+        )
+        with pytest.raises(TimeoutError):
+            async for _ in api.subscribe():
+                pass
+        with pytest.raises(CircuitOpenError):
+            async for _ in api.subscribe():
+                pass
+        # watch() reconnects through the breaker as well
+        with pytest.raises(CircuitOpenError):
+            async for _ in api.watch(retry=0, max_retries=2):
+                pass
+        assert connector.calls == 1
+        connector.healthy = True
+        breaker = CircuitBreaker(1, 60)
+        api = AsyncEndpoint[str](
+            BASE_URL, AsyncCircuitBreakerConnector(connector, breaker)
+        )
+        assert [event.data async for event in api.watch()] == ["event"]
+        assert breaker.metrics()[BASE_URL].successes == 1
@@ -0,0 +1,262 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterator
+import pytest
+from ezrest.cache import AsyncCachedConnector, CachedConnector, SQLiteCache
+from ezrest.requests import (
+    AsyncConnector,
+    AsyncEndpoint,
+    Connector,
+    Endpoint,
+    _request_key,
+)
+
+BASE_URL = "http://x.com"
+
+
+@dataclass
+class Timeout:
+    seconds: float
+
+
+class CountingConnector(Connector[str]):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def get(self, url: str, **kwargs) -> str:
+        self.calls += 1
+        return f"[get] {url} {kwargs}"
+
+    def post(self, url: str, **kwargs) -> str:
+        self.calls += 1
+        return f"[post] {url}"
+
+    def list(self, url: str, **kwargs) -> Iterator[str]:
+        self.calls += 1
+        for i in range(3):
+            yield f"[list] {url} {i}"
+
+    def stream_raw(self, url: str, **kwargs) -> Iterator[bytes]:
+        self.calls += 1
+        yield url.encode()
+
+
+class AsyncCountingConnector(AsyncConnector[str]):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def get(self, url: str, **kwargs) -> str:
+        await asyncio.sleep(0.001)
+        self.calls += 1
+        return f"[get] {url} {kwargs}"
+
+    async def post(self, url: str, **kwargs) -> str:
+        await asyncio.sleep(0.001)
+        self.calls += 1
+        return f"[post] {url}"
+
+    async def list(self, url: str, **kwargs) -> AsyncIterator[str]:
+        self.calls += 1
+        for i in range(3):
+            await asyncio.sleep(0.001)
+            yield f"[list] {url} {i}"
+
+
+@pytest.fixture
+def cache(tmp_path) -> Iterator[SQLiteCache]:
+    cache = SQLiteCache(str(tmp_path / "cache.db"))
+    yield cache
+    cache.close()
+
+
+class TestSQLiteCache:
+    def test_get_set(self, cache: SQLiteCache):
+        assert cache.get("key") == (False, None)
+        cache.set("key", BASE_URL, {"value": [1, 2, 3]})
+        assert cache.get("key") == (True, {"value": [1, 2, 3]})
+
+    def test_persistence(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        cache = SQLiteCache(path)
+        cache.set("key", BASE_URL, "value")
+        cache.close()
+        cache = SQLiteCache(path)
+        assert cache.get("key") == (True, "value")
+        cache.close()
+
+    def test_ttl(self, cache: SQLiteCache):
+        cache.set("expired", BASE_URL, "value", ttl=-1)
+        cache.set("valid", BASE_URL, "value", ttl=60)
+        assert cache.get("expired") == (False, None)
+        assert cache.get("valid") == (True, "value")
+
+    def test_invalidate_and_clear(self, cache: SQLiteCache):
+        cache.set("a", BASE_URL, "value")
+        cache.set("b", f"{BASE_URL}/posts", "value")
+        cache.invalidate(BASE_URL)
+        assert cache.get("a") == (False, None)
+        assert cache.get("b") == (True, "value")
+        cache.clear()
+        assert cache.size() == 0
+
+    def test_lru_eviction(self, tmp_path):
+        cache = SQLiteCache(str(tmp_path / "cache.db"), compression_level=0)
+        cache.set("probe", BASE_URL, "x" * 100)
+        entry_size = cache.size()
+        cache.max_size = 2 * entry_size
+        cache.clear()
+        cache.set("a", BASE_URL, "a" * 100)
+        time.sleep(0.01)
+        cache.set("b", BASE_URL, "b" * 100)
+        time.sleep(0.01)
+        assert cache.get("a")[0]
+        time.sleep(0.01)
+        cache.set("c", BASE_URL, "c" * 100)
+        assert cache.get("a")[0]
+        assert not cache.get("b")[0]
+        assert cache.get("c")[0]
+        assert cache.size() <= cache.max_size
+        cache.close()
+
+
+class TestCachedConnector:
+    def test_get(self, cache: SQLiteCache):
+        connector = CountingConnector()
+        api = Endpoint[str](BASE_URL, CachedConnector(connector, cache))
+        assert api.posts.get(params={"q": 1}) == api.posts.get(params={"q": 1})
+        assert connector.calls == 1
+        api.posts.get(params={"q": 2})
+        assert connector.calls == 2
+
+    def test_list(self, cache: SQLiteCache):
+        connector = CountingConnector()
+        api = Endpoint[str](BASE_URL, CachedConnector(connector, cache))
+        partial = api.list()
+        next(partial)
+        assert list(api.list()) == list(api.list())
+        assert connector.calls == 2
+
+    def test_list_chunks(self, cache: SQLiteCache):
+        connector = CountingConnector()
+        api = Endpoint[str](
+            BASE_URL, CachedConnector(connector, cache, list_chunk_size=2)
+        )
+        expected = [f"[list] {BASE_URL} {i}" for i in range(3)]
+        assert list(api.list()) == list(api.list()) == expected
+        assert connector.calls == 1
+        key = _request_key("list", BASE_URL, {})
+        assert cache.get(key) == (True, 2)
+        assert cache.get(f"{key}/0") == (True, expected[:2])
+        # Evicted chunk - remaining items are requested again
+        cache._db.execute("DELETE FROM entries WHERE key = ?", (f"{key}/1",))
+        assert list(api.list()) == expected
+        assert connector.calls == 2
+        assert list(api.list()) == expected
+        assert connector.calls == 2
+
+    def test_request_key(self):
+        kwargs = {"params": {"q": {1, 2}}, "content": b"body", "timeout": (1, 2)}
+        assert _request_key("get", BASE_URL, kwargs) == _request_key(
+            "get", BASE_URL, {**kwargs, "params": {"q": {2, 1}}}
+        )
+        assert _request_key("get", BASE_URL, kwargs) != _request_key(
+            "get", BASE_URL, {**kwargs, "content": b"other"}
+        )
+        timeout = Timeout(5.0)
+        assert _request_key("get", BASE_URL, {"timeout": timeout}) == _request_key(
+            "get", BASE_URL, {"timeout": Timeout(5.0)}
+        )
+        assert _request_key("get", BASE_URL, {"timeout": timeout}) != _request_key(
+            "get", BASE_URL, {"timeout": Timeout(1.0)}
+        )
+        assert _request_key("get", BASE_URL, {"auth": object()}) is None
+
+    def test_unkeyable_request(self, cache: SQLiteCache):
+        connector = CountingConnector()
+        api = Endpoint[str](BASE_URL, CachedConnector(connector, cache))
+        assert api.get(auth=object()).startswith("[get]")
+        assert api.get(auth=object()).startswith("[get]")
+        assert connector.calls == 2
+        assert list(api.list(auth=object())) == list(api.list(auth=object()))
+        assert connector.calls == 4
+
+    def test_get_raw(self, cache: SQLiteCache):
+        connector = CountingConnector()
+        api = Endpoint[str](BASE_URL, CachedConnector(connector, cache))
+        assert api.get_raw() == api.get_raw() == BASE_URL.encode()
+        assert list(api.stream_raw()) == [BASE_URL.encode()]
+        assert connector.calls == 2
+
+    def test_write_invalidates(self, cache: SQLiteCache):
+        connector = CountingConnector()
+        api = Endpoint[str](BASE_URL, CachedConnector(connector, cache))
+        api.get()
+        assert api.post() == f"[post] {BASE_URL}"
+        api.get()
+        assert connector.calls == 3
+
+    def test_ttl_callable(self, cache: SQLiteCache):
+        connector = CountingConnector()
+        api = Endpoint[str](
+            BASE_URL,
+            CachedConnector(
+                connector, cache, ttl=lambda url: -1 if "nc" in url else None
+            ),
+        )
+        api.nc.get()
+        api.nc.get()
+        api.c.get()
+        api.c.get()
+        assert connector.calls == 3
+
+
+class TestAsyncCachedConnector:
+    @pytest.mark.asyncio
+    async def test_get(self, cache: SQLiteCache):
+        connector = AsyncCountingConnector()
+        api = AsyncEndpoint[str](BASE_URL, AsyncCachedConnector(connector, cache))
+        assert await api.posts.get() == await api.posts.get()
+        assert connector.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_list(self, cache: SQLiteCache):
+        connector = AsyncCountingConnector()
+        api = AsyncEndpoint[str](BASE_URL, AsyncCachedConnector(connector, cache))
+        first = [item async for item in api.list()]
+        second = [item async for item in api.list()]
+        assert first == second == [f"[list] {BASE_URL} {i}" for i in range(3)]
+        assert connector.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_list_chunks(self, cache: SQLiteCache):
+        connector = AsyncCountingConnector()
+        api = AsyncEndpoint[str](
+            BASE_URL, AsyncCachedConnector(connector, cache, list_chunk_size=2)
+        )
+        expected = [f"[list] {BASE_URL} {i}" for i in range(3)]
+        assert [item async for item in api.list()] == expected
+        key = _request_key("list", BASE_URL, {})
+        cache._db.execute("DELETE FROM entries WHERE key = ?", (f"{key}/1",))
+        assert [item async for item in api.list()] == expected
+        assert [item async for item in api.list()] == expected
+        assert connector.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_write_invalidates(self, cache: SQLiteCache):
+        connector = AsyncCountingConnector()
+        api = AsyncEndpoint[str](BASE_URL, AsyncCachedConnector(connector, cache))
+        await api.get()
+        await api.post()
+        await api.get()
+        assert connector.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_unkeyable_request(self, cache: SQLiteCache):
+        connector = AsyncCountingConnector()
+        api = AsyncEndpoint[str](BASE_URL, AsyncCachedConnector(connector, cache))
+        await api.get(auth=object())
+        await api.get(auth=object())
+        assert connector.calls == 2
+        assert len([item async for item in api.list(auth=object())]) == 3
+        assert connector.calls == 3
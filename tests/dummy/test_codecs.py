@@ -0,0 +1,124 @@
+from typing import Any
+import pytest
+from ezrest.codecs import (
+    BENCHMARK_PAYLOADS,
+    Codec,
+    CodecRegistry,
+    JSONCodec,
+    benchmark,
+    registry,
+)
+from ezrest.objects import CRUD
+from ezrest.requests import AsyncConnector, Connector
+
+PAYLOAD = {"id": 1, "name": "x", "tags": ["a", "b"], "score": 0.5, "active": None}
+
+
+class ReprCodec(Codec):
+    media_type = "text/x-repr"
+
+    def encode(self, data: Any) -> bytes:
+        return repr(data).encode()
+
+    def decode(self, body) -> Any:
+        return eval(bytes(body).decode())
+
+
+class TestCodecs:
+    def test_codec_not_implemented(self):
+        with pytest.raises(NotImplementedError):
+            Codec().encode(PAYLOAD)
+        with pytest.raises(NotImplementedError):
+            Codec().decode(b"")
+
+    def test_json_codec(self):
+        codec = JSONCodec()
+        body = codec.encode(PAYLOAD)
+        assert codec.decode(body) == PAYLOAD
+        assert codec.decode(memoryview(body)) == PAYLOAD
+
+    def test_orjson_codec(self):
+        pytest.importorskip("orjson")
+        from ezrest.codecs import OrjsonCodec
+
+        codec = OrjsonCodec()
+        assert codec.media_type == JSONCodec.media_type
+        assert codec.decode(codec.encode(PAYLOAD)) == PAYLOAD
+
+    def test_default_registry(self):
+        assert registry.default.media_type == "application/json"
+        assert registry.decode(registry.encode(PAYLOAD)) == PAYLOAD
+
+
+class TestCodecRegistry:
+    @pytest.fixture
+    def codecs(self) -> CodecRegistry:
+        return CodecRegistry(JSONCodec(), ReprCodec())
+
+    def test_empty(self):
+        with pytest.raises(LookupError):
+            CodecRegistry().get()
+
+    def test_get(self, codecs: CodecRegistry):
+        assert isinstance(codecs.get(), JSONCodec)
+        assert isinstance(codecs.get("application/json; charset=utf-8"), JSONCodec)
+        assert isinstance(codecs.get("TEXT/X-REPR"), ReprCodec)
+        with pytest.raises(LookupError):
+            codecs.get("application/xml")
+
+    def test_register_default(self, codecs: CodecRegistry):
+        codecs.register(ReprCodec(), default=True)
+        assert isinstance(codecs.default, ReprCodec)
+        assert codecs.media_types == ["text/x-repr", "application/json"]
+        assert codecs.accept_header() == "text/x-repr, application/json;q=0.9"
+        body = codecs.encode(PAYLOAD)
+        assert body == repr(PAYLOAD).encode()
+        assert codecs.decode(body, "text/x-repr") == PAYLOAD
+
+    @pytest.mark.parametrize(
+        "accept,expected",
+        [
+            (None, JSONCodec),
+            ("*/*", JSONCodec),
+            ("text/*", ReprCodec),
+            ("application/json;q=0.5, text/x-repr", ReprCodec),
+            ("text/x-repr;q=0, application/*;q=0.1", JSONCodec),
+            ("text/x-repr;q=invalid, application/json", JSONCodec),
+        ],
+    )
+    def test_negotiate(self, codecs: CodecRegistry, accept, expected):
+        assert isinstance(codecs.negotiate(accept), expected)
+
+    def test_negotiate_failed(self, codecs: CodecRegistry):
+        with pytest.raises(LookupError):
+            codecs.negotiate("application/xml, image/*")
+
+
+class TestCodecMixin:
+    @pytest.mark.parametrize("cls", [Connector, AsyncConnector, CRUD])
+    def test_helpers(self, cls):
+        instance = cls()
+        assert instance.codecs is registry
+        assert instance.decode_body(instance.encode_body(PAYLOAD)) == PAYLOAD
+        assert instance.accept_header() == registry.accept_header()
+
+    def test_override(self):
+        class ReprConnector(Connector[Any]):
+            codecs = CodecRegistry(ReprCodec())
+
+        connector = ReprConnector()
+        assert connector.encode_body(PAYLOAD) == repr(PAYLOAD).encode()
+        assert connector.accept_header() == "text/x-repr"
+        with pytest.raises(LookupError):
+            connector.decode_body(b"{}", "application/json")
+
+
+def test_benchmark():
+    results = benchmark(number=1)
+    assert len(results) % len(BENCHMARK_PAYLOADS) == 0
+    results = benchmark({"payload": PAYLOAD}, [JSONCodec(), ReprCodec()], number=2)
+    assert [(codec, payload) for codec, payload, *_ in results] == [
+        ("JSONCodec", "payload"),
+        ("ReprCodec", "payload"),
+    ]
+    assert all(size > 0 and enc >= 0 and dec >= 0 for *_, size, enc, dec in results)
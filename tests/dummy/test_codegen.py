@@ -0,0 +1,410 @@
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+from typing import Any, AsyncIterator, Dict, Iterator, List
+import pytest
+from ezrest.codegen import benchmark, compile_client, generate, load_spec, main
+from ezrest.requests import AsyncConnector, Connector
+
+BASE_URL = "http://x.com"
+SPEC_PATH = os.path.join(os.path.dirname(__file__), "data", "petstore.json")
+PET = {
+    "id": 1,
+    "name": "Buster",
+    "birth-date": "2003-11-02",
+    "class": "dog",
+    "owner": {"id": 7, "name": "Lucille", "address": {"city": "Newport Beach"}},
+    "tags": [{"name": "loyal"}, {"name": "hungry"}],
+    "photoUrls": ["http://x.com/buster.png"],
+}
+
+
+# Names and descriptions that are not valid in Python source as they are
+TRICKY_SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": 'Tricky "API"', "version": "2"},
+    "paths": {
+        "/links/{linkId}": {
+            "get": {
+                "responses": {
+                    "200": {
+                        "content": {
+                            "application/json": {
+                                "schema": {"$ref": "#/components/schemas/Link"}
+                            }
+                        }
+                    }
+                }
+            }
+        },
+        "/organizations/{organizationId}/departments/{departmentId}/employees": {
+            "get": {}
+        },
+        # Schemas whose names collide after the conversion
+        "/users/{userId}": {
+            "get": {
+                "responses": {
+                    "200": {
+                        "content": {
+                            "application/json": {
+                                "schema": {"$ref": "#/components/schemas/user_name"}
+                            }
+                        }
+                    }
+                }
+            },
+            "delete": {},
+        },
+        "/user-names/{userNameId}": {
+            "get": {
+                "responses": {
+                    "200": {
+                        "content": {
+                            "application/json": {
+                                "schema": {"$ref": "#/components/schemas/UserName"}
+                            }
+                        }
+                    }
+                }
+            },
+            "put": {
+                "responses": {
+                    "200": {
+                        "content": {
+                            "application/json": {
+                                "schema": {"$ref": "#/components/schemas/UserName"}
+                            }
+                        }
+                    }
+                }
+            },
+        },
+        # Schema without properties (no identifier)
+        "/empties/{emptyId}": {
+            "get": {
+                "responses": {
+                    "200": {
+                        "content": {
+                            "application/json": {
+                                "schema": {"$ref": "#/components/schemas/Empty"}
+                            }
+                        }
+                    }
+                }
+            },
+            "delete": {},
+        },
+    },
+    "components": {
+        "schemas": {
+            "Link": {
+                "description": 'Link with "quotes", \\d and """triple quotes"',
+                "required": ["self"],
+                "properties": {
+                    "self": {"type": "string"},
+                    "petId": {"type": "integer"},
+                    "pet_id": {"type": "integer"},
+                    "pet-id": {"type": "integer"},
+                    "self_": {"type": "string"},
+                },
+            },
+            "VeryLongResourceNameDescribingEmployeeAssignmentHistoryRecord": {
+                "description": " ".join(["Very long description."] * 10),
+                "required": ["employeeIdentifier", "departmentIdentifier"],
+                "properties": {
+                    "employeeIdentifier": {"type": "integer"},
+                    "departmentIdentifier": {"type": "integer"},
+                    "organizationIdentifier": {"type": "integer"},
+                    "assignmentHistoryRecords": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/Link"},
+                    },
+                },
+            },
+            "user_name": {
+                "required": ["id"],
+                "properties": {
+                    "id": {"type": "integer"},
+                    "any": {"$ref": "#/components/schemas/Any"},
+                },
+            },
+            "UserName": {
+                "required": ["id"],
+                "properties": {
+                    "id": {"type": "string"},
+                    "other": {"$ref": "#/components/schemas/user_name"},
+                },
+            },
+            # Shadows typing.Any imported by the generated code
+            "Any": {"properties": {"value": {"type": "integer"}}},
+            "Empty": {"type": "object", "properties": {}},
+        }
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def spec() -> Dict[str, Any]:
+    return load_spec(SPEC_PATH)
+
+
+@pytest.fixture(scope="module")
+def client(spec) -> Dict[str, Any]:
+    return compile_client(spec)
+
+
+class RecordingConnector(Connector[Dict[str, Any]]):
+    def __init__(self) -> None:
+        self.calls: List[Any] = []
+
+    def get(self, url: str, **kwargs) -> Dict[str, Any]:
+        self.calls.append(("get", url, kwargs))
+        return PET
+
+    def post(self, url: str, **kwargs) -> Dict[str, Any]:
+        self.calls.append(("post", url, kwargs))
+        return {**kwargs["json"], "id": 2}
+
+    def put(self, url: str, **kwargs) -> Dict[str, Any]:
+        self.calls.append(("put", url, kwargs))
+        return kwargs["json"]
+
+    def patch(self, url: str, **kwargs) -> Dict[str, Any]:
+        self.calls.append(("patch", url, kwargs))
+        return {}
+
+    def delete(self, url: str, **kwargs) -> Dict[str, Any]:
+        self.calls.append(("delete", url, kwargs))
+        return {}
+
+    def list(self, url: str, **kwargs) -> Iterator[Dict[str, Any]]:
+        self.calls.append(("list", url, kwargs))
+        yield PET
+        yield {"id": 2, "name": "Gob"}
+
+
+class AsyncRecordingConnector(AsyncConnector[Dict[str, Any]]):
+    def __init__(self) -> None:
+        self.calls: List[Any] = []
+
+    async def get(self, url: str, **kwargs) -> Dict[str, Any]:
+        self.calls.append(("get", url, kwargs))
+        return PET
+
+    async def post(self, url: str, **kwargs) -> Dict[str, Any]:
+        self.calls.append(("post", url, kwargs))
+        return {**kwargs["json"], "id": 2}
+
+    async def put(self, url: str, **kwargs) -> Dict[str, Any]:
+        self.calls.append(("put", url, kwargs))
+        return kwargs["json"]
+
+    async def patch(self, url: str, **kwargs) -> Dict[str, Any]:
+        self.calls.append(("patch", url, kwargs))
+        return {}
+
+    async def delete(self, url: str, **kwargs) -> Dict[str, Any]:
+        self.calls.append(("delete", url, kwargs))
+        return {}
+
+    async def list(self, url: str, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        self.calls.append(("list", url, kwargs))
+        yield PET
+        yield {"id": 2, "name": "Gob"}
+
+
+class TestGenerate:
+    def test_generated_source(self, spec):
+        source = generate(spec)
+        assert source.startswith('"""Generated by ezrest.codegen from Pet Store 1.0.0')
+        assert "class PetStoreEndpoint(BaseEndpoint[Any, Dict[str, Any]]):" in source
+        assert "class AsyncPetCRUD(AsyncCRUD[Pet]):" in source
+        # Non-object schemas are not generated
+        assert "class Status" not in source
+        assert "class MyClientEndpoint(" in generate(spec, "MyClient")
+
+    def test_resource_classes(self, client):
+        pet_class = client["Pet"]
+        assert "id" in pet_class.__slots__
+        assert "birth_date" in pet_class.__slots__
+        assert "class_" in pet_class.__slots__
+        pet = pet_class(1, "Buster")
+        with pytest.raises(AttributeError):
+            pet.unknown = True
+        assert pet.tag is None
+        assert pet == pet_class(1, "Buster")
+        assert pet != pet_class(2, "Buster")
+        assert pet != "Buster"
+        assert repr(client["Tag"]("loyal")) == "Tag(name='loyal')"
+
+    def test_mapping_round_trip(self, client):
+        pet = client["pet_from_dict"](PET)
+        assert pet.birth_date == "2003-11-02"
+        assert pet.class_ == "dog"
+        assert pet.owner.address.city == "Newport Beach"
+        assert [tag.name for tag in pet.tags] == ["loyal", "hungry"]
+        assert pet.weight is None
+        assert client["pet_to_dict"](pet) == PET
+        assert client["pet_to_dict"](client["Pet"](3, "Gob")) == {
+            "id": 3,
+            "name": "Gob",
+        }
+        with pytest.raises(KeyError):
+            client["pet_from_dict"]({"name": "Buster"})
+
+    def test_endpoint_properties(self, client):
+        api = client["PetStoreEndpoint"](BASE_URL, RecordingConnector())
+        assert api.pets.url == f"{BASE_URL}/pets"
+        assert api.pets_by_pet_id.url == f"{BASE_URL}/pets/{{}}"
+        assert api.owners_by_owner_id_pets.url == f"{BASE_URL}/owners/{{}}/pets"
+        assert isinstance(api.pets, client["PetStoreEndpoint"])
+        # Dynamic subresources still work
+        assert api.stores[5].url == f"{BASE_URL}/stores/5"
+
+
+class TestGeneratedCRUD:
+    def test_crud(self, client):
+        connector = RecordingConnector()
+        api = client["PetStoreEndpoint"](BASE_URL, connector)
+        crud = client["PetCRUD"](api)
+        pet = crud.read(1)
+        assert pet.name == "Buster"
+        created = crud.create(client["Pet"](0, "Gob"))
+        assert created.id == 2
+        assert crud.update(pet) == pet
+        assert crud.delete(pet) is pet
+        assert [p.name for p in crud.list(params={"limit": 2})] == ["Buster", "Gob"]
+        assert [(method, url) for method, url, _ in connector.calls] == [
+            ("get", f"{BASE_URL}/pets/1"),
+            ("post", f"{BASE_URL}/pets"),
+            ("put", f"{BASE_URL}/pets/1"),
+            ("delete", f"{BASE_URL}/pets/1"),
+            ("list", f"{BASE_URL}/pets"),
+        ]
+        assert connector.calls[1][2] == {"json": {"id": 0, "name": "Gob"}}
+        assert connector.calls[4][2] == {"params": {"limit": 2}}
+        # PATCH without response body returns the updated resource
+        owner_crud = client["OwnerCRUD"](api)
+        owner = client["Owner"](7, "Lucille")
+        assert owner_crud.update(owner) is owner
+        assert connector.calls[-1][:2] == ("patch", f"{BASE_URL}/owners/7")
+        with pytest.raises(NotImplementedError):
+            owner_crud.create(owner)
+
+    def test_async_crud(self, client):
+        connector = AsyncRecordingConnector()
+        api = client["PetStoreEndpoint"](BASE_URL, connector)
+        crud = client["AsyncPetCRUD"](api)
+
+        async def run():
+            pet = await crud.read(1)
+            created = await crud.create(client["Pet"](0, "Gob"))
+            updated = await crud.update(pet)
+            deleted = await crud.delete(pet)
+            listed = [p async for p in crud.list()]
+            return pet, created, updated, deleted, listed
+
+        pet, created, updated, deleted, listed = asyncio.run(run())
+        assert pet.owner.name == "Lucille"
+        assert created.id == 2
+        assert updated == pet
+        assert deleted is pet
+        assert [p.id for p in listed] == [1, 2]
+        assert [method for method, _, _ in connector.calls] == [
+            "get",
+            "post",
+            "put",
+            "delete",
+            "list",
+        ]
+
+
+class TestTools:
+    def test_benchmark(self, spec):
+        generated, reflection = benchmark(spec, "Pet", PET, number=2000)
+        assert 0 < generated < reflection
+
+    def test_main(self, spec, tmp_path, capsys):
+        output = tmp_path / "client.py"
+        main([SPEC_PATH, "-o", str(output), "-n", "Store"])
+        assert output.read_text() == generate(spec, "Store")
+        main([SPEC_PATH])
+        assert capsys.readouterr().out == generate(spec)
+
+    def test_load_yaml_spec(self, spec, tmp_path):
+        yaml = pytest.importorskip("yaml")
+        path = tmp_path / "petstore.yaml"
+        path.write_text(yaml.safe_dump(spec))
+        assert load_spec(str(path)) == spec
+        path = tmp_path / "petstore.json"
+        path.write_text(json.dumps(spec))
+        assert load_spec(str(path)) == spec
+
+
+class TestGeneratedSourceQuality:
+    def test_tricky_names(self):
+        client = compile_client(TRICKY_SPEC)
+        link_class = client["Link"]
+        assert link_class.__slots__ == (
+            "self_",
+            "pet_id",
+            "pet_id_2",
+            "pet_id_3",
+            "self__2",
+        )
+        assert link_class.__doc__ == 'Link with "quotes", \\d and """triple quotes"'
+        data = {"self": "http://x.com/links/1", "petId": 1, "pet_id": 2, "pet-id": 3}
+        link = client["link_from_dict"](data)
+        assert (link.self_, link.pet_id, link.pet_id_2, link.pet_id_3) == (
+            "http://x.com/links/1",
+            1,
+            2,
+            3,
+        )
+        assert client["link_to_dict"](link) == data
+        assert client["TrickyAPIEndpoint"].__doc__.startswith(
+            'Endpoints of Tricky "API"'
+        )
+
+    def test_colliding_schema_names(self):
+        client = compile_client(TRICKY_SPEC)
+        user_name, user_name_2, any_ = (
+            client["UserName"],
+            client["UserName_2"],
+            client["Any_"],
+        )
+        assert client["Any"] is Any
+        data = {"id": "a", "other": {"id": 1, "any": {"value": 2}}}
+        resource = client["user_name_2_from_dict"](data)
+        assert resource == user_name_2("a", user_name(1, any_(2)))
+        assert client["user_name_2_to_dict"](resource) == data
+        assert client["user_name_from_dict"]({"id": 1}) == user_name(1)
+
+        class UsersConnector(Connector[Dict[str, Any]]):
+            def get(self, url: str, **kwargs) -> Dict[str, Any]:
+                if "/users/" in url:
+                    return {"id": 1}
+                return {"id": "b"}
+
+        endpoint = client["TrickyAPIEndpoint"](BASE_URL, UsersConnector())
+        assert client["UserNameCRUD"](endpoint).read(1) == user_name(1)
+        assert client["UserName_2CRUD"](endpoint).read("b") == user_name_2("b")
+
+    def test_schema_without_properties(self):
+        client = compile_client(TRICKY_SPEC)
+        assert client["Empty"]() == client["empty_from_dict"]({})
+        # No identifier for update() / delete() - CRUD is not generated
+        assert "EmptyCRUD" not in client and "AsyncEmptyCRUD" not in client
+
+    @pytest.mark.parametrize("tricky", [False, True], ids=["petstore", "tricky"])
+    def test_lint(self, spec, tmp_path, tricky: bool):
+        ruff = shutil.which("ruff")
+        if ruff is None:
+            pytest.skip("ruff is not installed")
+        path = tmp_path / "client.py"
+        path.write_text(generate(TRICKY_SPEC if tricky else spec))
+        check = [ruff, "check", "--isolated", "--select", "E,F,W", str(path)]
+        result = subprocess.run(check, capture_output=True, text=True)
+        assert result.returncode == 0, result.stdout
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import os
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+import pytest
+from ezrest.compression import (
+    AsyncCompressingConnector,
+    CompressingConnector,
+    CompressionSelector,
+    Compressor,
+    DeflateCompressor,
+    GzipCompressor,
+    accept_encoding,
+    async_decompress_stream,
+    available_compressors,
+    decompress,
+    decompress_stream,
+)
+from ezrest.requests import AsyncConnector, AsyncEndpoint, Connector, Endpoint
+
+BASE_URL = "http://x.com"
+BODY = json.dumps([{"id": i, "name": "George Bluth"} for i in range(500)]).encode()
+
+
+def chunked(data: bytes, size: int = 100) -> Iterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+class EchoConnector(Connector[Dict[str, Any]]):
+    def post(
+        self, url: str, content: bytes, headers: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        headers = headers or {}
+        return {
+            "size": len(content),
+            "body": decompress(content, headers.get("Content-Encoding")),
+            "headers": headers,
+        }
+
+    def get(self, url: str) -> Dict[str, Any]:
+        return {"url": url}
+
+
+class AsyncEchoConnector(AsyncConnector[Dict[str, Any]]):
+    async def put(
+        self, url: str, content: bytes, headers: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        await asyncio.sleep(0.001)
+        return {"size": len(content), "headers": headers or {}}
+
+
+def test_compressor_interface():
+    with pytest.raises(NotImplementedError):
+        Compressor().compress(b"")
+    with pytest.raises(NotImplementedError):
+        Compressor().decompressor()
+    assert accept_encoding().startswith("gzip, deflate")
+    assert set(available_compressors()) >= {"gzip", "deflate"}
+
+
+@pytest.mark.parametrize("compressor", [GzipCompressor(), DeflateCompressor(9)])
+def test_round_trip(compressor: Compressor):
+    compressed = compressor.compress(BODY)
+    assert len(compressed) < len(BODY)
+    chunks = list(decompress_stream(chunked(compressed), compressor.encoding))
+    assert len(chunks) > 1 and b"".join(chunks) == BODY
+
+
+def test_multiple_encodings():
+    compressed = DeflateCompressor().compress(GzipCompressor().compress(BODY))
+    assert decompress(compressed, "gzip, deflate") == BODY
+    assert decompress(BODY, None) == decompress(BODY, "identity") == BODY
+    with pytest.raises(LookupError):
+        decompress(BODY, "compress")
+
+
+@pytest.mark.asyncio
+async def test_async_decompress_stream():
+    async def chunks() -> AsyncIterator[bytes]:
+        for chunk in chunked(GzipCompressor().compress(BODY)):
+            yield chunk
+
+    assert b"".join([c async for c in async_decompress_stream(chunks(), "gzip")]) == (
+        BODY
+    )
+
+
+class TestCompressionSelector:
+    def test_threshold_and_exploration(self):
+        selector = CompressionSelector(
+            available_compressors(), threshold=100, trials=1, explore_every=5
+        )
+        assert selector.compress(f"{BASE_URL}/items", b"x" * 10) == (b"x" * 10, None)
+        assert selector.choice(f"{BASE_URL}/items") is None
+        encodings = [selector.compress(f"{BASE_URL}/items", BODY)[1] for _ in range(5)]
+        assert set(encodings) == set(selector.compressors)
+        assert encodings[-1] is not None
+        (stats,) = selector.stats().values()
+        assert sum(s.samples for s in stats) == 5
+        assert all(0 < s.ratio < 1 and s.throughput > 0 for s in stats)
+        assert selector.choice(f"{BASE_URL}/items") in selector.compressors
+
+    def test_no_benefit(self):
+        selector = CompressionSelector(threshold=0, bandwidth=1e15, trials=1)
+        random_body = os.urandom(2048)
+        for _ in range(len(selector.compressors) + 1):
+            assert selector.compress(BASE_URL, random_body) == (random_body, None)
+        assert selector.choice(BASE_URL) is None
+        assert CompressionSelector({}).compress(BASE_URL, BODY) == (BODY, None)
+
+    def test_per_endpoint_choice(self):
+        selector = CompressionSelector(trials=1, bandwidth=1e3)
+        for _ in range(3):
+            selector.compress(f"{BASE_URL}/a/1", BODY)
+            selector.compress(f"{BASE_URL}/b", os.urandom(4096))
+        assert selector.choice(f"{BASE_URL}/a/2") is not None
+        assert selector.choice(f"{BASE_URL}/b") is None
+
+
+class TestCompressingConnector:
+    def test_compress_request_body(self):
+        api = Endpoint[Dict[str, Any]](BASE_URL, CompressingConnector(EchoConnector()))
+        response = api.items.post(content=BODY, headers={"X-Test": "1"})
+        assert response["body"] == BODY and response["size"] < len(BODY)
+        assert response["headers"]["X-Test"] == "1"
+        assert response["headers"]["Content-Encoding"] in ("gzip", "deflate")
+        small = api.items.post(content=b"{}")
+        assert small["headers"] == {} and small["body"] == b"{}"
+        assert api.items.get() == {"url": f"{BASE_URL}/items"}
+
+    def test_encoded_request_body(self):
+        connector = CompressingConnector(EchoConnector())
+        api = Endpoint[Dict[str, Any]](BASE_URL, connector)
+        encoded = GzipCompressor().compress(BODY)
+        headers = {"content-encoding": "gzip"}
+        response = api.items.post(content=encoded, headers=headers)
+        assert response["size"] == len(encoded)
+        assert response["headers"] is headers
+        assert connector.selector.stats() == {}
+
+    @pytest.mark.asyncio
+    async def test_async_compress_request_body(self):
+        connector = AsyncCompressingConnector(AsyncEchoConnector())
+        response = await AsyncEndpoint[Dict[str, Any]](BASE_URL, connector).put(
+            content=bytearray(BODY)
+        )
+        assert response["size"] < len(BODY)
+        assert "Content-Encoding" in response["headers"]
@@ -0,0 +1,244 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+from ezrest.breaker import AsyncCircuitBreakerConnector, CircuitBreakerConnector
+from ezrest.conditional import (
+    AsyncConditionalConnector,
+    ConditionalConnector,
+    ConditionalStats,
+    conditional_headers,
+)
+from ezrest.replay import RecordingConnector, ReplayConnector
+from ezrest.requests import (
+    AsyncConnector,
+    AsyncConnectorWrapper,
+    AsyncEndpoint,
+    ConditionalResponse,
+    Connector,
+    ConnectorWrapper,
+    Endpoint,
+)
+
+BASE_URL = "http://x.com"
+
+
+class Server:
+    """Resources with versions, answers 304 if the ETag matches"""
+
+    def __init__(self) -> None:
+        self.versions: Dict[str, int] = {}
+        self.requests: List[Dict[str, str]] = []
+        self.decoded = 0
+
+    def respond(self, url: str, headers: Dict[str, str]) -> ConditionalResponse:
+        self.requests.append(headers)
+        version = self.versions.get(url, 1)
+        etag = f'"{version}"'
+        if headers.get("If-None-Match") == etag:
+            return ConditionalResponse(None, False, etag)
+        self.decoded += 1
+        return ConditionalResponse({"url": url, "version": version}, True, etag)
+
+
+class PollingConnector(Connector[Dict[str, Any]]):
+    def __init__(self, server: Server) -> None:
+        self.server = server
+
+    def get(self, url: str, **kwargs) -> Dict[str, Any]:
+        return {"url": url, "unconditional": True}
+
+    def post(self, url: str, **kwargs) -> Dict[str, Any]:
+        return {"posted": url}
+
+    def get_conditional(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        **kwargs,
+    ) -> ConditionalResponse:
+        if url.endswith("/plain"):
+            return ConditionalResponse({"url": url}, True)
+        return self.server.respond(url, conditional_headers(etag, last_modified))
+
+
+class AsyncPollingConnector(AsyncConnector[Dict[str, Any]]):
+    def __init__(self, server: Server) -> None:
+        self.server = server
+
+    async def get(self, url: str, **kwargs) -> Dict[str, Any]:
+        return {"url": url, "unconditional": True}
+
+    async def post(self, url: str, **kwargs) -> Dict[str, Any]:
+        return {"posted": url}
+
+    async def get_conditional(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        **kwargs,
+    ) -> ConditionalResponse:
+        return self.server.respond(url, conditional_headers(etag, last_modified))
+
+
+class TestConditionalRequests:
+    def test_conditional_headers(self):
+        assert conditional_headers() == {}
+        assert conditional_headers('"1"', "Wed, 21 Oct 2015 07:28:00 GMT") == {
+            "If-None-Match": '"1"',
+            "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+        }
+
+    def test_default_get_conditional(self):
+        connector = ConnectorWrapper(PollingConnector(Server()))
+        api_root = Endpoint[Dict[str, Any]](BASE_URL, connector)
+        result = api_root.jobs.get_conditional()
+        assert result == ({"url": f"{BASE_URL}/jobs", "version": 1}, True, '"1"', None)
+
+        class Plain(Connector[Dict[str, Any]]):
+            def get(self, url: str, **kwargs) -> Dict[str, Any]:
+                return {"url": url}
+
+        plain = Endpoint[Dict[str, Any]](BASE_URL, Plain())
+        result = plain.jobs.get_conditional(etag='"1"')
+        assert result == ConditionalResponse({"url": f"{BASE_URL}/jobs"}, True)
+
+        class AsyncPlain(AsyncConnector[Dict[str, Any]]):
+            async def get(self, url: str, **kwargs) -> Dict[str, Any]:
+                return {"url": url}
+
+        async_plain = AsyncEndpoint[Dict[str, Any]](
+            BASE_URL, AsyncConnectorWrapper(AsyncPlain())
+        )
+        result = asyncio.run(async_plain.jobs.get_conditional())
+        assert result == ConditionalResponse({"url": f"{BASE_URL}/jobs"}, True)
+
+
+class TestConditionalConnector:
+    def test_get(self):
+        server = Server()
+        connector = ConditionalConnector(PollingConnector(server))
+        api_root = Endpoint[Dict[str, Any]](BASE_URL, connector)
+        first = api_root.jobs[5].get_conditional()
+        assert first.changed and first.response["version"] == 1
+        second = api_root.jobs[5].get_conditional()
+        assert not second.changed
+        assert second.response is first.response
+        assert second.etag == '"1"'
+        assert api_root.jobs[5].get() is first.response
+        assert server.requests[1:] == [{"If-None-Match": '"1"'}] * 2
+        server.versions[f"{BASE_URL}/jobs/5"] = 2
+        third = api_root.jobs[5].get_conditional()
+        assert third.changed and third.response["version"] == 2
+        assert server.decoded == 2
+        # Validators are tracked per compiled URL
+        assert api_root.jobs[6].get_conditional().changed
+        assert connector.stats == ConditionalStats(5, 2, 2)
+        # Other methods are passed through
+        assert api_root.jobs.post() == {"posted": f"{BASE_URL}/jobs"}
+
+    def test_explicit_validators(self):
+        server = Server()
+        connector = ConditionalConnector(PollingConnector(server))
+        api_root = Endpoint[Dict[str, Any]](BASE_URL, connector)
+        # Caller's own validators - 304 without a remembered response
+        result = api_root.jobs.get_conditional(etag='"1"')
+        assert result == ConditionalResponse(None, False, '"1"')
+        assert connector.stats == ConditionalStats(0, 0, 0)
+
+    def test_unkeyable_request(self):
+        server = Server()
+        connector = ConditionalConnector(PollingConnector(server))
+        api_root = Endpoint[Dict[str, Any]](BASE_URL, connector)
+        # Not remembered - sent without validators every time
+        assert api_root.jobs.get_conditional(auth=object()).changed
+        assert api_root.jobs.get_conditional(auth=object()).changed
+        assert server.requests == [{}, {}]
+        assert connector.stats.entries == 0
+
+    def test_entries(self):
+        server = Server()
+        connector = ConditionalConnector(PollingConnector(server), max_entries=2)
+        api_root = Endpoint[Dict[str, Any]](BASE_URL, connector)
+        for i in range(3):
+            api_root.jobs[i].get()
+        assert connector.stats.entries == 2
+        # The least recently used response was dropped
+        assert api_root.jobs[0].get_conditional().changed
+        assert not api_root.jobs[2].get_conditional().changed
+        # Responses without validators are not remembered
+        api_root.plain.get()
+        assert connector.stats.entries == 2
+        connector.forget()
+        assert connector.stats.entries == 0
+        assert api_root.jobs[2].get_conditional().changed
+
+
+class TestAsyncConditionalConnector:
+    def test_get(self):
+        server = Server()
+        connector = AsyncConditionalConnector(AsyncPollingConnector(server))
+        api_root = AsyncEndpoint[Dict[str, Any]](BASE_URL, connector)
+
+        async def run():
+            first = await api_root.jobs.get()
+            second = await api_root.jobs.get_conditional()
+            explicit = await api_root.jobs.get_conditional(etag='"1"')
+            unkeyable = await api_root.jobs.get_conditional(auth=object())
+            assert unkeyable.changed
+            posted = await api_root.jobs.post()
+            return first, second, explicit, posted
+
+        first, second, explicit, posted = asyncio.run(run())
+        assert first == {"url": f"{BASE_URL}/jobs", "version": 1}
+        assert not second.changed and second.response is first
+        assert explicit == ConditionalResponse(None, False, '"1"')
+        assert posted == {"posted": f"{BASE_URL}/jobs"}
+        assert server.decoded == 2
+        assert connector.stats == ConditionalStats(2, 1, 1)
+        connector.forget()
+        assert connector.stats.entries == 0
+
+
+class TestStackedConditionalConnector:
+    def test_circuit_breaker(self):
+        server = Server()
+        breaker = CircuitBreakerConnector(PollingConnector(server))
+        connector = ConditionalConnector(breaker)
+        api_root = Endpoint[Dict[str, Any]](BASE_URL, connector)
+        for _ in range(5):
+            api_root.jobs[5].get()
+        assert len(server.requests) == 5
+        (metrics,) = breaker.breaker.metrics().values()
+        assert metrics.successes == 5
+        assert connector.stats == ConditionalStats(5, 4, 1)
+
+    def test_async_circuit_breaker(self):
+        server = Server()
+        breaker = AsyncCircuitBreakerConnector(AsyncPollingConnector(server))
+        api_root = AsyncEndpoint[Dict[str, Any]](
+            BASE_URL, AsyncConditionalConnector(breaker)
+        )
+
+        async def run():
+            for _ in range(3):
+                await api_root.jobs.get()
+            await api_root.jobs.get_conditional(etag='"1"')
+
+        asyncio.run(run())
+        (metrics,) = breaker.breaker.metrics().values()
+        assert metrics.successes == 4
+
+    def test_record_and_replay(self, tmp_path):
+        server = Server()
+        path = str(tmp_path / "traffic.rec")
+        with RecordingConnector(PollingConnector(server), path) as recording:
+            api_root = Endpoint[Dict[str, Any]](
+                BASE_URL, ConditionalConnector(recording)
+            )
+            recorded = [api_root.jobs.get_conditional() for _ in range(2)]
+        connector = ConditionalConnector(ReplayConnector(path))
+        api_root = Endpoint[Dict[str, Any]](BASE_URL, connector)
+        assert [api_root.jobs.get_conditional() for _ in range(2)] == recorded
+        assert connector.stats == ConditionalStats(2, 1, 1)
+        assert len(server.requests) == 2
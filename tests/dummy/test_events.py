@@ -0,0 +1,193 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
+import pytest
+from ezrest.events import (
+    Change,
+    Event,
+    StopWatching,
+    parse_lines,
+    parse_sse,
+    watch_events,
+)
+from ezrest.objects import AsyncCRUD, AsyncCRUDWrapper
+from ezrest.requests import AsyncConnector, AsyncConnectorWrapper, AsyncEndpoint
+
+BASE_URL = "http://x.com"
+
+STREAM = (
+    "\ufeff: comment\r\n"
+    "retry: 10\r\n"
+    "\r\n"
+    "id: 1\r\n"
+    "event: created\r\n"
+    'data: {"id": 5,\r\n'
+    'data: "name": "Buster"}\r\n'
+    "\r\n"
+    "data:no space\r"
+    "\r"
+    "id\n"
+    "data: without id\n"
+    "unknown: field\n"
+    "retry: soon\n"
+    "\n"
+    "data: incomplete"
+)
+
+
+async def chunks(data: str, size: int) -> AsyncIterator[bytes]:
+    raw = data.encode()
+    for start in range(0, len(raw), size):
+        yield raw[start : start + size]
+
+
+async def collect(iterator: AsyncIterator[Any], limit: Optional[int] = None):
+    items: List[Any] = []
+    async for item in iterator:
+        items.append(item)
+        if len(items) == limit:
+            break
+    return items
+
+
+class TestParsers:
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+    def test_parse_sse(self, size):
+        events = asyncio.run(collect(parse_sse(chunks(STREAM, size))))
+        assert events == [
+            Event('{"id": 5,\n"name": "Buster"}', "created", "1", 0.01),
+            Event("no space", "message", "1", 0.01),
+            Event("without id", "message", "", 0.01),
+        ]
+
+    def test_parse_lines(self):
+        stream = '{"id": 1}\r\n\r\n{"id": 2}\n{"id": 3}\r{"id": 4'
+        events = asyncio.run(collect(parse_lines(chunks(stream, 4))))
+        assert [json.loads(event.data)["id"] for event in events] == [1, 2, 3]
+
+
+class Subscriptions:
+    """Recorded subscriptions, every one serving the next scripted stream"""
+
+    def __init__(self, streams: List[Any]) -> None:
+        self.streams = streams
+        self.last_event_ids: List[Optional[str]] = []
+
+    async def subscribe(self, last_event_id: Optional[str]) -> AsyncIterator[bytes]:
+        self.last_event_ids.append(last_event_id)
+        stream = self.streams.pop(0) if self.streams else StopWatching()
+        if isinstance(stream, Exception):
+            raise stream
+        async for chunk in chunks(stream, 5):
+            yield chunk
+
+
+class TestWatchEvents:
+    def test_watch_reconnects_and_resumes(self):
+        subscriptions = Subscriptions(
+            [
+                "retry: 0\nid: 1\ndata: a\n\nid: 2\ndata: b\n\n",
+                ConnectionError("reset"),
+                "",
+                "id: 3\ndata: c\n\nid: 4\ndata: d\n\n",
+            ]
+        )
+        events = asyncio.run(collect(watch_events(subscriptions.subscribe, "0")))
+        assert [event.data for event in events] == ["a", "b", "c", "d"]
+        assert subscriptions.last_event_ids == ["0", "2", "2", "2", "4"]
+
+    def test_watch_max_retries(self):
+        subscriptions = Subscriptions(
+            ["data: a\n\n", ConnectionError("1"), ConnectionError("2")]
+        )
+
+        async def run():
+            return await collect(
+                watch_events(subscriptions.subscribe, retry=0, max_retries=1)
+            )
+
+        with pytest.raises(ConnectionError, match="2"):
+            asyncio.run(run())
+        assert len(subscriptions.last_event_ids) == 3
+
+
+class StreamingConnector(AsyncConnector[Dict[str, Any]]):
+    def __init__(self, streams: List[Any]) -> None:
+        self.subscriptions = Subscriptions(streams)
+        self.urls: List[str] = []
+        self.kwargs: List[Dict[str, Any]] = []
+
+    async def subscribe(
+        self, url: str, last_event_id: Optional[str] = None, **kwargs
+    ) -> AsyncIterator[bytes]:
+        self.urls.append(url)
+        self.kwargs.append(kwargs)
+        async for chunk in self.subscriptions.subscribe(last_event_id):
+            yield chunk
+
+
+class TestEndpointWatch:
+    def test_endpoint_watch(self):
+        connector = StreamingConnector(
+            ["id: 7\ndata: a\n\n", "raw", '{"id": 1}\n{"id": 2}\n']
+        )
+        api_root = AsyncEndpoint[Dict[str, Any]](
+            BASE_URL, AsyncConnectorWrapper(connector)
+        )
+
+        async def run():
+            events = await collect(
+                api_root.users["{}"].events.watch(5, retry=0, params={"v": 1}), 1
+            )
+            raw = await collect(api_root.users.subscribe())
+            lines = await collect(
+                api_root.users.watch(last_event_id="7", parser=parse_lines, retry=0)
+            )
+            return events, lines, raw
+
+        events, lines, raw = asyncio.run(run())
+        assert events == [Event("a", id="7")]
+        assert [event.data for event in lines] == ['{"id": 1}', '{"id": 2}']
+        assert raw == [b"raw"]
+        assert connector.urls[:2] == [f"{BASE_URL}/users/5/events", f"{BASE_URL}/users"]
+        assert connector.kwargs[0] == {"params": {"v": 1}}
+        assert connector.subscriptions.last_event_ids == [None, None, "7", "7"]
+
+    def test_subscribe_not_implemented(self):
+        async def run():
+            return await collect(AsyncConnector().subscribe(BASE_URL))
+
+        with pytest.raises(NotImplementedError):
+            asyncio.run(run())
+
+
+class UserCRUD(AsyncCRUD[Dict[str, Any]]):
+    def __init__(self, connector: AsyncConnector) -> None:
+        self.endpoint = AsyncEndpoint[Dict[str, Any]](BASE_URL, connector)
+
+    async def watch(self, *args, **kwargs) -> AsyncIterator[Change]:
+        async for event in self.endpoint.users.watch(*args, **kwargs):
+            yield Change(event.event, json.loads(event.data), event)
+
+
+class TestCRUDWatch:
+    def test_crud_watch(self):
+        connector = StreamingConnector(
+            [
+                'event: created\ndata: {"id": 1}\n\n',
+                'event: deleted\ndata: {"id": 1}\n\n',
+            ]
+        )
+        crud = AsyncCRUDWrapper(UserCRUD(connector))
+        changes = asyncio.run(collect(crud.watch(retry=0)))
+        assert [(change.kind, change.resource) for change in changes] == [
+            ("created", {"id": 1}),
+            ("deleted", {"id": 1}),
+        ]
+        assert changes[0].event == Event('{"id": 1}', "created")
+
+        async def run():
+            return await collect(AsyncCRUD().watch())
+
+        with pytest.raises(NotImplementedError):
+            asyncio.run(run())
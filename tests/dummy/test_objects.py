@@ -1,7 +1,7 @@
 import asyncio
 import pytest
 from typing import AsyncIterator, Dict, Iterator, Tuple
-from ezrest.objects import AsyncCRUD, CRUD
+from ezrest.objects import AsyncCRUD, AsyncCRUDWrapper, CRUD, CRUDWrapper
 
 RESOURCE_NAME = "test_resource"
 CRUD_ARGS = ("random_id",)
@@ -117,3 +117,29 @@ class TestAsyncCRUD:
         async for item in crud.list(*CRUD_ARGS, **CRUD_KWARGS):
             assert item == f"[list][{i}] {CRUD_ARGS} {CRUD_KWARGS}"
             i += 1
+
+
+class TestCRUDWrapper:
+    @pytest.mark.parametrize("method", ["create", "update", "delete"])
+    def test_wrapper_modification(self, method: str):
+        crud = CRUDWrapper[str](TestCRUD.MockedCRUD())
+        assert getattr(crud, method)(RESOURCE_NAME) == f"[{method}] {RESOURCE_NAME}"
+
+    def test_wrapper_read_list(self):
+        crud = CRUDWrapper[str](TestCRUD.MockedCRUD())
+        assert crud.read(*CRUD_ARGS) == f"[read] {CRUD_ARGS} {{}}"
+        assert len(list(crud.list(*CRUD_ARGS, **CRUD_KWARGS))) == 3
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("method", ["create", "update", "delete"])
+    async def test_async_wrapper_modification(self, method: str):
+        crud = AsyncCRUDWrapper[str](TestAsyncCRUD.MockedAsyncCRUD())
+        assert (
+            await getattr(crud, method)(RESOURCE_NAME) == f"[{method}] {RESOURCE_NAME}"
+        )
+
+    @pytest.mark.asyncio
+    async def test_async_wrapper_read_list(self):
+        crud = AsyncCRUDWrapper[str](TestAsyncCRUD.MockedAsyncCRUD())
+        assert await crud.read(*CRUD_ARGS) == f"[read] {CRUD_ARGS} {{}}"
+        assert len([item async for item in crud.list()]) == 3
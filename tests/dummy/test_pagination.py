@@ -0,0 +1,152 @@
+import asyncio
+from typing import Any, List
+import pytest
+from ezrest.objects import AsyncCRUD, CRUD
+from ezrest.pagination import (
+    AsyncPaginatedConnector,
+    AsyncPageIterator,
+    Checkpoint,
+    Page,
+    PageIterator,
+    PaginatedConnector,
+)
+from ezrest.requests import AsyncEndpoint, Endpoint
+
+BASE_URL = "http://x.com"
+PAGE_SIZE = 3
+TOTAL_ITEMS = 10
+
+
+def make_page(url: str, cursor: Any) -> Page:
+    page = cursor or 0
+    start = page * PAGE_SIZE
+    items = [f"{url} {i}" for i in range(start, min(start + PAGE_SIZE, TOTAL_ITEMS))]
+    return Page(items, page + 1 if start + PAGE_SIZE < TOTAL_ITEMS else None)
+
+
+EXPECTED = [f"{BASE_URL} {i}" for i in range(TOTAL_ITEMS)]
+
+
+class MockedPaginatedConnector(PaginatedConnector[str]):
+    def __init__(self, fail_on: List[int]) -> None:
+        self.fail_on = fail_on
+        self.cursors: List[Any] = []
+
+    def fetch_page(self, url: str, cursor: Any, **kwargs) -> Page:
+        self.cursors.append(cursor)
+        if cursor in self.fail_on:
+            self.fail_on.remove(cursor)
+            raise ConnectionError(cursor)
+        return make_page(url, cursor)
+
+
+class MockedAsyncPaginatedConnector(AsyncPaginatedConnector[str]):
+    def __init__(self, fail_on: List[int]) -> None:
+        self.fail_on = fail_on
+
+    async def fetch_page(self, url: str, cursor: Any, **kwargs) -> Page:
+        await asyncio.sleep(0.001)
+        if cursor in self.fail_on:
+            self.fail_on.remove(cursor)
+            raise ConnectionError(cursor)
+        return make_page(url, cursor)
+
+
+class TestCheckpoint:
+    def test_serialization(self):
+        checkpoint = Checkpoint({"next": f"{BASE_URL}?page=3"}, 2)
+        assert Checkpoint.loads(checkpoint.dumps()) == checkpoint
+        assert Checkpoint() == Checkpoint(None, 0)
+
+
+class TestPagination:
+    @pytest.mark.asyncio
+    async def test_not_implemented(self):
+        with pytest.raises(NotImplementedError):
+            list(PaginatedConnector().list(BASE_URL))
+        with pytest.raises(NotImplementedError):
+            async for _ in AsyncPaginatedConnector().list(BASE_URL):
+                pass
+
+    def test_list(self):
+        connector = MockedPaginatedConnector([])
+        items = Endpoint[str](BASE_URL, connector).list()
+        assert isinstance(items, PageIterator)
+        assert list(items) == EXPECTED
+        assert connector.cursors == [None, 1, 2, 3]
+        assert list(items) == []
+
+    def test_resume_from_checkpoint(self):
+        connector = MockedPaginatedConnector([2])
+        api = Endpoint[str](BASE_URL, connector)
+        items = api.list()
+        consumed = []
+        with pytest.raises(ConnectionError):
+            for item in items:
+                consumed.append(item)
+        assert items.checkpoint == Checkpoint(2, 0)
+        saved = items.checkpoint.dumps()
+        resumed = api.list(checkpoint=Checkpoint.loads(saved))
+        assert consumed + list(resumed) == EXPECTED
+
+    def test_resume_in_place(self):
+        connector = MockedPaginatedConnector([1])
+        items = Endpoint[str](BASE_URL, connector).list()
+        consumed = []
+        with pytest.raises(ConnectionError):
+            consumed.extend(items)
+        consumed.extend(items)
+        assert consumed == EXPECTED
+
+    def test_partial_page_checkpoint(self):
+        api = Endpoint[str](BASE_URL, MockedPaginatedConnector([]))
+        items = api.list()
+        consumed = [next(items) for _ in range(4)]
+        assert items.checkpoint == Checkpoint(1, 1)
+        assert consumed + list(api.list(checkpoint=items.checkpoint)) == EXPECTED
+
+    def test_on_checkpoint(self):
+        checkpoints: List[Checkpoint] = []
+        api = Endpoint[str](BASE_URL, MockedPaginatedConnector([]))
+        list(api.list(on_checkpoint=checkpoints.append, checkpoint_every=2))
+        assert checkpoints == [Checkpoint(2, 0)]
+
+    def test_crud_map(self):
+        class LengthCRUD(CRUD[int]):
+            api = Endpoint[str](BASE_URL, MockedPaginatedConnector([]))
+
+            def list(self, checkpoint=None) -> PageIterator[int]:
+                return self.api.list(checkpoint=checkpoint).map(len).map(str)
+
+        items = LengthCRUD().list()
+        assert next(items) == str(len(EXPECTED[0]))
+        assert list(LengthCRUD().list(items.checkpoint)) == [
+            str(len(item)) for item in EXPECTED[1:]
+        ]
+
+
+class TestAsyncPagination:
+    @pytest.mark.asyncio
+    async def test_resume_from_checkpoint(self):
+        api = AsyncEndpoint[str](BASE_URL, MockedAsyncPaginatedConnector([2]))
+        items = api.list()
+        assert isinstance(items, AsyncPageIterator)
+        consumed = []
+        with pytest.raises(ConnectionError):
+            async for item in items:
+                consumed.append(item)
+        resumed = api.list(checkpoint=Checkpoint.loads(items.checkpoint.dumps()))
+        consumed.extend([item async for item in resumed])
+        assert consumed == EXPECTED
+
+    @pytest.mark.asyncio
+    async def test_crud_map(self):
+        class LengthCRUD(AsyncCRUD[int]):
+            api = AsyncEndpoint[str](BASE_URL, MockedAsyncPaginatedConnector([]))
+
+            def list(self) -> AsyncPageIterator[int]:
+                return self.api.list().map(len)
+
+        assert [item async for item in LengthCRUD().list()] == [
+            len(item) for item in EXPECTED
+        ]
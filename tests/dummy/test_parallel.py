@@ -0,0 +1,169 @@
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterator, Iterator, List, Tuple
+import pytest
+from ezrest.objects import AsyncCRUD, CRUD
+from ezrest.parallel import (
+    async_list_partitioned,
+    async_map_pages,
+    default_executor,
+    id_ranges,
+    is_free_threaded,
+    list_partitioned,
+    map_pages,
+    offset_windows,
+)
+
+PAGES = [json.dumps({"data": list(range(i * 5, i * 5 + 5))}).encode() for i in range(7)]
+EXPECTED = [f"item {i}" for i in range(35)]
+
+
+def parse_page(page: bytes) -> List[str]:
+    return [f"item {i}" for i in json.loads(page)["data"]]
+
+
+def parse_failing_page(page: bytes) -> List[str]:
+    raise ValueError("invalid page")
+
+
+async def async_pages() -> AsyncIterator[bytes]:
+    for page in PAGES:
+        await asyncio.sleep(0.001)
+        yield page
+
+
+class MappedCRUD(CRUD[str]):
+    def __init__(self, executor) -> None:
+        self.executor = executor
+
+    def list(self) -> Iterator[str]:
+        yield from map_pages(iter(PAGES), parse_page, self.executor, max_pending=2)
+
+
+class AsyncMappedCRUD(AsyncCRUD[str]):
+    def __init__(self, executor) -> None:
+        self.executor = executor
+
+    async def list(self) -> AsyncIterator[str]:
+        async for item in async_map_pages(async_pages(), parse_page, self.executor):
+            yield item
+
+
+class TestParallel:
+    def test_default_executor(self):
+        executor = default_executor(1)
+        expected_type = (
+            ThreadPoolExecutor if is_free_threaded() else ProcessPoolExecutor
+        )
+        assert isinstance(executor, expected_type)
+        executor.shutdown()
+
+    def test_map_pages_process_pool(self):
+        with ProcessPoolExecutor(2) as executor:
+            assert list(MappedCRUD(executor).list()) == EXPECTED
+
+    def test_map_pages(self):
+        with ThreadPoolExecutor(3) as executor:
+            assert list(map_pages(PAGES, parse_page, executor)) == EXPECTED
+            with pytest.raises(ValueError):
+                list(map_pages(PAGES, parse_failing_page, executor))
+            partial = map_pages(PAGES, parse_page, executor, max_pending=1)
+            assert next(partial) == EXPECTED[0]
+            partial.close()
+
+    @pytest.mark.asyncio
+    async def test_async_map_pages(self):
+        with ThreadPoolExecutor(3) as executor:
+            items = [item async for item in AsyncMappedCRUD(executor).list()]
+            assert items == EXPECTED
+            with pytest.raises(ValueError):
+                async for _ in async_map_pages(
+                    async_pages(), parse_failing_page, executor
+                ):
+                    pass
+
+    @pytest.mark.asyncio
+    async def test_async_map_pages_source_error(self):
+        async def failing_pages() -> AsyncIterator[bytes]:
+            yield PAGES[0]
+            raise ConnectionError()
+
+        with ThreadPoolExecutor(1) as executor:
+            items = []
+            with pytest.raises(ConnectionError):
+                async for item in async_map_pages(
+                    failing_pages(), parse_page, executor
+                ):
+                    items.append(item)
+            assert items == EXPECTED[:5]
+
+    @pytest.mark.asyncio
+    async def test_async_map_pages_early_exit(self):
+        with ThreadPoolExecutor(1) as executor:
+            iterator = async_map_pages(async_pages(), parse_page, executor, 1)
+            assert await iterator.__anext__() == EXPECTED[0]
+            await asyncio.sleep(0.01)
+            await iterator.aclose()
+
+
+def list_range(id_range: Tuple[int, int]) -> Iterator[int]:
+    if id_range[0] == 13:
+        raise ConnectionError()
+    yield from range(*id_range)
+
+
+async def async_list_range(id_range: Tuple[int, int]) -> AsyncIterator[int]:
+    for i in range(*id_range):
+        await asyncio.sleep(0.001 * (id_range[0] % 3))
+        if i == 13:
+            raise ConnectionError()
+        yield i
+
+
+class TestPartitioned:
+    def test_partitions(self):
+        assert id_ranges(10, 35, 10) == [(10, 20), (20, 30), (30, 35)]
+        assert offset_windows(25, 10) == [(0, 10), (10, 10), (20, 5)]
+        assert offset_windows(0, 10) == []
+
+    @pytest.mark.parametrize("ordered", [False, True])
+    def test_list_partitioned(self, ordered: bool):
+        with ThreadPoolExecutor(3) as executor:
+            items = list_partitioned(
+                list_range, id_ranges(0, 100, 7), executor, ordered, max_pending=2
+            )
+            items = list(items)
+            assert sorted(items) == list(range(100))
+            if ordered:
+                assert items == list(range(100))
+            with pytest.raises(ConnectionError):
+                list(list_partitioned(list_range, id_ranges(0, 30, 13), executor))
+
+    def test_list_partitioned_process_pool(self):
+        with ProcessPoolExecutor(2) as executor:
+            items = list_partitioned(list_range, id_ranges(0, 50, 10), executor, True)
+            assert list(items) == list(range(50))
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("ordered", [False, True])
+    async def test_async_list_partitioned(self, ordered: bool):
+        partitions = id_ranges(0, 12, 4)
+        items = [
+            item
+            async for item in async_list_partitioned(
+                async_list_range, partitions, 2, ordered, buffer_size=2
+            )
+        ]
+        assert sorted(items) == list(range(12))
+        if ordered:
+            assert items == list(range(12))
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("ordered", [False, True])
+    async def test_async_list_partitioned_error(self, ordered: bool):
+        with pytest.raises(ConnectionError):
+            async for _ in async_list_partitioned(
+                async_list_range, id_ranges(0, 30, 5), ordered=ordered
+            ):
+                pass
@@ -0,0 +1,165 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Iterator, List, NamedTuple, Optional
+import pytest
+from ezrest.objects import AsyncCRUD, CRUD
+from ezrest.prefetch import AsyncPrefetchingCRUD, PrefetchingCRUD, Relation
+
+
+class User(NamedTuple):
+    id: int
+
+
+class Comment(NamedTuple):
+    id: int
+    post_id: int
+
+
+class Post(NamedTuple):
+    id: int
+    author_id: Optional[int]
+    author: Optional[User] = None
+    comments: List[Comment] = []
+    expand: List[str] = []
+
+
+POSTS = [Post(i, i % 3 if i != 4 else None) for i in range(10)]
+COMMENTS = [Comment(i, i % 5) for i in range(20)]
+
+
+class UserCRUD(CRUD[User]):
+    def __init__(self) -> None:
+        self.reads: List[int] = []
+
+    def read(self, identifier: int) -> User:
+        self.reads.append(identifier)
+        return User(identifier)
+
+
+class CommentCRUD(CRUD[Comment]):
+    def __init__(self) -> None:
+        self.lists: List[List[int]] = []
+
+    def list(self, post_ids: List[int]) -> Iterator[Comment]:
+        self.lists.append(post_ids)
+        return iter([c for c in COMMENTS if c.post_id in post_ids])
+
+
+class PostCRUD(CRUD[Post]):
+    def read(self, identifier: int, expand: List[str] = []) -> Post:
+        return POSTS[identifier]._replace(expand=expand)
+
+    def list(self, expand: List[str] = []) -> Iterator[Post]:
+        return iter([post._replace(expand=expand) for post in POSTS])
+
+
+def relations(users: Any, comments: Any) -> Any:
+    return {
+        "author": Relation(
+            users,
+            key=lambda post: post.author_id,
+            attach=lambda post, user: post._replace(author=user),
+        ),
+        "comments": Relation(
+            comments,
+            key=lambda post: post.id,
+            attach=lambda post, items: post._replace(comments=items),
+            many=True,
+            read_many=comments.list,
+            related_key=lambda comment: comment.post_id,
+            batch_size=3,
+        ),
+        "tags": Relation(None, key=lambda post: None, attach=None, expand="tags"),
+    }
+
+
+def check_posts(posts: List[Post]):
+    assert [post.id for post in posts] == list(range(10))
+    for post in posts:
+        assert post.author == (User(post.author_id) if post.id != 4 else None)
+        assert post.comments == [c for c in COMMENTS if c.post_id == post.id]
+
+
+def test_relation():
+    with pytest.raises(ValueError):
+        Relation(None, key=id, attach=id, read_many=list)
+    relation = Relation(None, key=lambda ids: ids, attach=id, many=True)
+    assert relation.keys([1, None, 2]) == [1, 2]
+    assert relation.keys(3) == [3]
+    assert relation.unique_keys([[1, 2], [2, 3], None]) == [1, 2, 3]
+
+
+class TestPrefetch:
+    def test_list(self):
+        users, comments = UserCRUD(), CommentCRUD()
+        crud = PrefetchingCRUD(PostCRUD(), relations(users, comments), page_size=4)
+        posts = list(crud.list(prefetch=["author", "comments"]))
+        check_posts(posts)
+        assert len(users.reads) == 8  # unique authors per page: 3 + 3 + 2
+        assert comments.lists == [[0, 1, 2], [3], [4, 5, 6], [7], [8, 9]]
+
+    def test_read_and_expand(self):
+        users = UserCRUD()
+        executor = ThreadPoolExecutor(2)
+        crud = PrefetchingCRUD(
+            PostCRUD(), relations(users, CommentCRUD()), 100, executor
+        )
+        post = crud.read(5, prefetch=["author", "tags"])
+        assert post.author == User(2) and post.expand == ["tags"]
+        post = crud.read(5, prefetch=["tags"], expand="owner")
+        assert post.expand == ["owner", "tags"]
+        assert [post.expand for post in crud.list(prefetch=["tags"])] == [["tags"]] * 10
+        assert list(crud.list()) == POSTS
+        with pytest.raises(ValueError):
+            crud.read(1, prefetch=["unknown"])
+        executor.shutdown()
+
+
+class AsyncUserCRUD(AsyncCRUD[User]):
+    def __init__(self) -> None:
+        self.reads: List[int] = []
+
+    async def read(self, identifier: int) -> User:
+        await asyncio.sleep(0.001)
+        self.reads.append(identifier)
+        return User(identifier)
+
+
+class AsyncCommentCRUD(AsyncCRUD[Comment]):
+    async def list(self, post_ids: List[int]) -> AsyncIterator[Comment]:
+        for comment in COMMENTS:
+            if comment.post_id in post_ids:
+                yield comment
+
+
+class AsyncPostCRUD(AsyncCRUD[Post]):
+    async def read(self, identifier: int, expand: List[str] = []) -> Post:
+        return POSTS[identifier]._replace(expand=expand)
+
+    async def list(self, expand: List[str] = []) -> AsyncIterator[Post]:
+        for post in POSTS:
+            yield post._replace(expand=expand)
+
+
+class TestAsyncPrefetch:
+    @pytest.mark.asyncio
+    async def test_list(self):
+        users = AsyncUserCRUD()
+        crud = AsyncPrefetchingCRUD(
+            AsyncPostCRUD(), relations(users, AsyncCommentCRUD()), page_size=4
+        )
+        check_posts([post async for post in crud.list(prefetch=["author", "comments"])])
+        assert len(users.reads) == 8
+        assert [post async for post in crud.list()] == POSTS
+
+    @pytest.mark.asyncio
+    async def test_read_and_awaitable_read_many(self):
+        async def read_comments(post_ids: List[int]) -> List[Comment]:
+            return [c for c in COMMENTS if c.post_id in post_ids]
+
+        post_relations = relations(AsyncUserCRUD(), AsyncCommentCRUD())
+        post_relations["comments"].read_many = read_comments
+        crud = AsyncPrefetchingCRUD(AsyncPostCRUD(), post_relations)
+        post = await crud.read(1, prefetch=["author", "comments", "tags"])
+        assert post.author == User(1) and post.expand == ["tags"]
+        assert post.comments == [c for c in COMMENTS if c.post_id == 1]
@@ -0,0 +1,152 @@
+import asyncio
+import tracemalloc
+from typing import Any, List
+import pytest
+from ezrest.pagination import AsyncPaginatedConnector, Page, PaginatedConnector
+from ezrest.profiling import AllocationProfiler, AllocationStats
+from ezrest.requests import AsyncEndpoint, Endpoint
+from ezrest.tracing import InMemoryTracer, get_tracer, set_tracer, tracing_enabled
+
+BASE_URL = "http://x.com"
+MB = 1024 * 1024
+
+
+class AllocatingConnector(PaginatedConnector[Any]):
+    def get(self, url: str) -> Any:
+        if "missing" in url:
+            raise ValueError(url)
+        # Temporary buffer freed before returning the response
+        buffer = bytearray(4 * MB)
+        return bytes(len(buffer) // 4)
+
+    def fetch_page(self, url: str, cursor: Any, **kwargs) -> Page:
+        page = cursor or 0
+        return Page([bytes(MB // 4)] * 2, page + 1 if page < 2 else None)
+
+
+class AsyncAllocatingConnector(AsyncPaginatedConnector[Any]):
+    async def get(self, url: str) -> Any:
+        await asyncio.sleep(0)
+        return bytes(2 * MB)
+
+    async def fetch_page(self, url: str, cursor: Any, **kwargs) -> Page:
+        await asyncio.sleep(0)
+        page = cursor or 0
+        return Page([bytes(MB // 4)] * 2, page + 1 if page < 2 else None)
+
+
+def stats(profiler: AllocationProfiler, template: str, kind: str) -> AllocationStats:
+    (found,) = [
+        s for s in profiler.report() if s.template == template and s.kind == kind
+    ]
+    return found
+
+
+class TestAllocationProfiler:
+    def test_request_allocations(self):
+        api = Endpoint[Any](BASE_URL, AllocatingConnector())
+        with AllocationProfiler() as profiler:
+            assert profiler.active and tracing_enabled()
+            responses = [api.posts[i].get() for i in range(3)]
+            with pytest.raises(ValueError):
+                api.posts.missing.get()
+            api.users.get()
+        assert not profiler.active and not tracing_enabled()
+        assert not tracemalloc.is_tracing()
+        posts = stats(profiler, f"{BASE_URL}/posts/{{}}", "request")
+        assert posts.operations == 3
+        # Peak includes the temporary buffer, only the response is retained
+        assert posts.peak >= 5 * MB
+        assert posts.total_peak >= 15 * MB
+        assert 3 * MB <= posts.retained < 4 * MB
+        users = stats(profiler, f"{BASE_URL}/users", "request")
+        assert users.operations == 1 and MB <= users.retained < 2 * MB
+        assert profiler.report()[0].peak >= profiler.report()[-1].peak
+        assert len(responses) == 3
+
+    def test_list_and_page_allocations(self):
+        api = Endpoint[Any](BASE_URL, AllocatingConnector())
+        profiler = AllocationProfiler()
+        profiler.start()
+        profiler.start()
+        try:
+            kept = list(api.posts.list())
+        finally:
+            profiler.stop()
+            profiler.stop()
+        assert len(kept) == 6
+        template = f"{BASE_URL}/posts"
+        pages = stats(profiler, template, "page")
+        listing = stats(profiler, template, "request")
+        assert pages.operations == 3
+        assert pages.peak >= MB // 4
+        assert listing.operations == 1
+        # Pages are fetched while the list is iterated
+        assert listing.peak >= pages.peak
+        assert listing.retained >= pages.retained
+        report = profiler.format_report()
+        lines = report.splitlines()
+        assert lines[0].split() == [
+            "URL",
+            "template",
+            "kind",
+            "operations",
+            "peak",
+            "avg",
+            "peak",
+            "retained",
+        ]
+        assert len(lines) == 3
+        assert "KiB" in report
+        assert len(profiler.format_report(limit=1).splitlines()) == 2
+        profiler.reset()
+        assert profiler.report() == []
+
+    def test_async_allocations(self):
+        api = AsyncEndpoint[Any](BASE_URL, AsyncAllocatingConnector())
+
+        async def run() -> List[Any]:
+            response = await api.users[1].get()
+            return [response] + [item async for item in api.posts.list()]
+
+        with AllocationProfiler() as profiler:
+            kept = asyncio.run(run())
+        assert len(kept) == 7
+        users = stats(profiler, f"{BASE_URL}/users/{{}}", "request")
+        assert users.retained >= 2 * MB
+        assert stats(profiler, f"{BASE_URL}/posts", "page").operations == 3
+
+    def test_passes_spans_to_tracer(self):
+        tracer = InMemoryTracer()
+        set_tracer(tracer)
+        api = Endpoint[Any](BASE_URL, AllocatingConnector())
+        try:
+            with AllocationProfiler() as profiler:
+                with get_tracer().start_as_current_span("parent"):
+                    api.posts[1].get()
+            assert get_tracer() is tracer
+        finally:
+            set_tracer(None)
+        request, parent = tracer.spans
+        assert request.parent is parent
+        assert stats(profiler, f"{BASE_URL}/posts/{{}}", "request").operations == 1
+
+        # Explicit tracer, tracemalloc started by someone else
+        explicit = InMemoryTracer()
+        tracemalloc.start()
+        try:
+            with AllocationProfiler(explicit) as profiler:
+                api.posts[1].get()
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
+        assert [span.name for span in explicit.spans] == ["ezrest.request"]
+
+    def test_untraced_allocations(self):
+        profiler = AllocationProfiler()
+        span = profiler.start_span("ezrest.request")
+        with profiler.use_span(span):
+            pass
+        span.end()
+        span.end()
+        assert profiler.report() == [AllocationStats("unknown", "request", 1, 0, 0, 0)]
@@ -0,0 +1,181 @@
+import asyncio
+from typing import AsyncIterator, Dict, Iterator, Optional
+import pytest
+from ezrest.replay import (
+    AsyncRecordingConnector,
+    AsyncReplayConnector,
+    RecordingConnector,
+    ReplayConnector,
+    ReplayMissError,
+    read_records,
+)
+from ezrest.requests import AsyncConnector, AsyncEndpoint, Connector, Endpoint
+
+BASE_URL = "http://x.com"
+
+
+class PagedConnector(Connector[str]):
+    def get(self, url: str, params: Optional[Dict[str, int]] = None) -> str:
+        if "missing" in url:
+            raise ValueError(url)
+        return f"[get] {url} {params}"
+
+    def stream_raw(self, url: str) -> Iterator[bytes]:
+        yield url.encode()
+
+    def list(self, url: str, params: Optional[Dict[str, int]] = None) -> Iterator[str]:
+        params = params if params is not None else {"page": 0}
+        while params["page"] < 3:
+            yield f"[list] {url} {params['page']}"
+            params["page"] += 1
+
+
+class AsyncPagedConnector(AsyncConnector[str]):
+    async def get(self, url: str, params: Optional[Dict[str, int]] = None) -> str:
+        await asyncio.sleep(0.001)
+        if "missing" in url:
+            raise ValueError(url)
+        return f"[get] {url} {params}"
+
+    async def list(
+        self, url: str, params: Optional[Dict[str, int]] = None
+    ) -> AsyncIterator[str]:
+        params = params if params is not None else {"page": 0}
+        while params["page"] < 3:
+            await asyncio.sleep(0.001)
+            yield f"[list] {url} {params['page']}"
+            params["page"] += 1
+
+
+class TestReplay:
+    def test_record_and_replay(self, tmp_path):
+        path = str(tmp_path / "traffic.rec")
+        with RecordingConnector(PagedConnector(), path) as connector:
+            api = Endpoint[str](BASE_URL, connector)
+            recorded_get = api.posts[1].get(params={"q": 1})
+            recorded_list = list(api.posts.list(params={"page": 0}))
+            recorded_raw = api.get_raw()
+            with pytest.raises(ValueError):
+                api.missing.get()
+        records = list(read_records(path))
+        methods = [record.method for record in records]
+        assert methods == ["get", "list", "get_raw", "get"]
+        assert len(records[1].timings) == 4
+        api = Endpoint[str](BASE_URL, ReplayConnector(path))
+        assert api.posts[1].get(params={"q": 1}) == recorded_get
+        assert list(api.posts.list(params={"page": 0})) == recorded_list
+        assert api.get_raw() == recorded_raw == BASE_URL.encode()
+        with pytest.raises(ValueError):
+            api.missing.get()
+        with pytest.raises(ReplayMissError):
+            api.posts[1].get(params={"q": 2})
+
+    def test_replay_order(self, tmp_path):
+        path = str(tmp_path / "traffic.rec")
+        responses = iter(["first", "second"])
+
+        class ChangingConnector(Connector[str]):
+            def get(self, url: str) -> str:
+                return next(responses)
+
+        with RecordingConnector(ChangingConnector(), path) as connector:
+            connector.get(BASE_URL)
+            connector.get(BASE_URL)
+        connector = ReplayConnector(read_records(path), latency=True, speed=100)
+        for method in ["post", "put", "patch", "delete"]:
+            with pytest.raises(ReplayMissError):
+                getattr(connector, method)(BASE_URL)
+        assert [connector.get(BASE_URL) for _ in range(3)] == [
+            "first",
+            "second",
+            "second",
+        ]
+
+    def test_unkeyable_request(self, tmp_path):
+        path = str(tmp_path / "traffic.rec")
+
+        class AuthConnector(Connector[str]):
+            def get(self, url: str, auth: object = None) -> str:
+                return url
+
+        with RecordingConnector(AuthConnector(), path) as connector:
+            assert connector.get(BASE_URL, auth=object()) == BASE_URL
+        assert [record.key for record in read_records(path)] == [None]
+        with pytest.raises(ReplayMissError):
+            ReplayConnector(path).get(BASE_URL, auth=object())
+
+    def test_record_partial_list(self, tmp_path):
+        path = str(tmp_path / "traffic.rec")
+        with RecordingConnector(PagedConnector(), path) as connector:
+            listing = connector.list(BASE_URL)
+            assert next(listing) == f"[list] {BASE_URL} 0"
+            listing.close()
+        replayed = ReplayConnector(path).list(BASE_URL)
+        assert next(replayed) == f"[list] {BASE_URL} 0"
+        with pytest.raises(ReplayMissError, match="not consumed completely"):
+            next(replayed)
+
+    def test_record_list_error(self, tmp_path):
+        path = str(tmp_path / "traffic.rec")
+
+        class FailingConnector(Connector[str]):
+            def list(self, url: str) -> Iterator[str]:
+                yield "item"
+                raise ValueError(url)
+
+        with RecordingConnector(FailingConnector(), path) as connector:
+            with pytest.raises(ValueError):
+                list(connector.list(BASE_URL))
+        replayed = ReplayConnector(path).list(BASE_URL)
+        assert next(replayed) == "item"
+        with pytest.raises(ValueError):
+            next(replayed)
+
+
+class TestAsyncReplay:
+    @pytest.mark.asyncio
+    async def test_record_and_replay(self, tmp_path):
+        path = str(tmp_path / "traffic.rec")
+        async with AsyncRecordingConnector(AsyncPagedConnector(), path) as connector:
+            api = AsyncEndpoint[str](BASE_URL, connector)
+            recorded_get = await api.posts[1].get()
+            recorded_list = [item async for item in api.posts.list()]
+            with pytest.raises(ValueError):
+                await api.missing.get()
+        api = AsyncEndpoint[str](BASE_URL, AsyncReplayConnector(path, latency=True))
+        assert await api.posts[1].get() == recorded_get
+        assert [item async for item in api.posts.list()] == recorded_list
+        with pytest.raises(ValueError):
+            await api.missing.get()
+        for method in ["post", "put", "patch", "delete", "get_raw"]:
+            with pytest.raises(ReplayMissError):
+                await getattr(api, method)()
+
+    @pytest.mark.asyncio
+    async def test_record_list_error(self, tmp_path):
+        path = str(tmp_path / "traffic.rec")
+
+        class FailingConnector(AsyncConnector[str]):
+            async def list(self, url: str) -> AsyncIterator[str]:
+                yield "item"
+                raise ValueError(url)
+
+        async with AsyncRecordingConnector(FailingConnector(), path) as connector:
+            with pytest.raises(ValueError):
+                async for _ in connector.list(BASE_URL):
+                    pass
+        with pytest.raises(ValueError):
+            async for item in AsyncReplayConnector(path).list(BASE_URL):
+                assert item == "item"
+
+    @pytest.mark.asyncio
+    async def test_record_partial_list(self, tmp_path):
+        path = str(tmp_path / "traffic.rec")
+        async with AsyncRecordingConnector(AsyncPagedConnector(), path) as connector:
+            listing = connector.list(BASE_URL)
+            assert await listing.__anext__() == f"[list] {BASE_URL} 0"
+            await listing.aclose()
+        replayed = AsyncReplayConnector(path).list(BASE_URL)
+        assert await replayed.__anext__() == f"[list] {BASE_URL} 0"
+        with pytest.raises(ReplayMissError, match="not consumed completely"):
+            await replayed.__anext__()
@@ -1,10 +1,13 @@
 import asyncio
+import io
 from typing import AsyncIterator, Iterator
 import pytest
 from ezrest.requests import (
     AsyncConnector,
+    AsyncConnectorWrapper,
     AsyncEndpoint,
     Connector,
+    ConnectorWrapper,
     Endpoint,
     BaseEndpoint,
 )
@@ -174,3 +177,88 @@ class TestAsyncRequestsModule:
         async for item in api.list():
             assert item == f"[list] {api.url} {i}"
             i += 1
+
+
+class TestConnectorWrapper:
+    @pytest.mark.parametrize("method", ["post", "get", "put", "patch", "delete"])
+    def test_wrapper(self, method: str):
+        api = Endpoint[str](
+            BASE_URL, ConnectorWrapper(TestRequestsModule.MockedConnector())
+        )
+        assert getattr(api, method)() == f"[{method}] {api.url}"
+
+    def test_wrapper_list(self):
+        api = Endpoint[str](
+            BASE_URL, ConnectorWrapper(TestRequestsModule.MockedConnector())
+        )
+        assert list(api.list()) == [f"[list] {api.url} {i}" for i in range(3)]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("method", ["post", "get", "put", "patch", "delete"])
+    async def test_async_wrapper(self, method: str):
+        api = AsyncEndpoint[str](
+            BASE_URL,
+            AsyncConnectorWrapper(TestAsyncRequestsModule.MockedAsyncConnector()),
+        )
+        assert await getattr(api, method)() == f"[{method}] {api.url}"
+
+    @pytest.mark.asyncio
+    async def test_async_wrapper_list(self):
+        api = AsyncEndpoint[str](
+            BASE_URL,
+            AsyncConnectorWrapper(TestAsyncRequestsModule.MockedAsyncConnector()),
+        )
+        items = [item async for item in api.list()]
+        assert items == [f"[list] {api.url} {i}" for i in range(3)]
+
+
+class TestRawRequests:
+    CHUNKS = [b'{"id": ', b"1, ", b'"name": "x"}']
+    BODY = b"".join(CHUNKS)
+
+    class MockedRawConnector(Connector[str]):
+        def stream_raw(self, url: str) -> Iterator[bytes]:
+            yield from TestRawRequests.CHUNKS
+
+    class MockedAsyncRawConnector(AsyncConnector[str]):
+        async def stream_raw(self, url: str) -> AsyncIterator[bytes]:
+            for chunk in TestRawRequests.CHUNKS:
+                await asyncio.sleep(0.001)
+                yield chunk
+
+    @pytest.mark.asyncio
+    async def test_raw_not_implemented(self):
+        with pytest.raises(NotImplementedError):
+            Connector().get_raw(BASE_URL)
+        with pytest.raises(NotImplementedError):
+            await AsyncConnector().get_raw(BASE_URL)
+
+    @pytest.mark.parametrize("wrapped", [False, True])
+    def test_raw(self, wrapped: bool):
+        connector: Connector[str] = TestRawRequests.MockedRawConnector()
+        if wrapped:
+            connector = ConnectorWrapper(connector)
+        api = Endpoint[str](BASE_URL, connector)
+        assert list(api.stream_raw()) == self.CHUNKS
+        assert api.get_raw() == self.BODY
+        file = io.BytesIO()
+        assert api.get_raw_into(file) == len(self.BODY)
+        assert file.getvalue() == self.BODY
+        buffer = bytearray(len(self.BODY) + 10)
+        assert api.get_raw_into(memoryview(buffer)) == len(self.BODY)
+        assert buffer[: len(self.BODY)] == self.BODY
+        with pytest.raises(BufferError):
+            api.get_raw_into(bytearray(5))
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("wrapped", [False, True])
+    async def test_async_raw(self, wrapped: bool):
+        connector: AsyncConnector[str] = TestRawRequests.MockedAsyncRawConnector()
+        if wrapped:
+            connector = AsyncConnectorWrapper(connector)
+        api = AsyncEndpoint[str](BASE_URL, connector)
+        assert [chunk async for chunk in api.stream_raw()] == self.CHUNKS
+        assert await api.get_raw() == self.BODY
+        buffer = bytearray(len(self.BODY))
+        assert await api.get_raw_into(buffer) == len(self.BODY)
+        assert buffer == self.BODY
@@ -0,0 +1,256 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List
+import pytest
+from ezrest.pagination import AsyncPaginatedConnector, Checkpoint, Page
+from ezrest.requests import AsyncConnector, AsyncEndpoint
+from ezrest.scheduling import (
+    AsyncSchedulingConnector,
+    Priority,
+    RequestScheduler,
+    SchedulerStats,
+    request_tag,
+)
+
+BASE_URL = "http://x.com"
+
+
+class SlowConnector(AsyncConnector[Dict[str, Any]]):
+    def __init__(self) -> None:
+        self.order: List[str] = []
+        self.kwargs: List[Dict[str, Any]] = []
+
+    async def get(self, url: str, **kwargs) -> Dict[str, Any]:
+        self.order.append(url[len(BASE_URL) :])
+        self.kwargs.append(kwargs)
+        await asyncio.sleep(0.001)
+        return {"url": url}
+
+    async def list(self, url: str, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        for i in range(3):
+            self.order.append(f"{url[len(BASE_URL) :]}#{i}")
+            await asyncio.sleep(0.001)
+            yield {"id": i}
+
+
+class SlowPaginatedConnector(AsyncPaginatedConnector[Dict[str, Any]]):
+    def __init__(self) -> None:
+        self.order: List[str] = []
+
+    async def get(self, url: str, **kwargs) -> Dict[str, Any]:
+        self.order.append(url[len(BASE_URL) :])
+        await asyncio.sleep(0.001)
+        return {"url": url}
+
+    async def fetch_page(self, url: str, cursor: Any, **kwargs) -> Page:
+        page = cursor or 0
+        self.order.append(f"{url[len(BASE_URL) :]}#{page}")
+        await asyncio.sleep(0.001)
+        items = [{"id": page * 2 + i} for i in range(2)]
+        return Page(items, page + 1 if page < 2 else None)
+
+
+class TestRequestScheduler:
+    def test_priorities(self):
+        scheduler = RequestScheduler(1)
+        order: List[str] = []
+
+        async def request(name: str, priority: int, flow: str):
+            async with scheduler.slot(priority, flow):
+                order.append(name)
+                await asyncio.sleep(0)
+
+        async def run():
+            await scheduler.acquire()
+            tasks = [
+                asyncio.ensure_future(request(f"bulk{i}", Priority.BULK, "bulk"))
+                for i in range(3)
+            ]
+            tasks.append(
+                asyncio.ensure_future(
+                    request("interactive", Priority.INTERACTIVE, "ui")
+                )
+            )
+            tasks.append(asyncio.ensure_future(request("normal", Priority.NORMAL, "x")))
+            await asyncio.sleep(0)
+            assert scheduler.stats()[Priority.BULK].queued == 3
+            scheduler.release()
+            await asyncio.gather(*tasks)
+
+        asyncio.run(run())
+        assert order == ["interactive", "normal", "bulk0", "bulk1", "bulk2"]
+        stats = scheduler.stats()
+        assert list(stats) == [Priority.INTERACTIVE, Priority.NORMAL, Priority.BULK]
+        assert stats[Priority.BULK].dispatched == 3
+        assert stats[Priority.BULK].queued == 0
+        assert (
+            stats[Priority.BULK].max_wait_time >= stats[Priority.INTERACTIVE].wait_time
+        )
+        assert isinstance(stats[Priority.NORMAL], SchedulerStats)
+        assert scheduler.active == 0
+
+    def test_weighted_fair_queueing(self):
+        scheduler = RequestScheduler(1, weights={"heavy": 2})
+        order: List[str] = []
+
+        async def request(flow: str):
+            async with scheduler.slot(Priority.BULK, flow):
+                order.append(flow)
+
+        async def run():
+            await scheduler.acquire()
+            tasks = [
+                asyncio.ensure_future(request(flow))
+                for flow in ["crawl"] * 6 + ["heavy"] * 4 + ["export"] * 2
+            ]
+            await asyncio.sleep(0)
+            scheduler.release()
+            await asyncio.gather(*tasks)
+
+        asyncio.run(run())
+        # The crawl queued first does not delay the other flows
+        assert order[:4] == ["heavy", "crawl", "heavy", "export"]
+        assert order[4:8].count("heavy") == 2
+        assert order[-3:] == ["crawl"] * 3
+
+    def test_cancellation(self):
+        scheduler = RequestScheduler(1)
+
+        async def run():
+            await scheduler.acquire()
+            waiting = asyncio.ensure_future(scheduler.acquire(Priority.BULK))
+            await asyncio.sleep(0)
+            waiting.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiting
+            assert scheduler.stats()[Priority.BULK].queued == 0
+            scheduler.release()
+            # Nothing left in the queue - slot is acquired right away
+            await asyncio.wait_for(scheduler.acquire(), 1)
+            # Slot handed over to a cancelled waiter is released again
+            handed = asyncio.ensure_future(scheduler.acquire())
+            await asyncio.sleep(0)
+            scheduler.release()
+            handed.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await handed
+            assert scheduler.active == 0
+
+        asyncio.run(run())
+        with pytest.raises(ValueError):
+            RequestScheduler(0)
+
+    def test_cancellation_during_release(self):
+        scheduler = RequestScheduler(1)
+
+        async def run():
+            await scheduler.acquire()
+            cancelled = asyncio.ensure_future(scheduler.acquire())
+            waiting = asyncio.ensure_future(scheduler.acquire())
+            await asyncio.sleep(0)
+            # Cancelled before its task had a chance to leave the queue
+            cancelled.cancel()
+            scheduler.release()
+            await asyncio.wait_for(waiting, 1)
+            with pytest.raises(asyncio.CancelledError):
+                await cancelled
+            assert scheduler.active == 1
+            assert scheduler.stats()[Priority.NORMAL].queued == 0
+            scheduler.release()
+            assert scheduler.active == 0
+
+        asyncio.run(run())
+
+
+class TestAsyncSchedulingConnector:
+    def test_tags(self):
+        connector = SlowConnector()
+        scheduling = AsyncSchedulingConnector(connector, concurrency=1)
+        api_root = AsyncEndpoint[Dict[str, Any]](BASE_URL, scheduling)
+
+        async def run():
+            await scheduling.scheduler.acquire()
+            with request_tag(Priority.BULK, flow="crawler"):
+                bulk = [
+                    asyncio.ensure_future(api_root.items[i].get()) for i in range(3)
+                ]
+            default = asyncio.ensure_future(api_root.status.get(params={"v": 1}))
+            interactive = asyncio.ensure_future(
+                api_root.users["{}"].get(5, priority=Priority.INTERACTIVE)
+            )
+            await asyncio.sleep(0)
+            scheduling.scheduler.release()
+            return await asyncio.gather(interactive, default, *bulk)
+
+        responses = asyncio.run(run())
+        assert responses[0] == {"url": f"{BASE_URL}/users/5"}
+        assert connector.order == [
+            "/users/5",
+            "/status",
+            "/items/0",
+            "/items/1",
+            "/items/2",
+        ]
+        # Tagging arguments are not passed to the wrapped connector
+        assert connector.kwargs[:2] == [{}, {"params": {"v": 1}}]
+        stats = scheduling.scheduler.stats()
+        assert stats[Priority.BULK].dispatched == 3
+        assert stats[Priority.NORMAL].dispatched == 2
+
+    def test_list(self):
+        connector = SlowConnector()
+        scheduling = AsyncSchedulingConnector(
+            connector, concurrency=1, default_priority=Priority.BULK
+        )
+        api_root = AsyncEndpoint[Dict[str, Any]](BASE_URL, scheduling)
+
+        async def crawl() -> List[Any]:
+            return [item async for item in api_root.items.list()]
+
+        async def interactive():
+            while not connector.order:
+                await asyncio.sleep(0)
+            return await api_root.users.get(priority=Priority.INTERACTIVE)
+
+        async def run():
+            return await asyncio.gather(crawl(), interactive())
+
+        items, user = asyncio.run(run())
+        assert [item["id"] for item in items] == [0, 1, 2]
+        assert user == {"url": f"{BASE_URL}/users"}
+        # Pages are not exposed - the listing is a single request
+        assert connector.order == ["/items#0", "/items#1", "/items#2", "/users"]
+        assert scheduling.scheduler.stats()[Priority.BULK].dispatched == 1
+        assert scheduling.scheduler.active == 0
+
+    def test_paginated_list(self):
+        connector = SlowPaginatedConnector()
+        scheduling = AsyncSchedulingConnector(
+            connector, concurrency=1, default_priority=Priority.BULK
+        )
+        api_root = AsyncEndpoint[Dict[str, Any]](BASE_URL, scheduling)
+
+        async def crawl() -> List[Any]:
+            return [item async for item in api_root.items.list()]
+
+        async def interactive():
+            while not connector.order:
+                await asyncio.sleep(0)
+            return await api_root.users.get(priority=Priority.INTERACTIVE)
+
+        async def run():
+            return await asyncio.gather(crawl(), interactive())
+
+        items, user = asyncio.run(run())
+        assert [item["id"] for item in items] == list(range(6))
+        assert user == {"url": f"{BASE_URL}/users"}
+        # Interactive request is sent between the pages of the listing
+        assert connector.order == ["/items#0", "/users", "/items#1", "/items#2"]
+        # Slots are taken per page, not per item
+        assert scheduling.scheduler.stats()[Priority.BULK].dispatched == 3
+        assert scheduling.scheduler.active == 0
+
+        async def resume() -> List[Any]:
+            listing = api_root.items.list(checkpoint=Checkpoint(1, 1))
+            return [item["id"] async for item in listing]
+
+        assert asyncio.run(resume()) == [3, 4, 5]
@@ -0,0 +1,208 @@
+import asyncio
+from typing import Any, AsyncIterator, Iterator
+import pytest
+from ezrest.objects import AsyncCRUD, CRUD
+from ezrest.pagination import (
+    AsyncPaginatedConnector,
+    Checkpoint,
+    Page,
+    PaginatedConnector,
+)
+from ezrest.requests import AsyncConnector, AsyncEndpoint, Connector, Endpoint
+from ezrest.tracing import (
+    ITEM_COUNT,
+    PAGE_CURSOR,
+    PAGE_NUMBER,
+    URL_FULL,
+    URL_TEMPLATE,
+    AsyncTracedCRUD,
+    InMemoryTracer,
+    Tracer,
+    TracedCRUD,
+    get_tracer,
+    set_tracer,
+    tracing_enabled,
+)
+
+BASE_URL = "http://x.com"
+
+
+def make_page(cursor: Any) -> Page:
+    page = cursor or 0
+    return Page([page * 2, page * 2 + 1], page + 1 if page < 2 else None)
+
+
+class MockedConnector(PaginatedConnector[int]):
+    def get(self, url: str) -> str:
+        if "missing" in url:
+            raise ValueError(url)
+        return url
+
+    def fetch_page(self, url: str, cursor: Any, **kwargs) -> Page:
+        return make_page(cursor)
+
+
+class MockedAsyncConnector(AsyncPaginatedConnector[int]):
+    async def get(self, url: str) -> str:
+        await asyncio.sleep(0.001)
+        if "missing" in url:
+            raise ValueError(url)
+        return url
+
+    async def fetch_page(self, url: str, cursor: Any, **kwargs) -> Page:
+        await asyncio.sleep(0.001)
+        return make_page(cursor)
+
+
+class MockedCRUD(CRUD[str]):
+    api = Endpoint[int](BASE_URL, MockedConnector())
+
+    def read(self, identifier: int) -> str:
+        return self.api.posts[identifier].get()
+
+    def list(self) -> Iterator[int]:
+        return self.api.posts.list()
+
+
+class MockedAsyncCRUD(AsyncCRUD[str]):
+    api = AsyncEndpoint[int](BASE_URL, MockedAsyncConnector())
+
+    async def create(self, resource: str) -> str:
+        return await self.api.posts.missing.get()
+
+    async def read(self, identifier: int) -> str:
+        return await self.api.posts[identifier].get()
+
+    def list(self) -> AsyncIterator[int]:
+        return self.api.posts.list()
+
+
+@pytest.fixture
+def tracer() -> Iterator[InMemoryTracer]:
+    tracer = InMemoryTracer()
+    set_tracer(tracer)
+    yield tracer
+    set_tracer(None)
+
+
+def test_noop_tracer():
+    assert not tracing_enabled()
+    assert type(get_tracer()) is Tracer
+    with pytest.raises(ValueError):
+        with get_tracer().start_as_current_span("noop") as span:
+            span.set_attribute("key", "value")
+            span.record_exception(ValueError())
+            raise ValueError()
+    assert Endpoint[int](BASE_URL, MockedConnector()).posts[1].get()
+
+
+class TestTracing:
+    def test_request_span(self, tracer: InMemoryTracer):
+        api = Endpoint[int](BASE_URL, MockedConnector())
+        api.posts[5].get()
+        with pytest.raises(ValueError):
+            api.posts.missing.get()
+        ok, failed = tracer.find("ezrest.request")
+        assert ok.attributes[URL_TEMPLATE] == f"{BASE_URL}/posts/{{}}"
+        assert ok.attributes[URL_FULL] == f"{BASE_URL}/posts/5"
+        assert ok.duration >= 0 and not ok.exceptions
+        assert isinstance(failed.exceptions[0], ValueError)
+        with tracer.start_as_current_span("parent") as parent:
+            api["{}"].get(3)
+        assert tracer.spans[-2].parent is parent
+        assert tracer.spans[-2].attributes[URL_TEMPLATE] == f"{BASE_URL}/{{}}"
+        tracer.clear()
+        assert tracer.spans == []
+
+    def test_list_page_spans(self, tracer: InMemoryTracer):
+        items = Endpoint[int](BASE_URL, MockedConnector()).posts.list()
+        assert next(items) == 0
+        assert items.checkpoint == Checkpoint(None, 1)
+        assert list(items.map(str)) == ["1", "2", "3", "4", "5"]
+        pages = tracer.find("ezrest.page")
+        (request,) = tracer.find("ezrest.request")
+        assert [page.attributes[PAGE_NUMBER] for page in pages] == [1, 2, 3]
+        assert [page.attributes.get(PAGE_CURSOR) for page in pages] == [None, "1", "2"]
+        assert all(page.attributes[ITEM_COUNT] == 2 for page in pages)
+        assert all(page.parent is request for page in pages)
+        assert request.attributes[ITEM_COUNT] == 6
+
+    def test_crud_spans(self, tracer: InMemoryTracer):
+        crud = TracedCRUD(MockedCRUD())
+        assert crud.read(1) == f"{BASE_URL}/posts/1"
+        assert list(crud.list()) == list(range(6))
+        with pytest.raises(NotImplementedError):
+            crud.create("resource")
+        read, request = tracer.find("ezrest.crud.read"), tracer.spans[0]
+        assert request.parent is read[0]
+        assert read[0].attributes == {"ezrest.crud": "MockedCRUD"}
+        assert tracer.find("ezrest.crud.list")[0].attributes[ITEM_COUNT] == 6
+        assert tracer.find("ezrest.crud.create")[0].exceptions
+        for method in ["update", "delete"]:
+            with pytest.raises(NotImplementedError):
+                getattr(crud, method)("resource")
+
+    def test_abandoned_iterator(self, tracer: InMemoryTracer):
+        items = Endpoint[int](BASE_URL, MockedConnector()).list()
+        next(items)
+        del items
+        assert tracer.find("ezrest.request")[0].attributes[ITEM_COUNT] == 1
+
+
+class TestAsyncTracing:
+    @pytest.mark.asyncio
+    async def test_request_and_page_spans(self, tracer: InMemoryTracer):
+        api = AsyncEndpoint[int](BASE_URL, MockedAsyncConnector())
+        await api.posts[5].get()
+        assert [item async for item in api.posts.list()] == list(range(6))
+        request, list_request = tracer.find("ezrest.request")
+        assert request.attributes[URL_TEMPLATE] == f"{BASE_URL}/posts/{{}}"
+        assert list_request.attributes[ITEM_COUNT] == 6
+        pages = tracer.find("ezrest.page")
+        assert [page.attributes[ITEM_COUNT] for page in pages] == [2, 2, 2]
+        assert all(page.parent is list_request for page in pages)
+
+    @pytest.mark.asyncio
+    async def test_crud_spans(self, tracer: InMemoryTracer):
+        crud = AsyncTracedCRUD(MockedAsyncCRUD())
+        await asyncio.gather(crud.read(1), crud.read(2))
+        assert [item async for item in crud.list()] == list(range(6))
+        with pytest.raises(ValueError):
+            await crud.create("resource")
+        for method in ["update", "delete"]:
+            with pytest.raises(NotImplementedError):
+                await getattr(crud, method)("resource")
+        reads = tracer.find("ezrest.crud.read")
+        requests = [
+            span
+            for span in tracer.find("ezrest.request")
+            if span.parent is not None and span.parent.name == "ezrest.crud.read"
+        ]
+        assert {span.parent for span in requests} == set(reads)
+        assert tracer.find("ezrest.crud.list")[0].attributes[ITEM_COUNT] == 6
+        (create,) = tracer.find("ezrest.crud.create")
+        assert isinstance(create.exceptions[0], ValueError)
+
+    @pytest.mark.asyncio
+    async def test_failing_list(self, tracer: InMemoryTracer):
+        class FailingConnector(AsyncConnector[int]):
+            async def list(self, url: str) -> AsyncIterator[int]:
+                yield 1
+                raise ValueError(url)
+
+        with pytest.raises(ValueError):
+            async for _ in AsyncEndpoint[int](BASE_URL, FailingConnector()).list():
+                pass
+        (span,) = tracer.find("ezrest.request")
+        assert span.attributes[ITEM_COUNT] == 1
+        assert isinstance(span.exceptions[0], ValueError)
+
+    def test_failing_sync_list(self, tracer: InMemoryTracer):
+        class FailingConnector(Connector[int]):
+            def list(self, url: str) -> Iterator[int]:
+                raise ValueError(url)
+                yield 1
+
+        with pytest.raises(ValueError):
+            list(Endpoint[int](BASE_URL, FailingConnector()).list())
+        assert tracer.find("ezrest.request")[0].exceptions
@@ -0,0 +1,279 @@
+import asyncio
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Tuple
+import pytest
+from ezrest.objects import AsyncCRUD, CRUD
+from ezrest.writebehind import AsyncWriteBehindCRUD, WriteBehindCRUD
+
+Resource = Tuple[int, str]
+
+
+def merge_names(previous: Resource, current: Resource) -> Resource:
+    return current[0], f"{previous[1]}+{current[1]}"
+
+
+class RecordingCRUD(CRUD[Resource]):
+    def __init__(self) -> None:
+        self.updates: List[Resource] = []
+        self.state: Dict[int, Resource] = {}
+
+    def update(self, resource: Resource, *args, **kwargs) -> Resource:
+        if resource[1] == "fail":
+            raise ValueError(resource)
+        self.updates.append(resource)
+        self.state[resource[0]] = resource
+        return resource
+
+    def delete(self, resource: Resource, *args, **kwargs) -> Resource:
+        return self.state.pop(resource[0])
+
+    def read(self, *args, **kwargs) -> Resource:
+        return self.state[args[0]]
+
+    def list(self, *args, **kwargs) -> Iterator[Resource]:
+        yield from self.state.values()
+
+
+class AsyncRecordingCRUD(AsyncCRUD[Resource]):
+    def __init__(self) -> None:
+        self.updates: List[Resource] = []
+        self.state: Dict[int, Resource] = {}
+
+    async def update(self, resource: Resource, *args, **kwargs) -> Resource:
+        await asyncio.sleep(0.001)
+        if resource[1] == "fail":
+            raise ValueError(resource)
+        self.updates.append(resource)
+        self.state[resource[0]] = resource
+        return resource
+
+    async def delete(self, resource: Resource, *args, **kwargs) -> Resource:
+        return self.state.pop(resource[0])
+
+    async def list(self, *args, **kwargs) -> AsyncIterator[Resource]:
+        for resource in list(self.state.values()):
+            yield resource
+
+
+def run_threads(crud: WriteBehindCRUD, resources: List[Resource]) -> List[Resource]:
+    results: List[Resource] = [None] * len(resources)  # type: ignore
+    barrier = threading.Barrier(len(resources))
+
+    def update(i: int):
+        barrier.wait()
+        results[i] = crud.update(resources[i])
+
+    threads = [
+        threading.Thread(target=update, args=(i,)) for i in range(len(resources))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestWriteBehind:
+    def test_combine_updates(self):
+        wrapped = RecordingCRUD()
+        crud = WriteBehindCRUD(wrapped, key=lambda r: r[0], window=0.2)
+        results = run_threads(crud, [(1, "a")] * 8 + [(2, "b")] * 4)
+        assert len(wrapped.updates) == 2
+        assert crud.stats.updates == 12
+        assert crud.stats.requests == 2
+        assert results == [(1, "a")] * 8 + [(2, "b")] * 4
+
+    def test_merge(self):
+        wrapped = RecordingCRUD()
+        crud = WriteBehindCRUD(wrapped, key=lambda r: r[0], merge=merge_names)
+        results = run_threads(crud, [(1, "x")] * 3)
+        assert results == [(1, "x+x+x")] * 3
+        assert wrapped.updates == [(1, "x+x+x")]
+
+    def test_error_propagation(self):
+        wrapped = RecordingCRUD()
+        crud = WriteBehindCRUD(wrapped, key=lambda r: r[0], window=0.01)
+        with pytest.raises(ValueError):
+            crud.update((1, "fail"))
+        assert crud.update((1, "ok")) == (1, "ok")
+
+    def test_flush_and_close(self):
+        wrapped = RecordingCRUD()
+        with WriteBehindCRUD(wrapped, key=lambda r: r[0], window=60) as crud:
+            thread = threading.Thread(target=crud.update, args=((1, "a"),))
+            thread.start()
+            while not crud._buffer.pending:
+                pass
+            crud.flush()
+            thread.join()
+            assert wrapped.updates == [(1, "a")]
+            assert crud.read(1) == (1, "a")
+            assert list(crud.list()) == [(1, "a")]
+            thread = threading.Thread(target=crud.update, args=((1, "b"),))
+            thread.start()
+            while not crud._buffer.pending:
+                pass
+            assert crud.delete((1, "b")) == (1, "b")
+            thread.join()
+        with pytest.raises(RuntimeError):
+            crud.update((1, "c"))
+
+    def test_leader_interrupted(self):
+        class InterruptedCRUD(RecordingCRUD):
+            interrupted = False
+
+            def update(self, resource: Resource, *args, **kwargs) -> Resource:
+                if not self.interrupted:
+                    self.interrupted = True
+                    raise KeyboardInterrupt()
+                return super().update(resource, *args, **kwargs)
+
+        wrapped = InterruptedCRUD()
+        crud = WriteBehindCRUD(wrapped, key=lambda r: r[0], window=60)
+        outcomes: Dict[str, Any] = {}
+
+        def update(resource: Resource):
+            try:
+                outcomes[resource[1]] = crud.update(resource)
+            except BaseException as e:
+                outcomes[resource[1]] = e
+
+        threads = [threading.Thread(target=update, args=((1, name),)) for name in "ab"]
+        threads[0].start()
+        while not crud._buffer.pending:
+            pass
+        threads[1].start()
+        while crud.stats.updates < 2:
+            pass
+        crud.flush()
+        for thread in threads:
+            thread.join()
+        # The waiting caller sends the update instead of the interrupted one
+        assert isinstance(outcomes["a"], KeyboardInterrupt)
+        assert outcomes["b"] == (1, "b")
+        assert wrapped.updates == [(1, "b")]
+        assert crud.stats.requests == 2
+        assert not crud._buffer.pending and not crud._buffer.in_flight
+        # Nobody is waiting - the update fails
+        wrapped.interrupted, crud.window = False, 0.01
+        with pytest.raises(KeyboardInterrupt):
+            crud.update((1, "c"))
+        assert not crud._buffer.pending and not crud._buffer.in_flight
+
+    def test_updates_in_flight(self):
+        started, release = threading.Event(), threading.Event()
+
+        class SlowCRUD(RecordingCRUD):
+            calls = 0
+
+            def update(self, resource: Resource, *args, **kwargs) -> Resource:
+                self.calls += 1
+                started.set()
+                release.wait()
+                return super().update(resource, *args, **kwargs)
+
+        wrapped = SlowCRUD()
+        crud = WriteBehindCRUD(wrapped, key=lambda r: r[0], window=0.01)
+        first = threading.Thread(target=crud.update, args=((1, "a"),))
+        first.start()
+        started.wait()
+        second = threading.Thread(target=crud.update, args=((1, "b"),))
+        second.start()
+        while not crud._buffer.pending:
+            pass
+        try:
+            # The next update is not sent until the previous one completes
+            time.sleep(0.05)
+            assert wrapped.calls == 1
+        finally:
+            release.set()
+        first.join()
+        second.join()
+        assert wrapped.updates == [(1, "a"), (1, "b")]
+
+
+class TestAsyncWriteBehind:
+    @pytest.mark.asyncio
+    async def test_combine_updates(self):
+        wrapped = AsyncRecordingCRUD()
+        crud = AsyncWriteBehindCRUD(wrapped, key=lambda r: r[0], merge=merge_names)
+        results = await asyncio.gather(
+            *[crud.update((1, str(i))) for i in range(3)], crud.update((2, "b"))
+        )
+        assert results == [(1, "0+1+2")] * 3 + [(2, "b")]
+        assert wrapped.updates == [(1, "0+1+2"), (2, "b")]
+        assert crud.stats.requests == 2
+
+    @pytest.mark.asyncio
+    async def test_error_propagation(self):
+        crud = AsyncWriteBehindCRUD(AsyncRecordingCRUD(), key=lambda r: r[0])
+        results = await asyncio.gather(
+            crud.update((1, "ok")), crud.update((1, "fail")), return_exceptions=True
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_flush_and_close(self):
+        wrapped = AsyncRecordingCRUD()
+        async with AsyncWriteBehindCRUD(wrapped, key=lambda r: r[0], window=60) as crud:
+            task = asyncio.ensure_future(crud.update((1, "a")))
+            await asyncio.sleep(0)
+            await crud.flush()
+            assert await task == (1, "a")
+            assert [item async for item in crud.list()] == [(1, "a")]
+            task = asyncio.ensure_future(crud.update((1, "b")))
+            await asyncio.sleep(0)
+            assert await crud.delete((1, "b")) == (1, "b")
+            await task
+        with pytest.raises(RuntimeError):
+            await crud.update((1, "c"))
+
+    @pytest.mark.asyncio
+    async def test_leader_cancelled(self):
+        wrapped = AsyncRecordingCRUD()
+        crud = AsyncWriteBehindCRUD(wrapped, key=lambda r: r[0], window=60)
+        leader = asyncio.ensure_future(crud.update((1, "a")))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(crud.update((1, "b")))
+        await asyncio.sleep(0)
+        leader.cancel()
+        # The waiting caller sends the update instead of the cancelled one
+        assert await asyncio.wait_for(follower, 1) == (1, "b")
+        assert leader.cancelled()
+        assert wrapped.updates == [(1, "b")]
+        # Leader and all the followers cancelled - the update is dropped
+        leader = asyncio.ensure_future(crud.update((1, "c")))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(crud.update((1, "d")))
+        await asyncio.sleep(0)
+        leader.cancel()
+        follower.cancel()
+        await asyncio.wait_for(crud.close(), 1)
+        assert leader.cancelled() and follower.cancelled()
+        assert wrapped.updates == [(1, "b")]
+        assert not crud._buffer.pending and not crud._buffer.in_flight
+
+    @pytest.mark.asyncio
+    async def test_updates_in_flight(self):
+        class SlowCRUD(AsyncRecordingCRUD):
+            active = max_active = 0
+
+            async def update(self, resource: Resource, *args, **kwargs) -> Resource:
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+                await asyncio.sleep(0.02)
+                self.active -= 1
+                return await super().update(resource, *args, **kwargs)
+
+        wrapped = SlowCRUD()
+        crud = AsyncWriteBehindCRUD(wrapped, key=lambda r: r[0], window=0)
+        first = asyncio.ensure_future(crud.update((1, "a")))
+        await asyncio.sleep(0.005)
+        # Merged into a new batch sent after the first request completes
+        results = await asyncio.gather(
+            first, crud.update((1, "b")), crud.update((1, "c"))
+        )
+        assert results == [(1, "a"), (1, "c"), (1, "c")]
+        assert wrapped.updates == [(1, "a"), (1, "c")]
+        assert wrapped.max_active == 1
@@ -44,6 +44,13 @@ class ReqResConnector(Connector[JSONType]):
         response.raise_for_status()
         return response.json()
 
+    def stream_raw(
+        self, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> Iterator[bytes]:
+        with self.client.stream("GET", url, params=params or {}) as response:
+            response.raise_for_status()
+            yield from response.iter_bytes()
+
     def list(
         self, url: str, params: Optional[Dict[str, Any]] = None
     ) -> Iterator[JSONType]:
@@ -92,6 +99,14 @@ class AsyncReqResConnector(AsyncConnector[JSONType]):
         response.raise_for_status()
         return response.json()
 
+    async def stream_raw(
+        self, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[bytes]:
+        async with self.client.stream("GET", url, params=params or {}) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                yield chunk
+
     async def list(
         self, url: str, params: Optional[Dict[str, Any]] = None
     ) -> AsyncIterator[JSONType]:
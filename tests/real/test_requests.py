@@ -1,3 +1,4 @@
+import json
 from httpx import HTTPError
 import pytest
 from tests.real.api import (
@@ -33,6 +34,9 @@ class TestReqResRequests:
         assert response == api["users"][2].get()
         assert response == api.users["{}"].get(2)
 
+    def test_get_user_raw(self, api: ReqResEndpoint):
+        assert json.loads(api.users[2].get_raw()) == api.users[2].get()
+
     def test_get_user_not_found(self, api: ReqResEndpoint):
         with pytest.raises(HTTPError, match="404 Not Found"):
             api.users[420].get()
@@ -84,6 +88,11 @@ class TestAsyncReqResRequests:
         assert response == await api["users"][2].get()
         assert response == await api.users["{}"].get(2)
 
+    @pytest.mark.asyncio
+    async def test_get_user_raw(self, api: AsyncReqResEndpoint):
+        raw_response = await api.users[2].get_raw()
+        assert json.loads(raw_response) == await api.users[2].get()
+
     @pytest.mark.asyncio
     async def test_get_user_not_found(self, api: AsyncReqResEndpoint):
         with pytest.raises(HTTPError, match="404 Not Found"):